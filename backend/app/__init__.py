@@ -1,5 +1,15 @@
-"""Application package entrypoints."""
+"""Application package entrypoints.
 
-from .main import create_app
+``create_app`` is resolved lazily: the PDF render pool's spawned processes
+import ``app.workers`` and must not load the whole web app with it.
+"""
 
 __all__ = ["create_app"]
+
+
+def __getattr__(name: str):
+    if name == "create_app":
+        from .main import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,16 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from app.background.monitoring import latency_recorder
+from app.cache.llm_cache import llm_cache
+from app.config.circuit_breaker import breaker_snapshot
+from app.config.ollama_client import probe_ollama
+from app.config.ollama_warmup import model_residency, warm_up_models
+from app.orchestrator.state_manager import StateManager
+from app.services.audit_stream import audit_stream
+from app.services.notification_outbox import notification_outbox
+from app.workers.pdf_renderer import sanction_renderer
+
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
@@ -14,3 +24,66 @@ def health() -> dict:
 @router.get("/version")
 def version() -> dict:
     return {"service": "intelliapprove-backend", "version": "0.1.0"}
+
+
+@router.get("/llm-cache")
+def llm_cache_stats() -> dict:
+    """Hit/miss counters for the LLM completion cache."""
+    return llm_cache.stats()
+
+
+@router.get("/audit-stream")
+def audit_stream_stats() -> dict:
+    """Queue depth and write counters of the batched audit stream writer."""
+    return audit_stream.stats()
+
+
+@router.get("/notification-outbox")
+def notification_outbox_stats() -> dict:
+    """Outbox depth (pending / retrying / dead-lettered) and delivery counters."""
+    return notification_outbox.stats()
+
+
+@router.get("/sanction-pdf")
+def sanction_pdf_metrics() -> dict:
+    """Queue depth and render timings of the sanction PDF process pool."""
+    return sanction_renderer.metrics()
+
+
+@router.get("/state-store")
+def state_store_stats() -> dict:
+    """Size, evictions and hit counters of the in-process conversation state fallback."""
+    return StateManager.fallback_stats()
+
+
+@router.get("/llm-health")
+async def llm_health(probe: bool = True) -> dict:
+    """Circuit breaker state per Ollama base URL + model, plus a live probe."""
+    result: dict = {"breakers": breaker_snapshot()}
+    if probe:
+        result["probe"] = await probe_ollama()
+    return result
+
+
+@router.get("/llm-models")
+async def llm_models() -> dict:
+    """Warm-up load time and current residency of every configured model."""
+    return await model_residency()
+
+
+@router.post("/llm-models/warmup")
+async def llm_models_warmup() -> dict:
+    """Re-run the model warm-up (e.g. after Ollama was restarted)."""
+    return await warm_up_models()
+
+
+@router.get("/latency")
+def latency() -> dict:
+    """Per-stage, per-phase orchestrator latency histograms (ms)."""
+    return latency_recorder.snapshot()
+
+
+@router.delete("/latency")
+def latency_reset() -> dict:
+    latency_recorder.reset()
+    return {"status": "reset"}
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from app.api.dependencies import get_audio_service, get_logger, get_orchestrator
 from app.orchestrator.state_manager import StateManager
 from app.schemas.conversation_state import OrchestratorRequest, OrchestratorResponse, OrchestratorState
+from app.services.audit_stream import audit_stream
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -25,15 +26,16 @@ async def orchestrate(
 
     # Hydrate existing state when a conversation_id is provided
     conv_id = payload.state.conversation_id
-    if conv_id:
-        existing = StateManager.get_state(conv_id)
-        if existing:
-            # Preserve language override from payload if explicitly set
-            if payload.state.language and payload.state.language != existing.language:
-                existing.language = payload.state.language
-            payload.state = existing
-
-    response = await orchestrator.orchestrate(payload)
+    async with StateManager.lock(conv_id):
+        if conv_id:
+            existing = await StateManager.get_state(conv_id)
+            if existing:
+                # Preserve language override from payload if explicitly set
+                if payload.state.language and payload.state.language != existing.language:
+                    existing.language = payload.state.language
+                payload.state = existing
+
+        response = await orchestrator.orchestrate(payload)
     logger.debug("orchestrated conversation", extra={"conversation_id": response.conversation_id})
     return response
 
@@ -60,18 +62,19 @@ async def orchestrate_voice(
 
     # Start from existing state when a conversation_id is provided
     state: OrchestratorState
-    if conversation_id:
-        existing = StateManager.get_state(conversation_id)
-        if existing:
-            state = existing
-            state.language = language or state.language
+    async with StateManager.lock(conversation_id):
+        if conversation_id:
+            existing = await StateManager.get_state(conversation_id)
+            if existing:
+                state = existing
+                state.language = language or state.language
+            else:
+                state = OrchestratorState(conversation_id=conversation_id, language=language)
         else:
-            state = OrchestratorState(conversation_id=conversation_id, language=language)
-    else:
-        state = OrchestratorState(language=language)
+            state = OrchestratorState(language=language)
 
-    req = OrchestratorRequest(user_message=user_text, state=state)
-    resp = await orchestrator.orchestrate(req)
+        req = OrchestratorRequest(user_message=user_text, state=state)
+        resp = await orchestrator.orchestrate(req)
 
     # Surface the recognized transcript back to the client so the
     # frontend can show the user's spoken text as a chat bubble.
@@ -88,8 +91,9 @@ async def orchestrate_voice(
 
 
 @router.get("/state/{conversation_id}", response_model=OrchestratorResponse)
-def get_state(conversation_id: str):
-    state = StateManager.get_state(conversation_id)
+async def get_state(conversation_id: str):
+    """Full state snapshot; clients that lost track of ``revision`` resync here."""
+    state = await StateManager.get_state(conversation_id)
     if not state:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -99,6 +103,14 @@ def get_state(conversation_id: str):
         stage=state.stage or "NEW",
         message_to_user="State snapshot returned",
         invoke_worker={},
-        state_updates=state.dict(),
+        state_updates=state.model_dump(mode="json", exclude={"llm_context"}),
         next_action="continue",
+        revision=state.revision,
     )
+
+
+@router.get("/audit/{conversation_id}")
+def get_audit_log(conversation_id: str, limit: int | None = None) -> dict:
+    """Audit trail of a conversation (the ``limit`` most recent entries, if given)."""
+    entries = audit_stream.read(conversation_id, count=limit)
+    return {"conversation_id": conversation_id, "entries": entries}
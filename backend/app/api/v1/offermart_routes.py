@@ -27,7 +27,7 @@ class EligibilityRequest(BaseModel):
 
 
 @router.post("/check-eligibility")
-def check_eligibility(
+async def check_eligibility(
     payload: EligibilityRequest,
     offer_service: OffermartService = Depends(get_offermart_service),
 ) -> Dict[str, Any]:
@@ -37,14 +37,14 @@ def check_eligibility(
     documentation examples as closely as possible.
     """
 
-    body = offer_service.check_eligibility(payload.model_dump())
+    body = await offer_service.check_eligibility(payload.model_dump())
     if not body:
         raise HTTPException(status_code=502, detail="Offer Mart service unavailable")
     return body
 
 
 @router.post("/generate-offers")
-def generate_offers(
+async def generate_offers(
     payload: EligibilityRequest,
     offer_service: OffermartService = Depends(get_offermart_service),
 ) -> Dict[str, Any]:
@@ -53,7 +53,7 @@ def generate_offers(
     Uses the same request schema as eligibility for convenience.
     """
 
-    body = offer_service.generate_offers(payload.model_dump())
+    body = await offer_service.generate_offers(payload.model_dump())
     if not body:
         raise HTTPException(status_code=502, detail="Offer Mart service unavailable")
     return body
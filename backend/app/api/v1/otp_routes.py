@@ -17,7 +17,7 @@ def send_otp(conversation_id: str, phone_number: str, otp_service=Depends(get_ot
 
 
 @router.post("/verify", response_model=OrchestratorResponse)
-def verify_otp(
+async def verify_otp(
     conversation_id: str,
     phone_number: str,
     otp: str,
@@ -28,10 +28,11 @@ def verify_otp(
     if not ok:
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    state = StateManager.get_state(conversation_id)
-    if not state:
-        raise HTTPException(status_code=404, detail="Conversation not found")
+    async with StateManager.lock(conversation_id):
+        state = await StateManager.get_state(conversation_id)
+        if not state:
+            raise HTTPException(status_code=404, detail="Conversation not found")
 
-    state.kyc.otp_status = "verified"
-    req = OrchestratorRequest(state=state, event="otp_verified")
-    return orchestrator.handle_request(req)
+        state.kyc.otp_status = "verified"
+        req = OrchestratorRequest(state=state, event="otp_verified")
+        return await orchestrator.orchestrate(req)
@@ -13,29 +13,31 @@ from app.services.notification_service import NotificationService
 from app.schemas.conversation_state import OrchestratorResponse
 from app.schemas.sanction_letter import SanctionLetter
 from app.utils.time_utils import utc_now_iso
+from app.workers.pdf_renderer import sanction_renderer
 
 router = APIRouter(prefix="/sanction", tags=["Sanction"])
 
 
 @router.post("/generate", response_model=SanctionLetter)
-def generate_sanction(conversation_id: str, pdf_service=Depends(get_pdf_service)) -> SanctionLetter:
-    state = StateManager.get_state(conversation_id)
-    if not state or not state.offer.amount or not state.offer.personalized_rate or not state.offer.emi:
-        raise HTTPException(status_code=400, detail="Missing offer details")
-
-    payload = {
-        "amount": float(state.offer.amount),
-        "tenure_months": int(state.offer.tenure or 60),
-        "rate_percent": float(state.offer.personalized_rate),
-        "emi": float(state.offer.emi),
-        "valid_until": (datetime.utcnow() + timedelta(days=7)).date().isoformat(),
-    }
-    out = pdf_service.generate_sanction_letter(payload)
-
-    state.sanction.sanction_number = str(out["sanction_number"])
-    state.sanction.pdf_url = str(out["pdf_url"])
-    state.sanction.valid_until = str(out["valid_until"]) if "valid_until" in out else payload["valid_until"]
-    StateManager.upsert_state(state)
+async def generate_sanction(conversation_id: str, pdf_service=Depends(get_pdf_service)) -> SanctionLetter:
+    async with StateManager.lock(conversation_id):
+        state = await StateManager.get_state(conversation_id, sections=("offer", "sanction"))
+        if not state or not state.offer.amount or not state.offer.personalized_rate or not state.offer.emi:
+            raise HTTPException(status_code=400, detail="Missing offer details")
+
+        payload = {
+            "amount": float(state.offer.amount),
+            "tenure_months": int(state.offer.tenure or 60),
+            "rate_percent": float(state.offer.personalized_rate),
+            "emi": float(state.offer.emi),
+            "valid_until": (datetime.utcnow() + timedelta(days=7)).date().isoformat(),
+        }
+        out = pdf_service.generate_sanction_letter(payload)
+
+        state.sanction.sanction_number = str(out["sanction_number"])
+        state.sanction.pdf_url = str(out["pdf_url"])
+        state.sanction.valid_until = str(out["valid_until"]) if "valid_until" in out else payload["valid_until"]
+        await StateManager.upsert_state(state)
 
     return SanctionLetter(
         sanction_number=state.sanction.sanction_number,
@@ -48,8 +50,17 @@ def generate_sanction(conversation_id: str, pdf_service=Depends(get_pdf_service)
     )
 
 
+@router.get("/status/{conversation_id}")
+async def sanction_status(conversation_id: str) -> Dict[str, Any]:
+    """Readiness of the conversation's sanction letter PDF (rendering / ready / failed)."""
+    state = await StateManager.get_state(conversation_id, sections=("sanction",))
+    if not state or not state.sanction.sanction_number:
+        raise HTTPException(status_code=404, detail="No sanction letter found for this conversation")
+    return sanction_renderer.status(state.sanction.sanction_number, state.sanction.pdf_url)
+
+
 @router.post("/accept")
-def accept_sanction(conversation_id: str) -> Dict[str, Any]:
+async def accept_sanction(conversation_id: str) -> Dict[str, Any]:
     """Record sanction acceptance and simulate fund disbursement.
 
     This models the final stages of the journey where the customer signs the
@@ -57,30 +68,31 @@ def accept_sanction(conversation_id: str) -> Dict[str, Any]:
     actual banking integration is mocked with a generated transaction id.
     """
 
-    state = StateManager.get_state(conversation_id)
-    if not state or not state.sanction.sanction_number:
-        raise HTTPException(status_code=400, detail="No sanction letter found for this conversation")
+    async with StateManager.lock(conversation_id):
+        state = await StateManager.get_state(conversation_id, sections=("offer", "sanction", "customer_profile"))
+        if not state or not state.sanction.sanction_number:
+            raise HTTPException(status_code=400, detail="No sanction letter found for this conversation")
 
-    amount = float(state.offer.amount or 0.0)
-    if amount <= 0:
-        raise HTTPException(status_code=400, detail="Missing sanctioned amount")
+        amount = float(state.offer.amount or 0.0)
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Missing sanctioned amount")
 
-    processing_fee = round(amount * 0.01, 2)
-    net_disbursal = round(amount - processing_fee, 2)
-    txn_id = f"TXN-{uuid.uuid4().hex[:10].upper()}"
+        processing_fee = round(amount * 0.01, 2)
+        net_disbursal = round(amount - processing_fee, 2)
+        txn_id = f"TXN-{uuid.uuid4().hex[:10].upper()}"
 
-    state.sanction.accepted = True
-    state.sanction.disbursed = True
-    state.sanction.disbursement_amount = net_disbursal
-    state.sanction.disbursement_reference = txn_id
-    state.sanction.disbursed_at = utc_now_iso()
-    StateManager.upsert_state(state)
+        state.sanction.accepted = True
+        state.sanction.disbursed = True
+        state.sanction.disbursement_amount = net_disbursal
+        state.sanction.disbursement_reference = txn_id
+        state.sanction.disbursed_at = utc_now_iso()
+        await StateManager.upsert_state(state)
 
-    # Fire-and-forget disbursement notification via mock notification server
+    # Queue the disbursement notification on the outbox (delivered in the background)
     try:
         customer = (state.customer_profile or {}) if state else {}
         notif = NotificationService()
-        notif.send_disbursement_confirmation(
+        await notif.send_disbursement_confirmation(
             email=customer.get("email"),
             phone=customer.get("phone"),
             customer_name=customer.get("name", "Valued Customer"),
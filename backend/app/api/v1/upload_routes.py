@@ -18,8 +18,7 @@ async def upload_salary_slip(
     storage = Depends(get_storage_service),
     orchestrator = Depends(get_orchestrator),
 ):
-    state = StateManager.get_state(conversation_id)
-    if not state:
+    if not await StateManager.get_state(conversation_id, sections=()):
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     content = await file.read()
@@ -29,12 +28,19 @@ async def upload_salary_slip(
     ocr = OcrAgent()
     result = ocr.extract_salary_slip(file_id=object_name, file_name=file.filename, file_bytes=content)
 
-    state.salary_slip.file_id = object_name
-    state.salary_slip.net_monthly_salary = result.net_salary
-    state.salary_slip.confidence = result.confidence
-
-    # Hand control back to orchestrator so it can move
-    # from DOCUMENT_UPLOAD -> SANCTION based on salary slip.
-    req = OrchestratorRequest(state=state, event="document_uploaded")
-    resp = await orchestrator.orchestrate(req)
+    # Read the state only once the slip is processed, so the lock is not held
+    # across the upload and OCR
+    async with StateManager.lock(conversation_id):
+        state = await StateManager.get_state(conversation_id)
+        if not state:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+
+        state.salary_slip.file_id = object_name
+        state.salary_slip.net_monthly_salary = result.net_salary
+        state.salary_slip.confidence = result.confidence
+
+        # Hand control back to orchestrator so it can move
+        # from DOCUMENT_UPLOAD -> SANCTION based on salary slip.
+        req = OrchestratorRequest(state=state, event="document_uploaded")
+        resp = await orchestrator.orchestrate(req)
     return resp
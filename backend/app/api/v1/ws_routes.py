@@ -2,17 +2,39 @@
 
 Supports two payload styles:
 - Simple chat message: {"text", "language", "timestamp", ...}
-- Full OrchestratorRequest JSON (advanced clients)
+- Full OrchestratorRequest JSON (advanced clients); as with
+  ``POST /chat/orchestrate``, a stored conversation is reloaded server-side
+  and only the client's language override is applied to it
+
+For simple chat messages the LLM reply is streamed: zero or more
+``ai_message_delta`` frames carry partial tokens as they are generated,
+followed by the final ``ai_message`` frame with stage/state. Clients should
+replace the streamed text with the final message, which is authoritative.
+
+Clients that send ``base_revision`` (the last ``revision`` they applied) get
+``state_patch`` (JSON Patch) instead of the full ``state`` when they are in
+sync; otherwise the full state is sent so they can resync.
+
+When a turn queues a sanction letter PDF, a ``sanction_pdf_ready`` frame
+(``{"type", "conversation_id", "sanction_number", "status"}``) follows once
+rendering finishes, before the socket is closed.
+
+If another worker updated the conversation during the turn, the turn is
+not saved and ``{"error": "state_conflict", "revision"}`` is sent instead;
+the client should reload ``/chat/state`` and resend.
 """
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any
+from typing import Any, Dict, Optional, Set
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
-from app.api.dependencies import get_logger, get_orchestrator
+from app.api.dependencies import get_app_settings, get_logger, get_orchestrator
+from app.orchestrator.state_manager import StateConflictError, StateManager
 from app.schemas.conversation_state import OrchestratorRequest, OrchestratorResponse
+from app.workers.pdf_renderer import sanction_renderer
 
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
@@ -27,6 +49,31 @@ async def websocket_chat(
     logger = get_logger()
     await ws.accept()
 
+    async def send_delta(token: str) -> None:
+        await ws.send_text(json.dumps({
+            "type": "ai_message_delta",
+            "delta": token,
+            "conversation_id": session_id,
+        }))
+
+    pdf_pushes: Set[asyncio.Task] = set()
+
+    async def push_pdf_ready(sanction_number: str) -> None:
+        status = await sanction_renderer.wait(sanction_number, timeout=get_app_settings().long_task_timeout_seconds)
+        await ws.send_text(json.dumps({
+            "type": "sanction_pdf_ready",
+            "conversation_id": session_id,
+            "sanction_number": sanction_number,
+            "status": status.get("status"),
+        }))
+
+    def watch_pdf(invoke_worker: Optional[Dict[str, Any]]) -> None:
+        payload = (invoke_worker or {}).get("payload") or {}
+        if (invoke_worker or {}).get("name") == "sanction_pdf" and payload.get("sanction_number"):
+            task = asyncio.create_task(push_pdf_ready(payload["sanction_number"]))
+            pdf_pushes.add(task)
+            task.add_done_callback(pdf_pushes.discard)
+
     try:
         while True:
             raw = await ws.receive_text()
@@ -42,16 +89,24 @@ async def websocket_chat(
                 user_message = data.get("text") or data.get("user_input") or ""
                 language = data.get("language") or "en"
 
-                resp_payload: dict[str, Any] = await orchestrator.process_message(
-                    session_id=session_id,
-                    user_input=user_message,
-                    language=language,
-                    context={
-                        "channel": data.get("channel", "web"),
-                        "timestamp": data.get("timestamp"),
-                    },
-                )
+                try:
+                    resp_payload: dict[str, Any] = await orchestrator.process_message(
+                        session_id=session_id,
+                        user_input=user_message,
+                        language=language,
+                        context={
+                            "channel": data.get("channel", "web"),
+                            "timestamp": data.get("timestamp"),
+                        },
+                        on_token=send_delta,
+                        base_revision=data.get("base_revision"),
+                    )
+                except StateConflictError as exc:
+                    # Another worker wrote this conversation mid-turn; the client resyncs
+                    await ws.send_text(json.dumps({"error": "state_conflict", "revision": exc.current}))
+                    continue
                 await ws.send_text(json.dumps(resp_payload))
+                watch_pdf(resp_payload.get("invoke_worker"))
 
                 if resp_payload.get("action") == "end":
                     break
@@ -68,13 +123,30 @@ async def websocket_chat(
             if not req.state.conversation_id:
                 req.state.conversation_id = session_id
 
-            resp: OrchestratorResponse = await orchestrator.orchestrate(req)
+            try:
+                async with StateManager.lock(req.state.conversation_id):
+                    # The stored state (and its revision) is the CAS base, not the client's copy
+                    existing = await StateManager.get_state(req.state.conversation_id)
+                    if existing:
+                        if req.state.language and req.state.language != existing.language:
+                            existing.language = req.state.language
+                        req.state = existing
+                    resp: OrchestratorResponse = await orchestrator.orchestrate(req, on_token=send_delta)
+            except StateConflictError as exc:
+                await ws.send_text(json.dumps({"error": "state_conflict", "revision": exc.current}))
+                continue
             await ws.send_text(resp.json())
+            watch_pdf(resp.invoke_worker)
 
             if resp.next_action == "end":
                 break
 
     except WebSocketDisconnect:
         logger.info("websocket disconnected", extra={"session_id": session_id})
+        for task in pdf_pushes:
+            task.cancel()
     finally:
+        if pdf_pushes:
+            # Deliver pending PDF-ready frames before closing a finished conversation
+            await asyncio.gather(*pdf_pushes, return_exceptions=True)
         await ws.close()
@@ -1,3 +1,108 @@
+"""In-process latency histograms for orchestrator phases.
+
+``latency_recorder.span(phase)`` (sync or around awaits) and
+``latency_recorder.timed(phase, awaitable)`` record wall-clock durations into
+fixed-bucket histograms keyed by conversation stage and phase, e.g.
+``SANCTION`` / ``sanction.pdf``. The stage comes from a context variable set
+once per turn, so concurrent turns on one worker never mix their labels.
+"""
 from __future__ import annotations
 
-# Placeholder monitoring
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+BUCKETS_MS: List[float] = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")]
+
+current_stage: ContextVar[str] = ContextVar("current_stage", default="UNKNOWN")
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        for idx, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[idx] += 1
+                break
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def _quantile(self, q: float) -> Optional[float]:
+        """Bucket upper bound containing the q-quantile (max for the open bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for idx, bound in enumerate(BUCKETS_MS):
+            seen += self.counts[idx]
+            if seen >= target:
+                return self.max_ms if bound == float("inf") else bound
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self._quantile(0.5),
+            "p95_ms": self._quantile(0.95),
+            "p99_ms": self._quantile(0.99),
+            "buckets": {
+                ("+inf" if bound == float("inf") else f"le_{bound:g}"): n
+                for bound, n in zip(BUCKETS_MS, self.counts)
+            },
+        }
+
+
+class LatencyRecorder:
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, ms: float, stage: Optional[str] = None) -> None:
+        stage = stage or current_stage.get()
+        with self._lock:
+            by_phase = self._histograms.setdefault(stage, {})
+            hist = by_phase.get(phase)
+            if hist is None:
+                hist = by_phase[phase] = LatencyHistogram()
+            hist.observe(ms)
+
+    @contextmanager
+    def span(self, phase: str, stage: Optional[str] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, (time.perf_counter() - started) * 1000, stage)
+
+    async def timed(self, phase: str, awaitable: Awaitable[T], stage: Optional[str] = None) -> T:
+        with self.span(phase, stage):
+            return await awaitable
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                stage: {phase: hist.snapshot() for phase, hist in sorted(by_phase.items())}
+                for stage, by_phase in sorted(self._histograms.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+latency_recorder = LatencyRecorder()
+
+__all__ = ["LatencyRecorder", "current_stage", "latency_recorder"]
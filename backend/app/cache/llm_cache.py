@@ -0,0 +1,166 @@
+"""Two-tier cache for LLM completions (in-process LRU in front of Redis).
+
+Keys combine the model name, a hash of the system prompt, a hash of the user
+prompt, ``max_tokens`` and temperature, so only byte-identical requests share
+a completion. The local tier absorbs repeats inside one worker; the Redis tier
+shares completions across workers and restarts.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config.redis_config import redis_client
+from app.config.settings import get_settings
+
+PREFIX = "llm:"
+
+# After a Redis error, skip the remote tier for this long instead of paying
+# a socket timeout on every completion.
+_REDIS_RETRY_SECONDS = 30.0
+
+
+def make_key(model: str, system_prompt: str, user_prompt: str, max_tokens: int, temperature: float) -> str:
+    system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+    user_hash = hashlib.sha256(user_prompt.encode("utf-8")).hexdigest()
+    return f"{PREFIX}{model}:{system_hash}:{user_hash}:{max_tokens}:{temperature:g}"
+
+
+class LLMResponseCache:
+    def __init__(self, max_entries: int, local_ttl: int, redis_ttl: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._max_entries = max_entries
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0
+        self._stats: Dict[str, int] = {"local_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+
+    # ------------------------
+    #  Local LRU tier
+    # ------------------------
+
+    def _get_local(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._local.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            self._stats["local_hits"] += 1
+            return value
+
+    def _set_local(self, key: str, value: str) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self._local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    # ------------------------
+    #  Redis tier
+    # ------------------------
+
+    def _get_redis(self, key: str) -> Optional[str]:
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            raw = redis_client.get(key)
+        except Exception:
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            return None
+        if not raw:
+            return None
+        value = raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+        with self._lock:
+            self._stats["redis_hits"] += 1
+        return value
+
+    def _set_redis(self, key: str, value: str) -> None:
+        if time.monotonic() < self._redis_retry_at:
+            return
+        try:
+            redis_client.set(key, value, ex=self._redis_ttl)
+        except Exception:
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+
+    # ------------------------
+    #  Public API
+    # ------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        value = self._get_redis(key)
+        if value is not None:
+            self._set_local(key, value)
+            return value
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        if not self.enabled or not value:
+            return
+        self._set_local(key, value)
+        self._set_redis(key, value)
+        with self._lock:
+            self._stats["stores"] += 1
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Async variant; the Redis round trip runs off the event loop."""
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        value = await asyncio.to_thread(self._get_redis, key)
+        if value is not None:
+            self._set_local(key, value)
+            return value
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    async def aset(self, key: str, value: Optional[str]) -> None:
+        if not self.enabled or not value:
+            return
+        self._set_local(key, value)
+        await asyncio.to_thread(self._set_redis, key, value)
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+
+_settings = get_settings()
+llm_cache = LLMResponseCache(
+    max_entries=_settings.llm_cache_max_entries,
+    local_ttl=_settings.llm_cache_local_ttl_seconds,
+    redis_ttl=_settings.llm_cache_redis_ttl_seconds,
+    enabled=_settings.llm_cache_enabled,
+)
+
+__all__ = ["LLMResponseCache", "llm_cache", "make_key"]
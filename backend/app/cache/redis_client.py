@@ -1,5 +1,5 @@
 from __future__ import annotations
 
-from app.config.redis_config import redis_client
+from app.config.redis_config import async_redis_client, close_async_redis_client, redis_client
 
-__all__ = ["redis_client"]
+__all__ = ["async_redis_client", "close_async_redis_client", "redis_client"]
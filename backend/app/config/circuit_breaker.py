@@ -0,0 +1,158 @@
+"""Circuit breaker shared by every client of one Ollama base URL + model.
+
+Outcomes of recent calls are kept in a sliding window. Once at least
+``min_calls`` are recorded and the failure rate reaches the threshold, the
+breaker opens and callers short-circuit to their fallbacks without touching
+the network. After ``open_seconds`` it goes half-open and lets exactly one
+trial request through: success closes it, failure re-opens it.
+
+A call that misses its latency budget is a slow-call failure: it enters the
+window like an error, so an overloaded server opens the breaker too instead
+of making every turn wait out its budget. Calls cancelled by the caller
+(client disconnects, WebSocket close) say nothing about the server's health:
+they are counted in the stats but never enter the window.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.config.settings import get_settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, window_size: int, min_calls: int, failure_rate: float, open_seconds: float) -> None:
+        self.name = name
+        self._window: Deque[bool] = deque(maxlen=window_size)
+        self._min_calls = min_calls
+        self._failure_rate = failure_rate
+        self._open_seconds = open_seconds
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"successes": 0, "failures": 0, "short_circuited": 0, "opened": 0, "cancelled": 0, "budget_expired": 0}
+        self._last_failure_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_open(self) -> bool:
+        """True while callers should go straight to their fallbacks."""
+        return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._stats["short_circuited"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._window.clear()
+                self._probe_in_flight = False
+            self._window.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._record_failure()
+
+    def record_budget_expired(self) -> None:
+        """A call missed its latency budget: counts as a (slow-call) failure."""
+        with self._lock:
+            self._stats["budget_expired"] += 1
+            self._record_failure()
+
+    def _record_failure(self) -> None:
+        # Caller holds self._lock
+        self._last_failure_at = time.time()
+        if self._state == HALF_OPEN:
+            self._trip()
+            return
+        self._window.append(False)
+        failures = self._window.count(False)
+        if len(self._window) >= self._min_calls and failures / len(self._window) >= self._failure_rate:
+            self._trip()
+
+    def record_cancelled(self) -> None:
+        """The caller abandoned the call; frees a half-open probe slot."""
+        with self._lock:
+            self._stats["cancelled"] += 1
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._stats["opened"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._window)
+            failures = self._window.count(False)
+            retry_in = max(0.0, self._open_seconds - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0
+            return {
+                "name": self.name,
+                "state": state,
+                "window_calls": calls,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "retry_in_seconds": round(retry_in, 2),
+                "last_failure_at": self._last_failure_at,
+                **self._stats,
+            }
+
+
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(base_url: str, model: str) -> CircuitBreaker:
+    """Return the process-wide breaker for ``(base_url, model)``."""
+    key = (base_url, model)
+    with _registry_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                f"{base_url}#{model}",
+                window_size=settings.llm_breaker_window_size,
+                min_calls=settings.llm_breaker_min_calls,
+                failure_rate=settings.llm_breaker_failure_rate,
+                open_seconds=settings.llm_breaker_open_seconds,
+            )
+            _breakers[key] = breaker
+        return breaker
+
+
+def breaker_snapshot() -> list[Dict[str, Any]]:
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
+
+
+__all__ = ["CircuitBreaker", "breaker_snapshot", "get_breaker", "CLOSED", "OPEN", "HALF_OPEN"]
@@ -0,0 +1,94 @@
+"""Shared async HTTP transport for downstream services (CRM, Bureau, OfferMart, Notification).
+
+Each service gets its own pooled ``httpx.AsyncClient`` (keep-alive, connection
+limits, optional HTTP/2), created lazily on first use and closed on app
+shutdown, instead of opening a new TCP connection per request through the
+module-level ``httpx.get`` / ``httpx.post`` helpers.
+
+``service_request`` applies one timeout and retry policy everywhere:
+connection failures are retried for every method (the request never reached
+the server), while read timeouts and 502/503/504 responses are retried only
+for idempotent methods, with exponential backoff between attempts.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config.settings import get_settings
+
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_RETRY_STATUS = {502, 503, 504}
+
+_service_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_service_client(service: str) -> httpx.AsyncClient:
+    """Pooled client for ``service`` (one pool per downstream service)."""
+    client = _service_clients.get(service)
+    if client is None or client.is_closed:
+        settings = get_settings()
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        )
+        kwargs: Dict[str, Any] = {"timeout": settings.request_timeout_seconds, "limits": limits}
+        try:
+            client = httpx.AsyncClient(http2=settings.http_enable_http2, **kwargs)
+        except ImportError:
+            # HTTP/2 needs the optional ``h2`` package; keep working over HTTP/1.1
+            print("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            client = httpx.AsyncClient(**kwargs)
+        _service_clients[service] = client
+    return client
+
+
+async def service_request(
+    service: str,
+    method: str,
+    url: str,
+    *,
+    json: Optional[Any] = None,
+    retries: Optional[int] = None,
+) -> httpx.Response:
+    """Send a request on the service's pool, retrying per the shared policy.
+
+    Raises the last ``httpx`` error when all attempts fail; the response is
+    returned as-is otherwise (callers decide what a 4xx means).
+    """
+    settings = get_settings()
+    method = method.upper()
+    attempts = 1 + max(0, settings.http_retries if retries is None else retries)
+    backoff = settings.http_retry_backoff_ms / 1000.0
+    idempotent = method in _IDEMPOTENT_METHODS
+    client = get_service_client(service)
+
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await client.request(method, url, json=json)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            if last_attempt:
+                raise
+        except httpx.TransportError:
+            if last_attempt or not idempotent:
+                raise
+        else:
+            if response.status_code not in _RETRY_STATUS or not idempotent or last_attempt:
+                return response
+        await asyncio.sleep(backoff * (2 ** attempt))
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+async def close_service_clients() -> None:
+    """Close every service pool (called on application shutdown)."""
+    clients = list(_service_clients.values())
+    _service_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+__all__ = ["close_service_clients", "get_service_client", "service_request"]
@@ -4,18 +4,132 @@ This exposes a simple interface used throughout the app so callers don't
 depend on provider details. Under the hood it calls a local Ollama server
 over HTTP, using ``OLLAMA_BASE_URL`` and model names passed in by agents
 or configured via settings.
+
+Async callers (the orchestrator and all agents) should use ``agenerate``,
+which goes through one process-wide ``httpx.AsyncClient`` so connections
+to Ollama are pooled and kept alive instead of re-opened on every call.
+Passing ``on_token`` switches the request to ``stream: true`` so partial
+tokens can be forwarded to the customer while the completion is running.
+
+``agenerate`` also accepts a per-call ``timeout`` (the stage's latency
+budget): on expiry the in-flight request is cancelled and `None` is returned
+so the caller takes its deterministic fallback path.
+
+``agenerate_with_context`` continues from the ``context`` token array that
+Ollama returns, so a conversation's long system prompt is prefilled once and
+later turns send only the new user content; ``reusable_context`` /
+``remember_context`` keep those arrays per agent in conversation state.
+
+Every client of one base URL + model shares a circuit breaker
+(``app.config.circuit_breaker``): while it is open, ``available`` is False and
+calls return `None` immediately instead of waiting on a dead server.
+
+For agents listed in ``LLM_CACHE_AGENTS`` (by default the greeting and
+emotion classification, whose prompts carry no customer data), ``generate``
+and ``agenerate`` consult the two-tier completion cache in
+``app.cache.llm_cache`` first, so identical prompts are served without
+another inference. Personalised completions are never cached.
 """
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
+from app.background.monitoring import latency_recorder
+from app.cache.llm_cache import llm_cache, make_key
+from app.config.circuit_breaker import CircuitBreaker, get_breaker
+
 from .settings import get_settings
 
+TokenCallback = Callable[[str], Awaitable[None]]
+
+# Cancel message for requests abandoned by their own budget or request timeout
+_TIMED_OUT = "ollama-timeout"
+
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the shared, keep-alive pooled AsyncClient used for Ollama."""
+    global _async_http_client
+    if _async_http_client is None or _async_http_client.is_closed:
+        settings = get_settings()
+        _async_http_client = httpx.AsyncClient(
+            timeout=settings.ollama_request_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.ollama_max_connections,
+                max_keepalive_connections=settings.ollama_max_keepalive_connections,
+            ),
+        )
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared AsyncClient (called on application shutdown)."""
+    global _async_http_client
+    if _async_http_client is not None and not _async_http_client.is_closed:
+        await _async_http_client.aclose()
+    _async_http_client = None
+
+
+async def probe_ollama(base_url: Optional[str] = None, timeout: float = 2.0) -> Dict[str, Any]:
+    """Live health probe: ``GET /api/tags`` on the Ollama server.
+
+    Returns reachability, latency and the models the server reports, for
+    the admin health endpoint.
+    """
+    base = (base_url or get_settings().ollama_base_url or "").rstrip("/")
+    started = time.perf_counter()
+    try:  # pragma: no cover - external API call
+        response = await get_async_http_client().get(f"{base}/api/tags", timeout=timeout)
+        response.raise_for_status()
+        models = [m.get("name") for m in response.json().get("models", [])]
+        return {
+            "base_url": base,
+            "reachable": True,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "models": models,
+        }
+    except Exception as e:  # pragma: no cover - networking
+        return {
+            "base_url": base,
+            "reachable": False,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": str(e),
+        }
+
+
+def _prompt_fingerprint(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def reusable_context(store: Dict[str, Any], agent: str, system_prompt: str) -> Optional[List[int]]:
+    """Return the agent's saved Ollama context if it was built from ``system_prompt``."""
+    entry = store.get(agent)
+    if not isinstance(entry, dict) or entry.get("system_hash") != _prompt_fingerprint(system_prompt):
+        return None
+    return entry.get("tokens") or None
+
+
+def remember_context(store: Dict[str, Any], agent: str, system_prompt: str, context: Optional[List[int]]) -> None:
+    """Save (or drop) the context returned by Ollama for the agent's next turn.
+
+    Contexts longer than ``ollama_context_max_tokens`` are dropped so the next
+    turn starts a fresh prefill instead of overflowing the model's window.
+    """
+    if not context or len(context) > get_settings().ollama_context_max_tokens:
+        store.pop(agent, None)
+        return
+    store[agent] = {"system_hash": _prompt_fingerprint(system_prompt), "tokens": list(context)}
+
 
 class OllamaClient:
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, agent: Optional[str] = None) -> None:
         settings = get_settings()
 
         # Ollama backend configuration only
@@ -30,44 +144,278 @@ class OllamaClient:
 
         # _model is kept for compatibility / introspection
         self._model = self._ollama_model or "ollama-model-not-configured"
+        self._request_timeout = settings.ollama_request_timeout_seconds
+        self._keep_alive = settings.ollama_keep_alive
+        cache_agents = {name.strip() for name in settings.llm_cache_agents.split(",") if name.strip()}
+        self._cache_completions = agent is not None and agent in cache_agents
+        self._breaker: Optional[CircuitBreaker] = (
+            get_breaker(self._ollama_base_url, self._ollama_model) if self.configured else None
+        )
 
     @property
-    def available(self) -> bool:
-        # Available if we have a model name and base URL configured
+    def configured(self) -> bool:
+        # Configured if we have a model name and base URL
         return bool(self._ollama_base_url and self._ollama_model)
 
+    @property
+    def available(self) -> bool:
+        # Available if configured and the shared circuit breaker is not open
+        return self.configured and not self._breaker.is_open()
+
     @property
     def model_version(self) -> Optional[str]:
-        return self._model if self.available else None
+        return self._model if self.configured else None
 
-    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 256) -> Optional[str]:
-        """Generate a completion from Ollama.
+    def _cache_key(self, system_prompt: str, user_prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+        if not self._cache_completions:
+            return None
+        return make_key(self._ollama_model or "", system_prompt, user_prompt, max_tokens, temperature)
+
+    def _build_payload(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float = 0.3,
+        stream: bool = False,
+        context: Optional[List[int]] = None,
+    ) -> Dict[str, Any]:
+        if context:
+            # System prompt (and earlier turns) are already in the KV context
+            prompt = f"\n\nUSER:\n{user_prompt}"
+        else:
+            prompt = f"SYSTEM:\n{system_prompt}\n\nUSER:\n{user_prompt}"
+        payload: Dict[str, Any] = {
+            "model": self._ollama_model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self._keep_alive,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        }
+        if context:
+            payload["context"] = context
+        return payload
+
+    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 256, temperature: float = 0.3) -> Optional[str]:
+        """Generate a completion from Ollama (blocking).
 
-        Returns `None` on any error so callers can gracefully fall back.
+        Kept for synchronous callers such as scripts; request handlers should
+        use :meth:`agenerate`. Returns `None` on any error so callers can
+        gracefully fall back.
         """
-        if not self.available:
+        if not self.configured:
             print("OllamaClient: Not available (missing base URL or model)")
             return None
 
-        prompt = f"SYSTEM:\n{system_prompt}\n\nUSER:\n{user_prompt}"
+        cache_key = self._cache_key(system_prompt, user_prompt, max_tokens, temperature)
+        cached = llm_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            return cached
+
+        if not self._breaker.allow_request():
+            return None
+
         try:  # pragma: no cover - external API call
             response = httpx.post(
                 f"{self._ollama_base_url}/api/generate",
-                json={
-                    "model": self._ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "num_predict": max_tokens,
-                    },
-                },
-                timeout=30.0,
+                json=self._build_payload(system_prompt, user_prompt, max_tokens, temperature),
+                timeout=self._request_timeout,
             )
             response.raise_for_status()
             data = response.json()
-            text = data.get("response")
-            return text.strip() if text else None
         except Exception as e:  # pragma: no cover - networking
+            self._breaker.record_failure()
             print(f"OllamaClient Error: {e}")
             return None
+
+        self._breaker.record_success()
+        text = data.get("response")
+        result = text.strip() if text else None
+        if cache_key is not None:
+            llm_cache.set(cache_key, result)
+        return result
+
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 256,
+        on_token: Optional[TokenCallback] = None,
+        temperature: float = 0.3,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """Generate a completion from Ollama without blocking the event loop.
+
+        Uses the shared pooled AsyncClient. When ``on_token`` is given the
+        completion is streamed and each partial token is awaited through the
+        callback; the full text is still returned at the end (a cache hit is
+        delivered as a single token). ``timeout`` is a latency budget in
+        seconds; the request is cancelled when it expires. When streaming, the
+        budget only covers the first token: once tokens have been forwarded the
+        completion runs to the end (up to the request timeout), so the caller
+        never falls back after the customer has seen partial text. Returns
+        `None` on any error or timeout so callers can gracefully fall back.
+        ``use_cache=False`` skips the completion cache for prompts that will
+        not repeat (e.g. batches bundling several customers' messages).
+        """
+        text, _ = await self.agenerate_with_context(
+            system_prompt,
+            user_prompt,
+            None,
+            max_tokens=max_tokens,
+            on_token=on_token,
+            temperature=temperature,
+            timeout=timeout,
+            use_cache=use_cache,
+        )
+        return text
+
+    async def agenerate_with_context(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        context: Optional[List[int]],
+        max_tokens: int = 256,
+        on_token: Optional[TokenCallback] = None,
+        temperature: float = 0.3,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Tuple[Optional[str], Optional[List[int]]]:
+        """Like :meth:`agenerate`, but continues from an Ollama ``context``.
+
+        With a ``context`` from a previous call only ``user_prompt`` is sent;
+        the system prompt and earlier turns are reused from Ollama's KV state
+        instead of being prefilled again. Returns ``(text, new_context)``;
+        ``new_context`` is `None` on errors, timeouts and cache hits (the
+        completion cache is only used for context-free calls).
+        """
+        if timeout is None:
+            return await self._agenerate(system_prompt, user_prompt, max_tokens, on_token, temperature, context, use_cache=use_cache)
+
+        # The budget covers the whole completion, or only the first token
+        # when streaming (the customer must not see text and then a fallback)
+        started = time.perf_counter()
+        first_token = asyncio.Event()
+
+        async def forward(token: str) -> None:
+            if not first_token.is_set():
+                first_token.set()
+                latency_recorder.observe("llm.first_token", (time.perf_counter() - started) * 1000)
+            await on_token(token)
+
+        task = asyncio.ensure_future(self._agenerate(
+            system_prompt,
+            user_prompt,
+            max_tokens,
+            forward if on_token is not None else None,
+            temperature,
+            context,
+            use_cache=use_cache,
+        ))
+        waiter = asyncio.ensure_future(first_token.wait())
+        timed_out = False
+        try:
+            await asyncio.wait({task, waiter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not task.done() and not first_token.is_set():
+                # Slow server: counted as a failure by the breaker
+                timed_out = task.cancel(_TIMED_OUT)
+                print(f"OllamaClient: {self._ollama_model} exceeded {timeout * 1000:.0f} ms budget")
+                self._breaker.record_budget_expired()
+                return None, None
+            if not task.done():
+                # Streaming has started; let it finish within the request timeout
+                await asyncio.wait({task}, timeout=self._request_timeout)
+            if not task.done():
+                timed_out = task.cancel(_TIMED_OUT)
+                print(f"OllamaClient: {self._ollama_model} stream exceeded {self._request_timeout:.0f} s request timeout")
+                self._breaker.record_failure()
+                return None, None
+            return task.result()
+        finally:
+            waiter.cancel()
+            if not timed_out and not task.done():
+                # The caller itself was cancelled
+                task.cancel()
+
+    async def _agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        on_token: Optional[TokenCallback],
+        temperature: float,
+        context: Optional[List[int]] = None,
+        use_cache: bool = True,
+    ) -> Tuple[Optional[str], Optional[List[int]]]:
+        if not self.configured:
+            print("OllamaClient: Not available (missing base URL or model)")
+            return None, None
+
+        cache_key = None
+        if use_cache and not context:
+            cache_key = self._cache_key(system_prompt, user_prompt, max_tokens, temperature)
+        if cache_key is not None:
+            cached = await llm_cache.aget(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    await on_token(cached)
+                return cached, None
+
+        if not self._breaker.allow_request():
+            return None, None
+
+        payload = self._build_payload(
+            system_prompt, user_prompt, max_tokens, temperature, stream=on_token is not None, context=context
+        )
+        try:  # pragma: no cover - external API call
+            if on_token is not None:
+                chunks: list[str] = []
+                final: Dict[str, Any] = {}
+                async for data in self._astream_chunks(payload):
+                    token = data.get("response")
+                    if token:
+                        chunks.append(token)
+                        await on_token(token)
+                    if data.get("done"):
+                        final = data
+                text = "".join(chunks)
+            else:
+                response = await get_async_http_client().post(f"{self._ollama_base_url}/api/generate", json=payload)
+                response.raise_for_status()
+                final = response.json()
+                text = final.get("response")
+        except asyncio.CancelledError as exc:
+            # Timeouts are recorded by agenerate_with_context; a caller that
+            # went away says nothing about the server
+            if exc.args[:1] != (_TIMED_OUT,):
+                self._breaker.record_cancelled()
+            raise
+        except Exception as e:  # pragma: no cover - networking
+            self._breaker.record_failure()
+            print(f"OllamaClient Error: {e}")
+            return None, None
+
+        self._breaker.record_success()
+        result = text.strip() if text else None
+        if cache_key is not None:
+            await llm_cache.aset(cache_key, result)
+        return result, final.get("context")
+
+    async def _astream_chunks(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async with get_async_http_client().stream(
+            "POST",
+            f"{self._ollama_base_url}/api/generate",
+            json=payload,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data
+                if data.get("done"):
+                    break
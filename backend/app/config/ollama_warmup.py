@@ -0,0 +1,109 @@
+"""Preload configured Ollama models at startup and report their residency.
+
+Each distinct model named in settings (default, master, sales, verification,
+sanction, underwriting) is loaded with an empty-prompt ``/api/generate``
+call carrying ``keep_alive`` so the first customer to reach a stage does not
+pay the model load, and idle models stay resident between bursts.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config.ollama_client import get_async_http_client
+from app.config.settings import get_settings
+
+_warmup_report: Dict[str, Dict[str, Any]] = {}
+
+
+def configured_models() -> List[str]:
+    """Distinct Ollama model names referenced by settings, default first."""
+    settings = get_settings()
+    names = [
+        settings.ollama_model_default,
+        settings.ollama_model_master,
+        settings.ollama_model_sales,
+        settings.ollama_model_verification,
+        settings.ollama_model_sanction,
+        settings.ollama_model_underwriting,
+    ]
+    seen: List[str] = []
+    for name in names:
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+async def _warm_up(base_url: str, model: str, keep_alive: str, timeout: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:  # pragma: no cover - external API call
+        response = await get_async_http_client().post(
+            f"{base_url}/api/generate",
+            json={"model": model, "prompt": "", "stream": False, "keep_alive": keep_alive},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "model": model,
+            "loaded": True,
+            "load_ms": round((time.perf_counter() - started) * 1000, 1),
+            # Ollama reports its own load_duration in nanoseconds
+            "ollama_load_ms": round((data.get("load_duration") or 0) / 1e6, 1),
+            "warmed_at": time.time(),
+        }
+    except Exception as e:  # pragma: no cover - networking
+        return {
+            "model": model,
+            "loaded": False,
+            "load_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": str(e),
+            "warmed_at": time.time(),
+        }
+
+
+async def warm_up_models() -> Dict[str, Dict[str, Any]]:
+    """Load every configured model concurrently and record load times."""
+    settings = get_settings()
+    base_url = (settings.ollama_base_url or "").rstrip("/")
+    if not base_url:
+        return {}
+    models = configured_models()
+    results = await asyncio.gather(
+        *(_warm_up(base_url, model, settings.ollama_keep_alive, settings.ollama_warmup_timeout_seconds) for model in models)
+    )
+    for result in results:
+        _warmup_report[result["model"]] = result
+    return dict(_warmup_report)
+
+
+async def model_residency() -> Dict[str, Any]:
+    """Warm-up results joined with the models Ollama currently holds in memory (``/api/ps``)."""
+    settings = get_settings()
+    base_url = (settings.ollama_base_url or "").rstrip("/")
+    resident: Dict[str, Dict[str, Any]] = {}
+    error: Optional[str] = None
+    try:  # pragma: no cover - external API call
+        response = await get_async_http_client().get(f"{base_url}/api/ps", timeout=2.0)
+        response.raise_for_status()
+        for item in response.json().get("models", []):
+            resident[item.get("name") or item.get("model")] = item
+    except Exception as e:  # pragma: no cover - networking
+        error = str(e)
+
+    models = []
+    for model in configured_models():
+        # Ollama reports tagged names ("llama3:latest") for untagged config values
+        running = resident.get(model) or resident.get(f"{model}:latest")
+        models.append({
+            "model": model,
+            "resident": running is not None,
+            "expires_at": running.get("expires_at") if running else None,
+            "size_vram": running.get("size_vram") if running else None,
+            "warmup": _warmup_report.get(model),
+        })
+    return {"keep_alive": settings.ollama_keep_alive, "models": models, "error": error}
+
+
+__all__ = ["configured_models", "model_residency", "warm_up_models"]
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import redis
+import redis.asyncio as aioredis
 from app.config.settings import get_settings
 
 settings = get_settings()
@@ -12,4 +13,21 @@ redis_client = redis.Redis.from_url(
     socket_connect_timeout=2.0
 )
 
-__all__ = ["redis_client"]
+# Pooled asyncio client for request-path state reads/writes; the blocking client
+# above stays for worker-thread and startup code.
+async_redis_client = aioredis.Redis(
+    connection_pool=aioredis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout_seconds,
+        socket_timeout=2.0,
+        socket_connect_timeout=2.0,
+    )
+)
+
+
+async def close_async_redis_client() -> None:
+    await async_redis_client.aclose()
+
+
+__all__ = ["async_redis_client", "close_async_redis_client", "redis_client"]
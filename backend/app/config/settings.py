@@ -28,6 +28,56 @@ class Settings(BaseSettings):
     ollama_model_verification: Optional[str] = Field(default=None, env="OLLAMA_MODEL_VERIFICATION")
     ollama_model_sanction: Optional[str] = Field(default=None, env="OLLAMA_MODEL_SANCTION")
     ollama_model_underwriting: Optional[str] = Field(default=None, env="OLLAMA_MODEL_UNDERWRITING")
+    # How long Ollama keeps a model resident after a request, and startup preloading
+    ollama_keep_alive: str = Field(default="30m", env="OLLAMA_KEEP_ALIVE")
+    ollama_warmup_on_startup: bool = Field(default=True, env="OLLAMA_WARMUP_ON_STARTUP")
+    ollama_warmup_timeout_seconds: float = Field(default=120.0, env="OLLAMA_WARMUP_TIMEOUT_SECONDS")
+    # Max Ollama context tokens carried between turns (must stay below the model's num_ctx)
+    ollama_context_max_tokens: int = Field(default=1536, env="OLLAMA_CONTEXT_MAX_TOKENS")
+    # Upper bound for any single Ollama HTTP request
+    ollama_request_timeout_seconds: float = Field(default=10.0, env="OLLAMA_REQUEST_TIMEOUT_SECONDS")
+    # Per-stage LLM latency budgets; on expiry the call is cancelled and the
+    # agent's deterministic fallback copy is used instead. Streamed calls
+    # (greeting, sales over WebSocket) budget the first token only; size them
+    # from the p95 of "llm.first_token" and "llm.sales" in the latency monitor.
+    llm_budget_greeting_ms: int = Field(default=1500, env="LLM_BUDGET_GREETING_MS")
+    # Whole non-streamed sales reply (up to 300 tokens)
+    llm_budget_sales_ms: int = Field(default=8000, env="LLM_BUDGET_SALES_MS")
+    llm_first_token_budget_sales_ms: int = Field(default=2500, env="LLM_FIRST_TOKEN_BUDGET_SALES_MS")
+    llm_budget_emotion_ms: int = Field(default=400, env="LLM_BUDGET_EMOTION_MS")
+    llm_budget_verification_ms: int = Field(default=1000, env="LLM_BUDGET_VERIFICATION_MS")
+    llm_budget_underwriting_ms: int = Field(default=1200, env="LLM_BUDGET_UNDERWRITING_MS")
+    llm_budget_sanction_ms: int = Field(default=1200, env="LLM_BUDGET_SANCTION_MS")
+    # Circuit breaker shared per Ollama base URL + model
+    llm_breaker_window_size: int = Field(default=20, env="LLM_BREAKER_WINDOW_SIZE")
+    llm_breaker_min_calls: int = Field(default=5, env="LLM_BREAKER_MIN_CALLS")
+    llm_breaker_failure_rate: float = Field(default=0.5, env="LLM_BREAKER_FAILURE_RATE")
+    llm_breaker_open_seconds: float = Field(default=30.0, env="LLM_BREAKER_OPEN_SECONDS")
+    # Connection pool for the shared async Ollama client
+    ollama_max_connections: int = Field(default=20, env="OLLAMA_MAX_CONNECTIONS")
+    ollama_max_keepalive_connections: int = Field(default=10, env="OLLAMA_MAX_KEEPALIVE_CONNECTIONS")
+    # Approximate token budget for the CONTEXT DATA block of sales prompts
+    sales_context_token_budget: int = Field(default=350, env="SALES_CONTEXT_TOKEN_BUDGET")
+    # Emotion detection micro-batching
+    emotion_batch_window_ms: float = Field(default=5.0, env="EMOTION_BATCH_WINDOW_MS")
+    emotion_batch_max_size: int = Field(default=16, env="EMOTION_BATCH_MAX_SIZE")
+    # Completion cache (in-process LRU in front of Redis)
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_max_entries: int = Field(default=1024, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_local_ttl_seconds: int = Field(default=900, env="LLM_CACHE_LOCAL_TTL_SECONDS")
+    llm_cache_redis_ttl_seconds: int = Field(default=86400, env="LLM_CACHE_REDIS_TTL_SECONDS")
+    # Only these agents' completions are cached: prompts without customer data
+    # (personalised sales / sanction / underwriting text never repeats and carries PII)
+    llm_cache_agents: str = Field(default="greeting,emotion", env="LLM_CACHE_AGENTS")
+    # Audit trail: append-only Redis stream per conversation, small ring buffer in state
+    audit_ring_size: int = Field(default=10, env="AUDIT_RING_SIZE")
+    audit_batch_size: int = Field(default=50, env="AUDIT_BATCH_SIZE")
+    audit_flush_interval_ms: int = Field(default=500, env="AUDIT_FLUSH_INTERVAL_MS")
+    audit_pending_max: int = Field(default=10000, env="AUDIT_PENDING_MAX")
+    audit_stream_maxlen: int = Field(default=0, env="AUDIT_STREAM_MAXLEN")  # 0 = unbounded
+    # Refreshed on every write; defaults to the terminal conversation TTL so a
+    # trail outlives the state of a finished conversation (0 = never expire)
+    audit_stream_ttl_seconds: int = Field(default=2592000, env="AUDIT_STREAM_TTL_SECONDS")
 
     # OpenAI (fallback / LLM enhancements)
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
@@ -50,12 +100,28 @@ class Settings(BaseSettings):
     # Defaults point to the local FastAPI mock servers started via scripts.run_mock_servers
     bureau_api_base: str = Field(default="http://localhost:8002/api/credit-bureau", env="BUREAU_API_BASE")
     bureau_api_key: Optional[str] = Field(default=None, env="BUREAU_API_KEY")
+    # Speculative bureau pull while the customer is still in SALES / VERIFICATION
+    bureau_prefetch_enabled: bool = Field(default=True, env="BUREAU_PREFETCH_ENABLED")
+    bureau_prefetch_max_age_seconds: int = Field(default=900, env="BUREAU_PREFETCH_MAX_AGE_SECONDS")
+    # PAN-keyed report cache (negative entries for PANs the bureau does not know)
+    bureau_cache_ttl_seconds: int = Field(default=900, env="BUREAU_CACHE_TTL_SECONDS")
+    bureau_negative_cache_ttl_seconds: int = Field(default=120, env="BUREAU_NEGATIVE_CACHE_TTL_SECONDS")
+    bureau_cache_max_entries: int = Field(default=2048, env="BUREAU_CACHE_MAX_ENTRIES")
 
     crm_api_base: str = Field(default="http://localhost:8001/api/crm", env="CRM_API_BASE")
     crm_api_key: Optional[str] = Field(default=None, env="CRM_API_KEY")
+    # Profile cache with request coalescing; failures are cached briefly to avoid stampedes
+    crm_cache_ttl_seconds: int = Field(default=600, env="CRM_CACHE_TTL_SECONDS")
+    crm_cache_failure_ttl_seconds: int = Field(default=15, env="CRM_CACHE_FAILURE_TTL_SECONDS")
+    crm_cache_max_entries: int = Field(default=2048, env="CRM_CACHE_MAX_ENTRIES")
 
     offermart_api_base: str = Field(default="http://localhost:8003/api/offer-mart", env="OFFERMART_API_BASE")
     notification_api_base: str = Field(default="http://localhost:8004/api/notification", env="NOTIFICATION_API_BASE")
+    # Outbox drained in batches by a background worker (/send-bulk), with retries and dead-lettering
+    notification_outbox_batch_size: int = Field(default=50, env="NOTIFICATION_OUTBOX_BATCH_SIZE")
+    notification_outbox_poll_interval_ms: int = Field(default=1000, env="NOTIFICATION_OUTBOX_POLL_INTERVAL_MS")
+    notification_max_attempts: int = Field(default=5, env="NOTIFICATION_MAX_ATTEMPTS")
+    notification_retry_backoff_seconds: float = Field(default=5.0, env="NOTIFICATION_RETRY_BACKOFF_SECONDS")
 
     # Database
     database_url: str = Field(
@@ -65,6 +131,18 @@ class Settings(BaseSettings):
 
     # Redis / Cache
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
+    # Async connection pool used by the conversation state store
+    redis_max_connections: int = Field(default=50, env="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout_seconds: float = Field(default=2.0, env="REDIS_POOL_TIMEOUT_SECONDS")
+    # Stored conversation states larger than this are zstd-compressed when zstandard is installed; 0 disables
+    state_compress_threshold_bytes: int = Field(default=4096, env="STATE_COMPRESS_THRESHOLD_BYTES")
+    # Conversation state expiry, refreshed on every write. COMPLETED/REJECTED conversations use
+    # the terminal TTL (sanction letters stay valid for 30 days, so acceptance must still work)
+    state_ttl_seconds: int = Field(default=172800, env="STATE_TTL_SECONDS")
+    state_terminal_ttl_seconds: int = Field(default=2592000, env="STATE_TERMINAL_TTL_SECONDS")
+    # In-process fallback copy of recent states (LRU, bounded by count and encoded size)
+    state_fallback_max_entries: int = Field(default=1000, env="STATE_FALLBACK_MAX_ENTRIES")
+    state_fallback_max_bytes: int = Field(default=67108864, env="STATE_FALLBACK_MAX_BYTES")
 
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -88,9 +166,24 @@ class Settings(BaseSettings):
     enable_gamification: bool = Field(default=True, env="ENABLE_GAMIFICATION")
     enable_explainability: bool = Field(default=True, env="ENABLE_EXPLAINABILITY")
 
+    # Sanction letter PDFs are rendered in a bounded process pool
+    sanction_pdf_workers: int = Field(default=2, env="SANCTION_PDF_WORKERS")
+    sanction_pdf_max_queue: int = Field(default=32, env="SANCTION_PDF_MAX_QUEUE")
+    # Renders waiting for a pool slot; beyond this new letters are shed
+    sanction_pdf_max_deferred: int = Field(default=64, env="SANCTION_PDF_MAX_DEFERRED")
+
     # Timeouts
     request_timeout_seconds: int = Field(default=30, env="REQUEST_TIMEOUT_SECONDS")
+    # Shared pools for CRM / Bureau / OfferMart / Notification (one per service)
+    http_max_connections: int = Field(default=50, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, env="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry_seconds: float = Field(default=30.0, env="HTTP_KEEPALIVE_EXPIRY_SECONDS")
+    http_enable_http2: bool = Field(default=False, env="HTTP_ENABLE_HTTP2")
+    http_retries: int = Field(default=2, env="HTTP_RETRIES")
+    http_retry_backoff_ms: int = Field(default=100, env="HTTP_RETRY_BACKOFF_MS")
     long_task_timeout_seconds: int = Field(default=120, env="LONG_TASK_TIMEOUT_SECONDS")
+    # Shared deadline for the concurrent per-turn analysis phase (CRM, emotion, intent)
+    orchestrator_analysis_timeout_seconds: float = Field(default=3.0, env="ORCHESTRATOR_ANALYSIS_TIMEOUT_SECONDS")
 
     class Config:
         env_file = ".env"
@@ -1,8 +1,11 @@
 """FastAPI application factory for the IntelliApprove backend."""
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.middleware.cors_config import add_cors
 
 from app.api.v1 import (
@@ -15,8 +18,18 @@ from app.api.v1 import (
     bureau_routes,
     underwriting_routes,
     loan_routes,
+    ws_routes,
 )
+from app.config.http_clients import close_service_clients
+from app.config.ollama_client import close_async_http_client
+from app.config.ollama_warmup import warm_up_models
+from app.config.redis_config import close_async_redis_client
 from app.config.settings import get_settings
+from app.orchestrator.state_manager import StateConflictError
+from app.services.audit_stream import audit_stream
+from app.services.notification_outbox import notification_outbox
+from app.services.notification_service import NotificationService
+from app.workers.pdf_renderer import sanction_renderer
 
 
 def create_app() -> FastAPI:
@@ -40,6 +53,15 @@ def create_app() -> FastAPI:
     app.include_router(bureau_routes.router, prefix=prefix)
     app.include_router(underwriting_routes.router, prefix=prefix)
     app.include_router(loan_routes.router, prefix=prefix)
+    app.include_router(ws_routes.router, prefix=prefix)
+
+    @app.exception_handler(StateConflictError)
+    async def state_conflict_handler(request: Request, exc: StateConflictError) -> JSONResponse:
+        # Another worker wrote the conversation first; the client reloads /chat/state and retries
+        return JSONResponse(
+            status_code=409,
+            content={"detail": str(exc), "conversation_id": exc.conversation_id, "revision": exc.current},
+        )
 
     @app.get("/health", tags=["System"])
     def healthcheck() -> dict[str, str]:
@@ -54,6 +76,29 @@ def create_app() -> FastAPI:
                 print(f"   {route.methods} {route.path}")
         print("\n")
 
+        # Preload every configured Ollama model in the background so the
+        # first customer at each stage does not pay the model load
+        if settings.ollama_warmup_on_startup:
+            app.state.model_warmup = asyncio.create_task(warm_up_models())
+
+        # Batched writer for the append-only audit stream
+        audit_stream.start()
+        # Background delivery of queued email / SMS notifications
+        notification_outbox.start(NotificationService())
+        # Sanction letter PDF process pool
+        sanction_renderer.start()
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        # Flush audit entries still queued in memory
+        await audit_stream.stop()
+        await notification_outbox.stop()
+        sanction_renderer.shutdown()
+        # Release pooled keep-alive connections to Ollama and downstream services
+        await close_async_http_client()
+        await close_service_clients()
+        await close_async_redis_client()
+
     return app
 
 
@@ -1,38 +1,148 @@
-"""Emotion detection from user text using Ollama."""
-from typing import Dict, Optional
+"""Emotion detection from user text using Ollama.
+
+``EmotionDetector`` is a long-lived service: it loads its model name and
+system prompt once, and concurrent ``detect`` calls that arrive within a
+short window (``EMOTION_BATCH_WINDOW_MS``) are classified together in a
+single batched JSON prompt. Each caller gets its own result back; any
+message the LLM fails to classify falls back to the rule-based detector.
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from app.config.ollama_client import OllamaClient
 from app.config.settings import get_settings
 from app.orchestrator.prompts import get_emotion_system_prompt
 
+_Pending = Tuple[str, "asyncio.Future[Dict[str, Any]]"]
+
+
 class EmotionDetector:
-    """Detect emotional state from user input using LLM."""
+    """Detect emotional state from user input using LLM (micro-batched)."""
 
-    @staticmethod
-    def detect(text: str) -> Dict[str, any]:
-        """Detect emotion from text; return {primary, confidence}."""
+    LABELS = ("joy", "neutral", "anxiety", "anger", "sadness", "confusion")
+
+    def __init__(self) -> None:
         settings = get_settings()
         # Use per-agent Ollama model when configured, otherwise default
         model_name = settings.ollama_model_master or settings.ollama_model_default
-        client = OllamaClient(model=model_name)
-        
-        if not client.available:
+        self._client = OllamaClient(model=model_name, agent="emotion")
+        self._llm_budget = settings.llm_budget_emotion_ms / 1000.0
+        self._system_prompt = get_emotion_system_prompt() or (
+            "You are an emotion classifier for Tata Capital's loan assistant. "
+            "Classify each message into joy, neutral, anxiety, anger, sadness, or confusion and return JSON."
+        )
+        self._batch_window = settings.emotion_batch_window_ms / 1000.0
+        self._max_batch_size = max(1, settings.emotion_batch_max_size)
+        self._pending: List[_Pending] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Strong references to in-flight batches; the loop only keeps weak ones
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    async def detect(self, text: str) -> Dict[str, Any]:
+        """Detect emotion from text; return {primary, confidence}."""
+        if not self._client.available:
             # Fallback to rule-based if LLM is down
             return EmotionDetector._rule_based_detect(text)
 
-        system_prompt = get_emotion_system_prompt() or (
-            "You are an emotion classifier for Tata Capital's loan assistant. "
-            "Classify each message into joy, neutral, anxiety, anger, sadness, or confusion and return JSON."
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+
+        # Shield so a caller hitting its own deadline does not cancel the
+        # batch that other conversations are waiting on.
+        return await asyncio.shield(future)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._batch_window)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._classify_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _classify_batch(self, batch: List[_Pending]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            if len(texts) == 1:
+                results = [await self._classify_one(texts[0])]
+            else:
+                results = await self._classify_many(texts)
+        except Exception:
+            results = [None] * len(texts)
+
+        for (text, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result or EmotionDetector._rule_based_detect(text))
+
+    async def _classify_one(self, text: str) -> Optional[Dict[str, Any]]:
+        response = await self._client.agenerate(self._system_prompt, text, max_tokens=50, timeout=self._llm_budget)
+        return self._normalize(self._parse_json(response))
+
+    async def _classify_many(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        messages = [{"id": idx, "text": text} for idx, text in enumerate(texts)]
+        user_prompt = (
+            "Classify EACH of the following customer messages independently.\n"
+            "Return ONLY a JSON array with one object per message, in the same order, like:\n"
+            '[{"id": 0, "primary": "<label>", "confidence": <0-1>}]\n'
+            f"MESSAGES: {json.dumps(messages, ensure_ascii=False)}"
+        )
+        response = await self._client.agenerate(
+            self._system_prompt,
+            user_prompt,
+            max_tokens=30 * len(texts) + 20,
+            timeout=self._llm_budget,
+            # A batch of several customers' messages never repeats
+            use_cache=False,
         )
-        
+        parsed = self._parse_json(response)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        if not isinstance(parsed, list):
+            return results
+        for position, item in enumerate(parsed):
+            if not isinstance(item, dict):
+                continue
+            idx = item.get("id", position)
+            if isinstance(idx, int) and 0 <= idx < len(texts):
+                results[idx] = self._normalize(item)
+        return results
+
+    @staticmethod
+    def _parse_json(response: Optional[str]) -> Any:
+        if not response:
+            return None
+        # Clean up potential markdown code blocks
+        cleaned = response.replace("```json", "").replace("```", "").strip()
         try:
-            response = client.generate(system_prompt, text, max_tokens=50)
-            import json
-            # Clean up potential markdown code blocks
-            cleaned = response.replace("```json", "").replace("```", "").strip()
             return json.loads(cleaned)
-        except Exception:
-            return EmotionDetector._rule_based_detect(text)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _normalize(cls, item: Any) -> Optional[Dict[str, Any]]:
+        """Map an LLM JSON object onto {primary, confidence}, or None."""
+        if not isinstance(item, dict):
+            return None
+        primary = str(item.get("primary") or item.get("emotion") or "").lower()
+        if primary not in cls.LABELS:
+            return None
+        try:
+            confidence = min(max(float(item.get("confidence", 0.5)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            confidence = 0.5
+        return {"primary": primary, "confidence": confidence}
 
     @staticmethod
     def _rule_based_detect(text: str) -> Dict[str, any]:
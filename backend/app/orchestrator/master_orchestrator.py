@@ -1,25 +1,31 @@
 """High-level orchestrator coordinating all stages."""
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
-from app.config.ollama_client import OllamaClient
+from app.background.monitoring import current_stage, latency_recorder
+from app.config.ollama_client import OllamaClient, TokenCallback
 from app.config.settings import get_settings
 from app.orchestrator.emotion_detector import EmotionDetector
 from app.orchestrator.intent_classifier import IntentClassifier
 from app.orchestrator.state_manager import StateManager
 from app.orchestrator.prompts import get_master_system_prompt
 from app.schemas.audit import AuditEntry
+from app.schemas.bureau import BureauReport
 from app.schemas.conversation_state import EmotionState, OrchestratorRequest, OrchestratorResponse, OrchestratorState, StageType
 from app.schemas.underwriting import UnderwritingExplainability
 from app.services.analytics import AnalyticsTracker
+from app.services.audit_stream import audit_stream
 from app.services.bureau_service import BureauService
 from app.services.crm_service import CRMService
 from app.services.offermart_service import OffermartService
 from app.services.notification_service import NotificationService
 from app.services.vector_service import VectorService
+from app.utils.json_patch import diff as json_patch_diff
 from app.utils.time_utils import utc_now_iso
 from app.workers.gamification_engine import GamificationEngine
 from app.workers.pricing_engine import PricingEngine
@@ -55,7 +61,8 @@ class MasterOrchestrator:
 
         # LLM for Master Agent (can use a dedicated fine-tuned Ollama model)
         model_name = settings.ollama_model_master or settings.ollama_model_default
-        self.llm_client = OllamaClient(model=model_name)
+        self.llm_client = OllamaClient(model=model_name, agent="greeting")
+        self._greeting_budget = settings.llm_budget_greeting_ms / 1000.0
         self.master_system_prompt = get_master_system_prompt() or (
             "You are 'IntelliApprove', an AI loan assistant for Tata Capital. "
             "Greet the customer warmly and explain in one short paragraph how you can help with personal loans. "
@@ -70,6 +77,12 @@ class MasterOrchestrator:
         self.scoring_engine = ScoringEngine()
         self.emotion_detector = EmotionDetector()
         self.intent_classifier = IntentClassifier()
+        self._analysis_timeout = settings.orchestrator_analysis_timeout_seconds
+        self._audit_ring_size = max(1, settings.audit_ring_size)
+        self._bureau_prefetch_enabled = settings.bureau_prefetch_enabled
+        self._bureau_max_age = settings.bureau_prefetch_max_age_seconds
+        # PAN -> (in-flight or finished bureau pull, monotonic start time)
+        self._bureau_prefetches: Dict[str, Tuple[asyncio.Task, float]] = {}
 
     async def process_message(
         self,
@@ -77,26 +90,33 @@ class MasterOrchestrator:
         user_input: str,
         language: str = "en",
         context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[TokenCallback] = None,
+        base_revision: Optional[int] = None,
     ) -> Dict[str, Any]:
         """High-level helper matching the design doc API.
 
         This wraps `orchestrate` under the hood, so both REST and WebSocket
         callers can either use the strict OrchestratorRequest schema or this
-        simpler signature (session_id + text + language).
+        simpler signature (session_id + text + language). ``on_token`` is
+        passed through to ``orchestrate`` for streaming clients, and
+        ``base_revision`` lets in-sync clients receive a ``state_patch``
+        instead of the full ``state``.
         """
 
-        # Load or initialise state
-        state = self.state_manager.get_state(session_id) or OrchestratorState(
-            conversation_id=session_id,
-            language=language,
-        )
+        async with self.state_manager.lock(session_id):
+            # Load or initialise state
+            state = await self.state_manager.get_state(session_id) or OrchestratorState(
+                conversation_id=session_id,
+                language=language,
+            )
 
-        req = OrchestratorRequest(
-            user_message=user_input,
-            state=state,
-        )
+            req = OrchestratorRequest(
+                user_message=user_input,
+                state=state,
+                base_revision=base_revision,
+            )
 
-        resp = await self.orchestrate(req)
+            resp = await self.orchestrate(req, on_token=on_token)
 
         return {
             "type": "ai_message",
@@ -105,21 +125,54 @@ class MasterOrchestrator:
             "action": resp.next_action,
             "stage": resp.stage,
             "state": resp.state_updates,
+            "state_patch": resp.state_patch,
+            "invoke_worker": resp.invoke_worker,
+            "revision": resp.revision,
+            "base_revision": resp.base_revision,
             "conversation_id": resp.conversation_id,
         }
 
-    async def orchestrate(self, payload: OrchestratorRequest) -> OrchestratorResponse:
+    async def orchestrate(self, payload: OrchestratorRequest, on_token: Optional[TokenCallback] = None) -> OrchestratorResponse:
         """
         Master orchestration logic with clear decision points.
         Replaces the previous handle_request logic with the new Decision Tree.
+
+        ``on_token`` (optional) receives partial tokens of the customer-facing
+        LLM reply (greeting / sales pitch) while it is being generated. The
+        returned response still carries the final, authoritative message.
+
+        When ``payload.base_revision`` equals the stored state's revision, the
+        response carries a JSON Patch against that revision in
+        ``state_patch`` and leaves ``state_updates`` empty; any other value
+        (or none) gets the full snapshot, which is how clients resync.
+
+        Every phase of the turn is timed into ``latency_recorder`` under the
+        stage the turn started in (see ``/admin/latency``).
+
+        Callers that loaded the state from the state manager hold
+        ``StateManager.lock`` for the conversation around this call; if
+        another worker wrote the conversation in the meantime the turn ends
+        with ``StateConflictError``.
         """
+        stage_token = current_stage.set(payload.state.stage or "NEW")
+        try:
+            with latency_recorder.span("turn"):
+                return await self._run_turn(payload, on_token)
+        finally:
+            current_stage.reset(stage_token)
+
+    async def _run_turn(self, payload: OrchestratorRequest, on_token: Optional[TokenCallback]) -> OrchestratorResponse:
         # 1. Hydrate / initialise state
         state = payload.state
         if not state.conversation_id:
             state.conversation_id = f"conv_{uuid4().hex[:10]}"
         user_input = payload.user_message or ""
+        base_snapshot: Optional[Dict[str, Any]] = None
+        if payload.base_revision is not None and payload.base_revision == state.revision:
+            base_snapshot = self._state_snapshot(state)
         
         # Ensure CRM / customer data is present
+        crm_customer_id: Optional[str] = None
         if not state.customer_profile:
             # If the caller passed a customer_profile with an id, hydrate it via CRMService
             incoming_profile = payload.customer_profile or {}
@@ -127,7 +180,8 @@ class MasterOrchestrator:
 
             if customer_id:
                 # Use the lightweight CRM mock to fetch a richer snapshot
-                state.customer_profile = self.crm.get_customer_profile(customer_id)
+                # (runs concurrently with emotion / intent analysis below)
+                crm_customer_id = customer_id
             elif incoming_profile:
                 # Fallback: trust whatever structured profile the caller provided
                 state.customer_profile = incoming_profile
@@ -135,22 +189,20 @@ class MasterOrchestrator:
                 # Demo fallback when no profile is provided
                 self._hydrate_crm_snapshot(state)
 
-        # 2. Analyze Input
+        # 2. Analyze Input (CRM hydration, emotion and intent run concurrently)
+        profile, emotion_result, (intent_name, intent_conf) = await self._analyze_turn(crm_customer_id, user_input)
+        if crm_customer_id:
+            state.customer_profile = profile or payload.customer_profile
+
         if user_input and user_input.strip():
-            emotion_result = self.emotion_detector.detect(user_input)
-            intent_name, intent_conf = self.intent_classifier.classify(user_input)
-            
             # Language Detection (Simple)
             if "english" in user_input.lower() and "tell" in user_input.lower():
                 state.language = "en"
             elif "hindi" in user_input.lower() or "hinglish" in user_input.lower():
                 state.language = "hi"
-        else:
-            # Skip analysis for empty input (e.g. initial load)
-            emotion_result = {"primary": "neutral", "confidence": 1.0}
-            intent_name, intent_conf = (None, 0.0)
 
         state.last_intent = intent_name
+        self._harvest_bureau_prefetch(state)
 
         # Normalise emotion into EmotionState for clean Pydantic serialization
         if isinstance(emotion_result, EmotionState):
@@ -164,6 +216,7 @@ class MasterOrchestrator:
         # 3. Decision Tree Execution
         response_message = ""
         worker_action = None
+        worker_info: Dict[str, Any] = {"name": "orchestrator", "payload": {}}
         
         # Initialize stage if None
         if state.stage is None:
@@ -178,7 +231,7 @@ class MasterOrchestrator:
             # agentic, but fall back to a fixed copy if Ollama is not
             # available or fails.
             if self.llm_client.available:
-                llm_greeting = self.llm_client.generate(
+                llm_greeting = await latency_recorder.timed("llm.greeting", self.llm_client.agenerate(
                     system_prompt=self.master_system_prompt,
                     user_prompt=(
                         "A new customer has just opened the chat window but "
@@ -187,7 +240,9 @@ class MasterOrchestrator:
                         "STRICTLY NO EMOJIS."
                     ),
                     max_tokens=160,
-                )
+                    on_token=on_token,
+                    timeout=self._greeting_budget,
+                ))
                 response_message = llm_greeting or (
                     "Hi, I'm IntelliApprove, your AI loan assistant from Tata Capital.\n\n"
                     "• I can help you explore personal loan options tailored to you.\n"
@@ -205,24 +260,28 @@ class MasterOrchestrator:
         elif state.stage == "GREETING":
             if intent_name in ['positive_interest', 'ask_loan', 'proceed_agreement']:
                 next_stage = "SALES"
-                response_message = self.sales_agent.craft_pitch(
-                    context=state.model_dump(), 
+                response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(
+                    context=self._sales_context(state), 
                     user_message=user_input, 
-                    mode='needs_discovery'
-                )
+                    mode='needs_discovery',
+                    on_token=on_token,
+                    llm_context=state.llm_context,
+                ))
             elif intent_name == 'negative':
                 response_message = "No problem! I'm here if you need funds later. Have a great day!"
                 next_stage = "COMPLETED"
             elif intent_name == 'ask_rate' or intent_name == 'ask_emi':
-                 response_message = self.sales_agent.craft_pitch(
-                    context=state.model_dump(), 
+                 response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(
+                    context=self._sales_context(state), 
                     user_message=user_input, 
-                    mode='information_only'
-                )
+                    mode='information_only',
+                    on_token=on_token,
+                    llm_context=state.llm_context,
+                ))
             else:
                  # Default fallthrough to sales
                  next_stage = "SALES"
-                 response_message = self.sales_agent.craft_pitch(context=state.model_dump(), user_message=user_input, mode='needs_discovery')
+                 response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(context=self._sales_context(state), user_message=user_input, mode='needs_discovery', on_token=on_token, llm_context=state.llm_context))
 
         # DECISION POINT 3: Sales Engagement
         elif state.stage == "SALES":
@@ -239,12 +298,14 @@ class MasterOrchestrator:
                 if concern_type == 'affordability_anxiety':
                     objection_data = self.sales_agent.handle_affordability_objection(state.customer_profile, state.loan_request.model_dump())
                 
-                response_message = self.sales_agent.craft_pitch(
-                    context={**state.model_dump(), **objection_data},
+                response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(
+                    context={**self._sales_context(state), **objection_data},
                     user_message=user_input,
                     mode='objection_handling',
-                    concern_type=concern_type
-                )
+                    concern_type=concern_type,
+                    on_token=on_token,
+                    llm_context=state.llm_context,
+                ))
             
             # Sub-decision 3B: Agreement?
             elif intent_name in ['proceed_agreement', 'positive_interest']:
@@ -253,15 +314,17 @@ class MasterOrchestrator:
             
             # Sub-decision 3C: Modification?
             elif intent_name == 'modification_request':
-                response_message = self.sales_agent.craft_pitch(
-                    context=state.model_dump(),
+                response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(
+                    context=self._sales_context(state),
                     user_message=user_input,
                     mode='renegotiation',
-                    modification={'request': user_input}
-                )
+                    modification={'request': user_input},
+                    on_token=on_token,
+                    llm_context=state.llm_context,
+                ))
             else:
                 # Default: continue sales pitch
-                response_message = self.sales_agent.craft_pitch(context=state.model_dump(), user_message=user_input, mode='needs_discovery')
+                response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(context=self._sales_context(state), user_message=user_input, mode='needs_discovery', on_token=on_token, llm_context=state.llm_context))
 
         # DECISION POINT 4: Verification
         elif state.stage == "VERIFICATION":
@@ -283,14 +346,14 @@ class MasterOrchestrator:
                     "phone_mask": state.kyc.phone_mask,
                     "kyc_status": "verified",
                 }
-                kyc_message = self.verification_agent.summarize_checks(verification_context)
+                kyc_message = await latency_recorder.timed("llm.verification", self.verification_agent.summarize_checks(verification_context))
 
                 # DECISION POINT 5: Underwriting
                 # Call mock bureau to attach a bureau snapshot for explainability
+                # (usually already prefetched during SALES, see _prefetch_bureau)
                 try:
-                    bureau_report = self.bureau.fetch_report(state.customer_profile.get("pan"))
-                    # Persist bureau snapshot for explainability
-                    state.underwriting["bureau_report"] = bureau_report.dict()
+                    with latency_recorder.span("bureau.fetch"):
+                        bureau_report = await self._bureau_report(state)
                     # Also surface credit_score on the customer profile for downstream agents
                     state.customer_profile["credit_score"] = bureau_report.score
                     # Attach raw bureau snapshot so underwriting rules can see defaults / enquiries
@@ -300,7 +363,8 @@ class MasterOrchestrator:
                     pass
 
                 # Edge Case: Credit Score + DTI + defaults
-                credit_eval = self.underwriting_agent.evaluate_credit_score(state.customer_profile)
+                with latency_recorder.span("underwriting.rules"):
+                    credit_eval = self.underwriting_agent.evaluate_credit_score(state.customer_profile)
 
                 if credit_eval.get("decision") == "REJECT":
                     next_stage = "REJECTED"
@@ -323,7 +387,7 @@ class MasterOrchestrator:
                             }
                         ],
                     }
-                    underwriting_message = self.underwriting_agent.explain_decision(explain_payload)
+                    underwriting_message = await latency_recorder.timed("llm.underwriting", self.underwriting_agent.explain_decision(explain_payload))
                     response_message = f"{kyc_message} {underwriting_message or summary}"
                 else:
                     # Combine pre‑approved limit, income and EMI into a richer decision
@@ -334,10 +398,11 @@ class MasterOrchestrator:
                     if not loan_req.get("emi") and state.offer.emi:
                         loan_req["emi"] = state.offer.emi
 
-                    approval_eval = self.underwriting_agent.evaluate_conditional_approval(
-                        state.customer_profile,
-                        loan_req,
-                    )
+                    with latency_recorder.span("underwriting.rules"):
+                        approval_eval = self.underwriting_agent.evaluate_conditional_approval(
+                            state.customer_profile,
+                            loan_req,
+                        )
 
                     decision_flag = approval_eval.get("decision")
 
@@ -366,7 +431,7 @@ class MasterOrchestrator:
                             "summary": "Your application requires a human underwriter to review some risk factors.",
                             "factors": [],
                         }
-                        underwriting_message = self.underwriting_agent.explain_decision(explain_payload)
+                        underwriting_message = await latency_recorder.timed("llm.underwriting", self.underwriting_agent.explain_decision(explain_payload))
                         response_message = (
                             f"{kyc_message} "
                             f"{underwriting_message}"
@@ -383,7 +448,7 @@ class MasterOrchestrator:
                             "summary": rejection_summary,
                             "factors": [],
                         }
-                        underwriting_message = self.underwriting_agent.explain_decision(explain_payload)
+                        underwriting_message = await latency_recorder.timed("llm.underwriting", self.underwriting_agent.explain_decision(explain_payload))
                         response_message = f"{kyc_message} {underwriting_message or rejection_summary}"
 
             elif intent_name == 'kyc_mismatch':
@@ -409,11 +474,12 @@ class MasterOrchestrator:
                 if not loan_req.get("emi"):
                     loan_req["emi"] = state.offer.emi or 0
 
-                decision = self.underwriting_agent.reevaluate_with_salary(
-                    state.customer_profile,
-                    loan_req,
-                    salary_data,
-                )
+                with latency_recorder.span("underwriting.rules"):
+                    decision = self.underwriting_agent.reevaluate_with_salary(
+                        state.customer_profile,
+                        loan_req,
+                        salary_data,
+                    )
 
                 if decision.get("decision") == "APPROVED":
                     next_stage = "SANCTION"
@@ -432,7 +498,7 @@ class MasterOrchestrator:
                         "summary": summary,
                         "factors": [],
                     }
-                    underwriting_message = self.underwriting_agent.explain_decision(explain_payload)
+                    underwriting_message = await latency_recorder.timed("llm.underwriting", self.underwriting_agent.explain_decision(explain_payload))
                     response_message = underwriting_message or summary
             else:
                 response_message = "Please upload your salary slip (PDF/Image) to proceed."
@@ -447,11 +513,18 @@ class MasterOrchestrator:
                 "rate": state.offer.personalized_rate or state.offer.standard_rate,
             }
 
-            sanction_meta = self.sanction_agent.generate_letter(state.customer_profile, loan_details)
+            # Rendering happens in the PDF process pool; only the submit is timed here
+            with latency_recorder.span("sanction.pdf"):
+                sanction_meta = await self.sanction_agent.submit_letter(state.customer_profile, loan_details)
 
             state.sanction.sanction_number = sanction_meta.get("sanction_number")
             state.sanction.pdf_url = sanction_meta.get("file_path")
             state.sanction.valid_until = sanction_meta.get("valid_until")
+            # Status at submit time only; the render finishes after this turn
+            worker_info = {
+                "name": "sanction_pdf",
+                "payload": {"sanction_number": state.sanction.sanction_number, "pdf_status": sanction_meta.get("pdf_status")},
+            }
 
             summary_payload = {
                 "customer": state.customer_profile,
@@ -459,20 +532,21 @@ class MasterOrchestrator:
                 "sanction": sanction_meta,
             }
 
-            summary_message = self.sanction_agent.format_summary(summary_payload)
+            summary_message = await latency_recorder.timed("llm.sanction", self.sanction_agent.format_summary(summary_payload))
 
-            # Fire-and-forget notification via mock notification server
+            # Queue the notification on the outbox; delivery happens in the background
             try:
                 customer = state.customer_profile or {}
-                self.notifications.send_sanction_notification(
-                    email=customer.get("email"),
-                    phone=customer.get("phone"),
-                    customer_name=customer.get("name", "Valued Customer"),
-                    amount=loan_details["amount"] or 0.0,
-                    tenure_months=loan_details["tenure"] or 0,
-                    rate=loan_details["rate"] or 0.0,
-                    sanction_number=state.sanction.sanction_number or "UNKNOWN",
-                )
+                with latency_recorder.span("notification"):
+                    await self.notifications.send_sanction_notification(
+                        email=customer.get("email"),
+                        phone=customer.get("phone"),
+                        customer_name=customer.get("name", "Valued Customer"),
+                        amount=loan_details["amount"] or 0.0,
+                        tenure_months=loan_details["tenure"] or 0,
+                        rate=loan_details["rate"] or 0.0,
+                        sanction_number=state.sanction.sanction_number or "UNKNOWN",
+                    )
             except Exception:
                 # Do not break chat flow if notification fails
                 pass
@@ -484,14 +558,16 @@ class MasterOrchestrator:
 
         # Fallback
         else:
-            response_message = self.sales_agent.craft_pitch(context=state.dict(), user_message=user_input, mode='needs_discovery')
+            response_message = await latency_recorder.timed("llm.sales", self.sales_agent.craft_pitch(context=self._sales_context(state), user_message=user_input, mode='needs_discovery', on_token=on_token, llm_context=state.llm_context))
 
         # Update State
         state.stage = next_stage
+        if next_stage in ("SALES", "VERIFICATION"):
+            self._prefetch_bureau(state)
 
-        # Append a lightweight audit trail of the conversation turn so
-        # that the full chatbot message history is stored alongside the
-        # loan pipeline state (in Redis / DB via StateManager).
+        # Record the turn in the append-only audit stream; the state only
+        # keeps the last few entries so its size stays flat as the
+        # conversation grows.
         audit_entry = AuditEntry(
             timestamp=datetime.now(timezone.utc),
             actor="system",
@@ -508,16 +584,19 @@ class MasterOrchestrator:
             model_version=self.llm_client.model_version,
         )
         try:
-            state.audit_log.append(audit_entry.model_dump())
+            entry = audit_entry.model_dump(mode="json")
+            audit_stream.append(state.conversation_id, entry)
+            state.audit_log = (state.audit_log + [entry])[-self._audit_ring_size:]
         except Exception:
             # If audit logging fails, don't break the main flow.
             pass
 
-        self.state_manager.upsert_state(state)
+        # Compare-and-set on state.revision; bumps it for the response below
+        with latency_recorder.span("state.upsert"):
+            await self.state_manager.upsert_state(state)
         
         # Determine next_action and invoke_worker
         action = "continue"
-        worker_info = {"name": "orchestrator", "payload": {}}
 
         if next_stage == "VERIFICATION" and "OTP" in response_message:
             action = "request_otp"
@@ -531,17 +610,153 @@ class MasterOrchestrator:
             action = "end"
         
         # Construct Response
+        snapshot = self._state_snapshot(state)
+        state_patch = json_patch_diff(base_snapshot, snapshot) if base_snapshot is not None else None
         return OrchestratorResponse(
             conversation_id=state.conversation_id,
             stage=state.stage,
             message_to_user=response_message,
-            state_updates=state.model_dump(),
+            state_updates={} if state_patch is not None else snapshot,
+            revision=state.revision,
+            base_revision=payload.base_revision if state_patch is not None else None,
+            state_patch=state_patch,
             model_version=self.llm_client.model_version,
             invoke_worker=worker_info,
             audit_entry=audit_entry.model_dump(),
             next_action=action,
         )
 
+    async def _analyze_turn(
+        self,
+        crm_customer_id: Optional[str],
+        user_input: str,
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], Tuple[Optional[str], float]]:
+        """Run the independent per-turn lookups concurrently.
+
+        CRM hydration (when ``crm_customer_id`` is set), emotion detection and
+        intent classification share one deadline
+        (``orchestrator_analysis_timeout_seconds``). Anything still pending at
+        the deadline is cancelled and replaced by its deterministic fallback,
+        so the caller always chooses a branch with a complete set of results.
+        Intent classification is pure keyword matching, so it runs inline
+        while the I/O-bound lookups are in flight.
+        """
+        has_text = bool(user_input and user_input.strip())
+        tasks: Dict[str, asyncio.Task] = {}
+        if crm_customer_id:
+            tasks["crm"] = asyncio.create_task(
+                latency_recorder.timed("crm", self.crm.get_customer_profile(crm_customer_id))
+            )
+        if has_text:
+            tasks["emotion"] = asyncio.create_task(latency_recorder.timed("emotion", self.emotion_detector.detect(user_input)))
+            with latency_recorder.span("intent"):
+                intent = self.intent_classifier.classify(user_input)
+        else:
+            intent = (None, 0.0)
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self._analysis_timeout)
+            for task in pending:
+                task.cancel()
+
+        def _result(name: str, fallback: Any) -> Any:
+            task = tasks.get(name)
+            if task is None or not task.done() or task.cancelled() or task.exception() is not None:
+                return fallback
+            return task.result()
+
+        profile = _result("crm", None)
+        if has_text:
+            emotion_result = _result("emotion", None) or self.emotion_detector._rule_based_detect(user_input)
+        else:
+            # Skip analysis for empty input (e.g. initial load)
+            emotion_result = {"primary": "neutral", "confidence": 1.0}
+        return profile, emotion_result, intent
+
+    async def _fetch_bureau(self, pan: Optional[str]) -> Tuple[BureauReport, str]:
+        report = await self.bureau.fetch_report(pan)
+        return report, utc_now_iso()
+
+    def _prefetch_bureau(self, state: OrchestratorState) -> None:
+        """Start a background bureau pull once the PAN is known.
+
+        Runs while the customer is still in SALES / VERIFICATION so the
+        VERIFICATION -> UNDERWRITING turn does not wait on the bureau. Pulls
+        live in this process only; a turn served by another worker simply
+        fetches the report itself.
+        """
+        pan = (state.customer_profile or {}).get("pan")
+        if not self._bureau_prefetch_enabled or not pan or self._fresh_bureau_report(state) is not None:
+            return
+        now = time.monotonic()
+        for key, (task, started) in list(self._bureau_prefetches.items()):
+            # Drop pulls nobody collected before they went stale
+            if task.done() and now - started > self._bureau_max_age:
+                self._bureau_prefetches.pop(key, None)
+        if pan not in self._bureau_prefetches:
+            self._bureau_prefetches[pan] = (asyncio.create_task(self._fetch_bureau(pan)), now)
+
+    def _harvest_bureau_prefetch(self, state: OrchestratorState) -> None:
+        """Move a finished prefetch into state so it is persisted with the turn."""
+        pan = (state.customer_profile or {}).get("pan")
+        entry = self._bureau_prefetches.get(pan) if pan else None
+        if entry is None or not entry[0].done():
+            return
+        task, _ = self._bureau_prefetches.pop(pan)
+        if task.cancelled() or task.exception() is not None:
+            return
+        report, fetched_at = task.result()
+        self._store_bureau_report(state, pan, report, fetched_at)
+
+    def _fresh_bureau_report(self, state: OrchestratorState) -> Optional[BureauReport]:
+        """Bureau report already in state for the current PAN, if younger than the max age."""
+        underwriting = state.underwriting or {}
+        if not underwriting.get("bureau_report") or underwriting.get("bureau_pan") != (state.customer_profile or {}).get("pan"):
+            return None
+        try:
+            fetched_at = datetime.fromisoformat(underwriting.get("bureau_fetched_at") or "")
+        except ValueError:
+            return None
+        if (datetime.now(timezone.utc) - fetched_at).total_seconds() > self._bureau_max_age:
+            return None
+        return BureauReport(**underwriting["bureau_report"])
+
+    async def _bureau_report(self, state: OrchestratorState) -> BureauReport:
+        """Fresh report from state, else the in-flight prefetch, else a direct pull."""
+        report = self._fresh_bureau_report(state)
+        if report is not None:
+            return report
+        pan = (state.customer_profile or {}).get("pan")
+        entry = self._bureau_prefetches.pop(pan, None) if pan else None
+        report = None
+        if entry is not None:
+            try:
+                report, fetched_at = await entry[0]
+            except Exception:
+                # Failed prefetch: pull again below
+                report = None
+        if report is None:
+            report, fetched_at = await self._fetch_bureau(pan)
+        self._store_bureau_report(state, pan, report, fetched_at)
+        return report
+
+    @staticmethod
+    def _store_bureau_report(state: OrchestratorState, pan: Optional[str], report: BureauReport, fetched_at: str) -> None:
+        # Persist bureau snapshot for explainability, with its freshness timestamp
+        state.underwriting["bureau_report"] = report.dict()
+        state.underwriting["bureau_pan"] = pan
+        state.underwriting["bureau_fetched_at"] = fetched_at
+
+    @staticmethod
+    def _state_snapshot(state: OrchestratorState) -> Dict[str, Any]:
+        """Client-facing state (JSON-compatible, without the Ollama KV context)."""
+        return state.model_dump(mode="json", exclude={"llm_context"})
+
+    @staticmethod
+    def _sales_context(state: OrchestratorState) -> Dict[str, Any]:
+        """State fields the sales agent may use; it projects them further per mode."""
+        return state.model_dump(include={"language", "stage", "emotion", "loan_request", "offer", "customer_profile"})
+
     def _hydrate_crm_snapshot(self, state: OrchestratorState) -> None:
         """Populate basic customer profile for demo flows."""
         if not state.customer_profile:
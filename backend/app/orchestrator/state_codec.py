@@ -0,0 +1,189 @@
+"""Versioned binary encoding of ``OrchestratorState`` for the Redis store.
+
+Layout of an encoded value::
+
+    b"OS" | schema version (1 byte) | compression (1 byte) | body
+
+The body is the state as compact JSON. When ``zstandard`` is installed,
+bodies larger than ``state_compress_threshold_bytes`` are zstd-compressed;
+the compression byte records it, so a worker without zstd fails to read
+such a value instead of misparsing it. zlib is not used: on these states
+it costs more CPU than the JSON encoding itself. The hash fields Redis
+actually stores are small (the audit ring, the largest, is about 2 KB;
+``llm_context`` is never persisted), so compression only matters for
+unusually large sections such as a long bureau report.
+
+Encoding goes through pydantic-core's JSON serializer, which writes bytes
+directly. Decoding parses with orjson when it is installed and validates
+the resulting dict; otherwise it uses ``model_validate_json``. Values
+written before this codec existed (plain ``model_dump_json`` text) are
+still accepted.
+
+``encode_state_fields`` / ``decode_state_fields`` use the same encoding per
+Redis hash field, so ``StateManager`` can read and write sections of a
+state independently.
+
+Bump ``STATE_SCHEMA_VERSION`` when a change to ``OrchestratorState`` needs
+stored values rewritten, and register the rewrite in ``_UPGRADES``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.config.settings import get_settings
+from app.schemas.conversation_state import OrchestratorState
+
+try:  # Optional: faster JSON parsing
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # Optional: compression of large states
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+MAGIC = b"OS"
+STATE_SCHEMA_VERSION = 1
+HEADER_SIZE = 4
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+
+# Rewrites a decoded body from schema version N to N + 1. Bodies of hash
+# fields only hold that field's keys, so upgrades must skip absent keys.
+_UPGRADES: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+_settings = get_settings()
+_compress_threshold = _settings.state_compress_threshold_bytes
+
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=1)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _compress(body: bytes) -> tuple[int, bytes]:
+    if zstandard is None or not _compress_threshold or len(body) <= _compress_threshold:
+        return COMPRESSION_NONE, body
+    return COMPRESSION_ZSTD, _zstd_compressor.compress(body)
+
+
+def _decompress(compression: int, body: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("state is zstd-compressed but zstandard is not installed")
+        return _zstd_decompressor.decompress(body)
+    raise ValueError(f"unknown state compression {compression}")
+
+
+def _pack(body: bytes) -> bytes:
+    compression, body = _compress(body)
+    return MAGIC + bytes((STATE_SCHEMA_VERSION, compression)) + body
+
+
+def _unpack(raw: bytes) -> tuple[int, bytes]:
+    """Schema version and decompressed body of an encoded value."""
+    if len(raw) < HEADER_SIZE or not raw.startswith(MAGIC):
+        raise ValueError("missing state header")
+    version, compression = raw[2], raw[3]
+    if version > STATE_SCHEMA_VERSION:
+        raise ValueError(f"state schema version {version} is newer than {STATE_SCHEMA_VERSION}")
+    return version, _decompress(compression, raw[HEADER_SIZE:])
+
+
+def _loads(body: bytes) -> Dict[str, Any]:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _upgrade(data: Dict[str, Any], version: int) -> Dict[str, Any]:
+    while version < STATE_SCHEMA_VERSION:
+        upgrade = _UPGRADES.get(version)
+        if upgrade is None:
+            raise ValueError(f"no upgrade registered for state schema version {version}")
+        data = upgrade(data)
+        version += 1
+    return data
+
+
+def encode_state(state: OrchestratorState) -> bytes:
+    """Serialize ``state`` into the versioned binary format."""
+    return _pack(OrchestratorState.__pydantic_serializer__.to_json(state))
+
+
+def decode_state(raw: bytes | str) -> OrchestratorState:
+    """Load a state written by ``encode_state`` (or the legacy JSON text).
+
+    Raises ``ValueError`` for values that cannot be read, including ones
+    written by a newer schema version.
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if not raw.startswith(MAGIC):
+        return OrchestratorState.model_validate_json(raw)
+
+    version, body = _unpack(raw)
+    if version == STATE_SCHEMA_VERSION:
+        if orjson is not None:
+            return OrchestratorState.model_validate(orjson.loads(body))
+        return OrchestratorState.model_validate_json(body)
+    return OrchestratorState.model_validate(_upgrade(_loads(body), version))
+
+
+# ---------------------------------------------------------------------------
+# Field-level layout: one Redis hash field per section plus CORE_FIELD for
+# the remaining top-level fields. Each hash field is encoded like a whole
+# state (header + JSON object with just that field's keys), so fields are
+# versioned individually and upgrades only ever see the keys of one field.
+# ---------------------------------------------------------------------------
+CORE_FIELD = "core"
+STATE_SECTIONS: Tuple[str, ...] = (
+    "customer_profile",
+    "emotion",
+    "loan_request",
+    "offer",
+    "kyc",
+    "underwriting",
+    "salary_slip",
+    "sanction",
+    "flags",
+    "audit_log",
+    "llm_context",
+)
+_SECTION_SET = frozenset(STATE_SECTIONS)
+
+
+def encode_state_fields(state: OrchestratorState, sections: Optional[Iterable[str]] = None) -> Dict[str, bytes]:
+    """Hash field values for ``state``: ``CORE_FIELD`` plus ``sections`` (default: all)."""
+    serializer = OrchestratorState.__pydantic_serializer__
+    names = STATE_SECTIONS if sections is None else [name for name in STATE_SECTIONS if name in sections]
+    encoded = {CORE_FIELD: _pack(serializer.to_json(state, exclude=_SECTION_SET))}
+    for name in names:
+        encoded[name] = _pack(serializer.to_json(state, include={name}))
+    return encoded
+
+
+def decode_state_fields(values: Dict[str, Optional[bytes]]) -> OrchestratorState:
+    """Build a state from hash field values; absent sections keep their defaults."""
+    if values.get(CORE_FIELD) is None:
+        raise ValueError("state has no core field")
+    data: Dict[str, Any] = {}
+    for raw in values.values():
+        if raw is None:
+            continue
+        version, body = _unpack(raw)
+        data.update(_upgrade(_loads(body), version))
+    return OrchestratorState.model_validate(data)
+
+
+__all__ = [
+    "CORE_FIELD",
+    "STATE_SCHEMA_VERSION",
+    "STATE_SECTIONS",
+    "decode_state",
+    "decode_state_fields",
+    "encode_state",
+    "encode_state_fields",
+]
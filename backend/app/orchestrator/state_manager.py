@@ -2,73 +2,328 @@
 
 This implementation uses Redis as the backing store so the full loan
 and sanction pipeline state survives process restarts instead of being
-kept only in memory.
+kept only in memory. All Redis round trips go through the pooled
+``redis.asyncio`` client so they never block the event loop.
+
+Each conversation is a Redis hash with one field per state section
+(``kyc``, ``offer``, ``sanction``, ...) plus a ``core`` field for the
+top-level scalars (see ``app.orchestrator.state_codec``). ``get_state`` can
+load just the sections a route needs, and ``upsert_state`` only writes the
+fields whose encoding changed since they were read.
+
+The per-agent Ollama KV context (``llm_context``, a few thousand token ids
+rewritten every sales turn) is not persisted to Redis. It lives only in this
+worker's fallback copy and is reattached on read when that copy is at the
+stored revision; otherwise the next turn starts a fresh prefill.
+
+Keys expire after ``state_ttl_seconds`` without a write (every upsert
+refreshes the TTL); COMPLETED/REJECTED conversations get
+``state_terminal_ttl_seconds`` instead. The in-process fallback copy is an
+LRU bounded by entry count and encoded size, with the same TTLs.
+
+Writes are compare-and-set on ``OrchestratorState.revision``: the hash keeps
+the revision in a plain ``rev`` field and a Lua script applies a write only
+if it still matches the revision the state was read at, bumping it by one.
+A lost race raises ``StateConflictError`` (HTTP 409) instead of silently
+overwriting another worker's turn. Within one worker, callers serialize
+read-modify-write cycles on a conversation with ``StateManager.lock``.
 """
 
-from typing import Optional
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
 
-from app.cache.redis_client import redis_client
+from app.cache.redis_client import async_redis_client
+from app.config.settings import get_settings
+from app.orchestrator.state_codec import (
+    CORE_FIELD,
+    STATE_SECTIONS,
+    decode_state,
+    decode_state_fields,
+    encode_state_fields,
+)
 from app.schemas.conversation_state import OrchestratorState
 
+TERMINAL_STAGES = frozenset({"COMPLETED", "REJECTED"})
+
+# Sections kept only in the worker-local fallback copy
+LOCAL_SECTIONS = frozenset({"llm_context"})
+PERSISTED_SECTIONS = tuple(name for name in STATE_SECTIONS if name not in LOCAL_SECTIONS)
+
+# KEYS[1] state hash, KEYS[2] legacy blob key
+# ARGV[1] expected revision, ARGV[2] new revision, ARGV[3] TTL, ARGV[4..] field/value pairs
+# Returns -1 when written, otherwise the revision currently stored.
+# A missing hash is an insert at any revision: a new conversation, a legacy
+# blob, or one that only reached a worker's fallback copy while Redis was down.
+_CAS_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'rev')
+if not current then
+    current = ARGV[1]
+end
+if tonumber(current) ~= tonumber(ARGV[1]) then
+    return current
+end
+redis.call('HSET', KEYS[1], 'rev', ARGV[2], unpack(ARGV, 4))
+redis.call('DEL', KEYS[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return -1
+"""
+
+
+class StateConflictError(RuntimeError):
+    """Raised when another writer updated the conversation since it was read."""
+
+    def __init__(self, conversation_id: str, expected: int, current: int) -> None:
+        super().__init__(
+            f"Conversation {conversation_id} is at revision {current}, not {expected}; reload and retry"
+        )
+        self.conversation_id = conversation_id
+        self.expected = expected
+        self.current = current
+
+
+class StateFallbackStore:
+    """In-process LRU of conversation states with per-entry TTL.
+
+    Bounded by ``max_entries`` and by ``max_bytes`` of encoded state, so a
+    long-running worker keeps only its most recently used conversations.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        # conversation_id -> (expires_at monotonic, encoded size, state)
+        self._entries: "OrderedDict[str, Tuple[float, int, OrchestratorState]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def get(self, conversation_id: str) -> Optional[OrchestratorState]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        if entry[0] < time.monotonic():
+            self.pop(conversation_id)
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(conversation_id)
+        self._stats["hits"] += 1
+        return entry[2]
+
+    def put(self, conversation_id: str, state: OrchestratorState, ttl: int, size: Optional[int] = None) -> None:
+        """Store ``state``; ``size`` None keeps the size recorded for this id."""
+        previous = self._entries.pop(conversation_id, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        if size is None:
+            size = previous[1] if previous is not None else 0
+        self._entries[conversation_id] = (time.monotonic() + ttl, size, state)
+        self._bytes += size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats["evicted"] += 1
+
+    def pop(self, conversation_id: str) -> Optional[OrchestratorState]:
+        entry = self._entries.pop(conversation_id, None)
+        if entry is None:
+            return None
+        self._bytes -= entry[1]
+        return entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self._bytes
+        stats["max_entries"] = self.max_entries
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+_settings = get_settings()
+
 
 class StateManager:
     """State store for conversation pipelines (Redis with in-memory fallback).
 
     If Redis is unavailable (for example in local dev on Windows without a
-    Redis server), we fall back to an in-process dict so the chatbot still
+    Redis server), we fall back to an in-process LRU so the chatbot still
     maintains conversation stage and context instead of restarting from the
     greeting on every message.
     """
 
+    # Whole-state blobs written before the hash layout; read once, then replaced
     _KEY_PREFIX = "conv_state:"
-    _fallback_store: dict[str, OrchestratorState] = {}
+    _FIELDS_KEY_PREFIX = "conv_fields:"
+    _ttl = _settings.state_ttl_seconds
+    _terminal_ttl = _settings.state_terminal_ttl_seconds
+    _fallback_store = StateFallbackStore(
+        max_entries=_settings.state_fallback_max_entries,
+        max_bytes=_settings.state_fallback_max_bytes,
+    )
+    _cas = async_redis_client.register_script(_CAS_SCRIPT)
+    # conversation_id -> (lock, number of holders and waiters)
+    _locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
 
     @classmethod
     def _key(cls, conversation_id: str) -> str:
         return f"{cls._KEY_PREFIX}{conversation_id}"
 
     @classmethod
-    def get_state(cls, conversation_id: str) -> Optional[OrchestratorState]:
-        """Fetch conversation state from Redis or fallback store."""
+    def _fields_key(cls, conversation_id: str) -> str:
+        return f"{cls._FIELDS_KEY_PREFIX}{conversation_id}"
+
+    @classmethod
+    def _ttl_for(cls, state: OrchestratorState) -> int:
+        return cls._terminal_ttl if state.stage in TERMINAL_STAGES else cls._ttl
+
+    @classmethod
+    @asynccontextmanager
+    async def lock(cls, conversation_id: Optional[str]) -> AsyncIterator[None]:
+        """Serialize read-modify-write cycles on one conversation in this worker."""
+        if not conversation_id:
+            yield
+            return
+        lock, users = cls._locks.get(conversation_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        cls._locks[conversation_id] = (lock, users + 1)
         try:
-            raw = redis_client.get(cls._key(conversation_id))
+            async with lock:
+                yield
+        finally:
+            lock, users = cls._locks[conversation_id]
+            if users <= 1:
+                del cls._locks[conversation_id]
+            else:
+                cls._locks[conversation_id] = (lock, users - 1)
+
+    @classmethod
+    async def get_state(
+        cls,
+        conversation_id: str,
+        sections: Optional[Iterable[str]] = None,
+    ) -> Optional[OrchestratorState]:
+        """Fetch conversation state from Redis or fallback store.
+
+        ``sections`` limits which state sections are read from Redis; the
+        others keep their defaults and are never written back by
+        ``upsert_state``, so a partial state must only be changed within the
+        sections it loaded.
+        """
+        loaded = None if sections is None else frozenset(sections) & frozenset(STATE_SECTIONS)
+        names = [CORE_FIELD] + [name for name in PERSISTED_SECTIONS if loaded is None or name in loaded]
+        try:
+            values = await async_redis_client.hmget(cls._fields_key(conversation_id), names)
+            legacy = None
+            if values[0] is None:
+                legacy = await async_redis_client.get(cls._key(conversation_id))
         except Exception:
             # Redis not available – use in-memory fallback.
-            return cls._fallback_store.get(conversation_id)
-
-        if not raw:
-            return cls._fallback_store.get(conversation_id)
+            return cls._fallback_copy(conversation_id)
 
         try:
-            # Pydantic v2 helper to load from JSON string.
-            return OrchestratorState.model_validate_json(raw)
+            if values[0] is not None:
+                stored = {name: value for name, value in zip(names, values) if value is not None}
+                state = decode_state_fields(stored)
+                state._stored_fields = stored
+                state._loaded_sections = loaded
+                if loaded is None or not loaded.isdisjoint(LOCAL_SECTIONS):
+                    cls._attach_local_sections(conversation_id, state)
+                return state
+            if legacy:
+                # Loaded in full and written back as hash fields on the next upsert
+                return decode_state(legacy)
         except Exception:
             # Corrupt data – treat as no state in Redis, but we might still
             # have a usable copy in the fallback store.
-            return cls._fallback_store.get(conversation_id)
+            pass
+        return cls._fallback_copy(conversation_id)
+
+    @classmethod
+    def _fallback_copy(cls, conversation_id: str) -> Optional[OrchestratorState]:
+        """This worker's copy of the state, detached so callers can't edit the store."""
+        state = cls._fallback_store.get(conversation_id)
+        return None if state is None else state.model_copy(deep=True)
+
+    @classmethod
+    def _attach_local_sections(cls, conversation_id: str, state: OrchestratorState) -> None:
+        """Copy local-only sections from this worker's copy if it is not stale."""
+        local = cls._fallback_store.get(conversation_id)
+        if local is None or local.revision != state.revision:
+            return
+        for name in LOCAL_SECTIONS:
+            setattr(state, name, copy.deepcopy(getattr(local, name)))
 
     @classmethod
-    def upsert_state(cls, state: OrchestratorState) -> None:
-        """Update or insert conversation state into Redis and fallback."""
+    async def upsert_state(cls, state: OrchestratorState) -> None:
+        """Write the state's changed hash fields to Redis and update the fallback.
+
+        ``state.revision`` must be the revision the state was read at; the
+        write bumps it by one and fails with ``StateConflictError`` (leaving
+        the revision unchanged) if another writer got there first. Also
+        refreshes the key's TTL, so conversations expire only once idle.
+        """
         if not state.conversation_id:
             return
 
+        expected = state.revision
+        state.revision = expected + 1
+        ttl = cls._ttl_for(state)
+        size = None
+        current = -1
         try:
-            payload = state.model_dump_json()
-            redis_client.set(cls._key(state.conversation_id), payload)
+            loaded = state._loaded_sections
+            encoded = encode_state_fields(state, PERSISTED_SECTIONS if loaded is None else loaded - LOCAL_SECTIONS)
+            size = sum(len(value) for value in encoded.values())
+            stored = state._stored_fields
+            dirty = {name: value for name, value in encoded.items() if stored.get(name) != value}
+            args: list = [expected, state.revision, ttl]
+            for name, value in dirty.items():
+                args += [name, value]
+            current = await cls._cas(
+                keys=[cls._fields_key(state.conversation_id), cls._key(state.conversation_id)],
+                args=args,
+            )
+            if current == -1:
+                stored.update(dirty)
         except Exception:
             # Redis failed – rely on in-memory fallback only.
             pass
+        if current != -1:
+            state.revision = expected
+            raise StateConflictError(state.conversation_id, expected, current)
 
         # Always keep an in-memory copy for the current process.
-        cls._fallback_store[state.conversation_id] = state
+        if state._loaded_sections is None:
+            cls._fallback_store.put(state.conversation_id, state.model_copy(deep=True), ttl, size)
+            return
+        existing = cls._fallback_store.get(state.conversation_id)
+        if existing is not None:
+            for name in set(OrchestratorState.model_fields) - set(STATE_SECTIONS) | state._loaded_sections:
+                setattr(existing, name, copy.deepcopy(getattr(state, name)))
+            cls._fallback_store.put(state.conversation_id, existing, ttl)
+
+    @classmethod
+    def fallback_stats(cls) -> Dict[str, Any]:
+        return cls._fallback_store.stats()
 
     @classmethod
-    def delete_state(cls, conversation_id: str) -> None:
+    async def delete_state(cls, conversation_id: str) -> None:
         """Delete conversation state from Redis and fallback."""
         try:
-            redis_client.delete(cls._key(conversation_id))
+            await async_redis_client.delete(cls._fields_key(conversation_id), cls._key(conversation_id))
         except Exception:
             pass
 
-        cls._fallback_store.pop(conversation_id, None)
+        cls._fallback_store.pop(conversation_id)
@@ -1,6 +1,6 @@
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 StageType = Literal[
     "NEW",
@@ -64,6 +64,7 @@ class SanctionState(BaseModel):
     sanction_number: Optional[str] = None
     pdf_url: Optional[str] = None
     valid_until: Optional[str] = None
+    # PDF readiness is not stored here: GET /sanction/status/{conversation_id}
     accepted: bool = False
     disbursed: bool = False
     disbursement_amount: Optional[float] = None
@@ -79,6 +80,8 @@ class FlagState(BaseModel):
 
 class OrchestratorState(BaseModel):
     conversation_id: Optional[str] = None
+    # Incremented on every persisted orchestrator turn; clients echo it back as base_revision
+    revision: int = 0
     customer_id: Optional[str] = None
     customer_profile: Dict[str, Any] = Field(default_factory=dict)
     language: Literal["en", "hi", "ta", "te", "bn", "mr"] = "en"
@@ -92,7 +95,16 @@ class OrchestratorState(BaseModel):
     salary_slip: SalarySlipState = Field(default_factory=SalarySlipState)
     sanction: SanctionState = Field(default_factory=SanctionState)
     flags: FlagState = Field(default_factory=FlagState)
+    # Most recent audit entries only; the full trail lives in the audit stream
     audit_log: list = Field(default_factory=list)
+    # Per-agent Ollama KV context carried between turns: {agent: {system_hash, tokens}}.
+    # Kept in the worker-local state copy only, never written to Redis.
+    llm_context: Dict[str, Any] = Field(default_factory=dict)
+
+    # StateManager bookkeeping (never serialized): encoded hash fields as last
+    # read/written, and the sections loaded by get_state (None = all of them)
+    _stored_fields: Dict[str, bytes] = PrivateAttr(default_factory=dict)
+    _loaded_sections: Optional[frozenset] = PrivateAttr(default=None)
 
 
 class OrchestratorRequest(BaseModel):
@@ -102,6 +114,9 @@ class OrchestratorRequest(BaseModel):
     loan_request: Dict[str, Any] = Field(default_factory=dict)
     event: Optional[str] = None
     uploaded_document_type: Optional[str] = None
+    # Last state revision the client has applied; when it matches the server's,
+    # the response carries ``state_patch`` instead of a full ``state_updates``
+    base_revision: Optional[int] = None
 
 
 class OrchestratorResponse(BaseModel):
@@ -109,9 +124,14 @@ class OrchestratorResponse(BaseModel):
     stage: StageType
     message_to_user: str
     invoke_worker: Dict[str, Any]
+    # Full state snapshot; empty when ``state_patch`` is sent instead
     state_updates: Dict[str, Any]
     next_action: ActionType
     explainability: Optional[Dict[str, Any]] = None
     audit_entry: Optional[Dict[str, Any]] = None
     fallback_needed: bool = False
     model_version: Optional[str] = None
+    revision: Optional[int] = None
+    base_revision: Optional[int] = None
+    # JSON Patch (RFC 6902) ops turning the base_revision state into this revision
+    state_patch: Optional[List[Dict[str, Any]]] = None
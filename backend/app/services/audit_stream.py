@@ -0,0 +1,185 @@
+"""Append-only audit trail for orchestrator turns.
+
+Audit entries used to live only in ``OrchestratorState.audit_log``, so every
+turn re-serialised the full conversation history into Redis and into the
+response. Entries are now queued here and flushed in batches to one Redis
+stream per conversation (``audit:<conversation_id>``, via ``XADD``);
+the state keeps only the last few entries (``audit_ring_size``).
+
+A background task started with the app flushes every
+``audit_flush_interval_ms`` or as soon as ``audit_batch_size`` entries are
+queued. If Redis is unreachable, entries stay queued (bounded by
+``audit_pending_max``, oldest dropped first) and are retried on the next flush.
+Flushes are serialized, so one conversation's entries reach its stream in
+order even when ``read`` flushes from a request thread. Each stream's TTL
+(``audit_stream_ttl_seconds``) is refreshed whenever it is written.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.cache.redis_client import redis_client
+from app.config.settings import get_settings
+
+PREFIX = "audit:"
+
+
+class AuditStream:
+    def __init__(
+        self,
+        *,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        pending_max: int = 10000,
+        stream_maxlen: int = 0,
+        stream_ttl: int = 0,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stream_maxlen = stream_maxlen
+        self.stream_ttl = stream_ttl
+        self._pending: Deque[Tuple[str, str]] = deque(maxlen=max(1, pending_max))
+        self._lock = threading.Lock()
+        # Held for a whole flush so two batches never interleave their XADDs
+        self._flush_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        return f"{PREFIX}{conversation_id}"
+
+    def append(self, conversation_id: str, entry: Dict[str, Any]) -> None:
+        """Queue one entry; never blocks on Redis while the flusher is running."""
+        if not conversation_id:
+            return
+        record = json.dumps(entry, default=str)
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((conversation_id, record))
+            full = len(self._pending) >= self.batch_size
+        if not full:
+            return
+        if self._wakeup is not None:
+            self._wakeup.set()
+        elif self._task is None:
+            # No background flusher (scripts, workers): flush inline
+            self.flush()
+
+    def flush(self) -> int:
+        """Write queued entries to Redis in one pipeline; returns the number written."""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return 0
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for conversation_id, record in batch:
+                if self.stream_maxlen:
+                    pipe.xadd(self._key(conversation_id), {"entry": record}, maxlen=self.stream_maxlen, approximate=True)
+                else:
+                    pipe.xadd(self._key(conversation_id), {"entry": record})
+            if self.stream_ttl:
+                for conversation_id in {conversation_id for conversation_id, _ in batch}:
+                    pipe.expire(self._key(conversation_id), self.stream_ttl)
+            pipe.execute()
+        except Exception as e:
+            self.failed_flushes += 1
+            print(f"AuditStream flush error: {e}")
+            with self._lock:
+                # Put the batch back in front of anything queued meanwhile;
+                # if that overflows the queue, its oldest entries go first
+                overflow = len(batch) - (self._pending.maxlen - len(self._pending))
+                if overflow > 0:
+                    self.dropped += overflow
+                    batch = batch[overflow:]
+                self._pending.extendleft(reversed(batch))
+            return 0
+        self.written += len(batch)
+        return len(batch)
+
+    def read(self, conversation_id: str, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Full (or most recent ``count``) audit history of a conversation, oldest first."""
+        self.flush()
+        try:
+            if count is None:
+                rows = redis_client.xrange(self._key(conversation_id))
+            else:
+                rows = redis_client.xrevrange(self._key(conversation_id), count=count)[::-1]
+        except Exception as e:
+            print(f"AuditStream read error: {e}")
+            return []
+        entries: List[Dict[str, Any]] = []
+        for _, fields in rows:
+            raw = fields.get(b"entry") or fields.get("entry")
+            if raw is None:
+                continue
+            try:
+                entries.append(json.loads(raw))
+            except ValueError:
+                continue
+        return entries
+
+    async def _run(self) -> None:
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await asyncio.to_thread(self.flush)
+        finally:
+            self._wakeup = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background flusher and write whatever is still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "flusher_running": self._task is not None and not self._task.done(),
+        }
+
+
+_settings = get_settings()
+audit_stream = AuditStream(
+    batch_size=_settings.audit_batch_size,
+    flush_interval=_settings.audit_flush_interval_ms / 1000.0,
+    pending_max=_settings.audit_pending_max,
+    stream_maxlen=_settings.audit_stream_maxlen,
+    stream_ttl=_settings.audit_stream_ttl_seconds,
+)
+
+__all__ = ["AuditStream", "audit_stream"]
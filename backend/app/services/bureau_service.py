@@ -1,45 +1,99 @@
 """Bureau integration backed by the local Credit Bureau mock server."""
 from __future__ import annotations
 
-from typing import Optional
-
-import httpx
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
+from app.config.http_clients import service_request
 from app.config.settings import get_settings
 from app.schemas.bureau import BureauReport
 
+# PAN -> (expires_at monotonic, report); shared by every BureauService instance
+_report_cache: "OrderedDict[str, Tuple[float, BureauReport]]" = OrderedDict()
+
+
+def _default_report() -> BureauReport:
+    return BureauReport(score=750, utilization=0.35, accounts=3)
+
 
 class BureauService:
     """Fetch a bureau snapshot from the credit_bureau_server mock.
 
     The mock server is exposed by backend/mock_servers/credit_bureau_server.py
     and started on http://localhost:8002 by scripts.run_mock_servers.
+
+    Reports are cached per PAN for ``bureau_cache_ttl_seconds`` so
+    re-evaluation (e.g. after a salary slip upload) does not hit the bureau
+    again; PANs the bureau does not know are remembered for the shorter
+    ``bureau_negative_cache_ttl_seconds``. Transient failures are not cached.
     """
 
     def __init__(self) -> None:
         settings = get_settings()
         self.base_url = settings.bureau_api_base.rstrip("/")
-        self._timeout = settings.request_timeout_seconds
+        self._cache_ttl = settings.bureau_cache_ttl_seconds
+        self._negative_ttl = settings.bureau_negative_cache_ttl_seconds
+        self._cache_max_entries = settings.bureau_cache_max_entries
 
-    def _safe_get(self, path: str) -> Optional[dict]:
+    async def _safe_get(self, path: str) -> Tuple[Optional[int], Optional[dict]]:
+        """``(status_code, body)``; status is None when the bureau was unreachable."""
         url = f"{self.base_url}{path}"
         try:
-            resp = httpx.get(url, timeout=self._timeout)
+            resp = await service_request("bureau", "GET", url)
+        except Exception:
+            return None, None
+        try:
             resp.raise_for_status()
-            return resp.json()
+            return resp.status_code, resp.json()
         except Exception:
+            return resp.status_code, None
+
+    def _cached(self, pan: str) -> Optional[BureauReport]:
+        entry = _report_cache.get(pan)
+        if entry is None:
+            return None
+        expires_at, report = entry
+        if expires_at < time.monotonic():
+            _report_cache.pop(pan, None)
             return None
+        _report_cache.move_to_end(pan)
+        return report.model_copy()
+
+    def _remember(self, pan: str, report: BureauReport, ttl: int) -> None:
+        if ttl <= 0:
+            return
+        _report_cache[pan] = (time.monotonic() + ttl, report)
+        _report_cache.move_to_end(pan)
+        while len(_report_cache) > self._cache_max_entries:
+            _report_cache.popitem(last=False)
 
-    def fetch_report(self, pan: str | None) -> BureauReport:
+    async def fetch_report(self, pan: str | None) -> BureauReport:
         """Return a BureauReport using real mock bureau data when available."""
 
         if not pan:
             # Fallback demo behaviour when PAN is missing
-            return BureauReport(score=750, utilization=0.35, accounts=3)
+            return _default_report()
+
+        cached = self._cached(pan)
+        if cached is not None:
+            return cached
+
+        # Credit score and debt obligations are independent: fetch both at once
+        (score_status, body), (debt_status, debt_body) = await asyncio.gather(
+            self._safe_get(f"/credit-score/{pan}"),
+            self._safe_get(f"/debt-obligations/{pan}"),
+        )
+
+        if score_status == 404:
+            # Unknown PAN: serve the demo defaults and don't ask again for a while
+            report = _default_report()
+            self._remember(pan, report, self._negative_ttl)
+            return report
 
-        # 1) Get core credit score
+        # 1) Core credit score
         score = 750
-        body = self._safe_get(f"/credit-score/{pan}")
         if body and body.get("status") == "success" and body.get("data"):
             data = body["data"]
             score = int(data.get("credit_score", score))
@@ -47,10 +101,12 @@ class BureauService:
         # 2) Optionally enrich with account count from debt obligations
         utilization = 0.35
         accounts = 3
-        debt_body = self._safe_get(f"/debt-obligations/{pan}")
         if debt_body and debt_body.get("status") == "success" and debt_body.get("data"):
             debt_data = debt_body["data"]
             debt_summary = debt_data.get("debt_summary") or {}
             accounts = int(debt_summary.get("existing_loans_count", accounts))
 
-        return BureauReport(score=score, utilization=utilization, accounts=accounts)
+        report = BureauReport(score=score, utilization=utilization, accounts=accounts)
+        if body is not None and (debt_body is not None or debt_status == 404):
+            self._remember(pan, report, self._cache_ttl)
+        return report
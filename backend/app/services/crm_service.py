@@ -1,42 +1,90 @@
 """CRM service that talks to the local CRM mock server."""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-
-import httpx
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
+from app.config.http_clients import service_request
 from app.config.settings import get_settings
 from app.utils.id_masker import mask_identifier
 
+# customer_id -> (expires_at monotonic, profile); shared by every CRMService instance
+_profile_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# customer_id -> in-flight lookup that concurrent callers join instead of calling the CRM again
+_inflight: Dict[str, "asyncio.Future[Tuple[Dict[str, Any], bool]]"] = {}
+
 
 class CRMService:
     """Fetch customer profile from the CRM mock service.
 
     The mock CRM is exposed by backend/mock_servers/crm_server.py and started
     on http://localhost:8001 by scripts.run_mock_servers.
+
+    Profiles are cached per customer id for ``crm_cache_ttl_seconds`` and
+    concurrent lookups for the same id share one CRM call. When the CRM is
+    unreachable or answers without a profile, the fallback profile is cached
+    only for ``crm_cache_failure_ttl_seconds``: long enough that retries
+    during an outage don't stampede it, short enough that a transient error
+    doesn't show a known customer as unknown for the full TTL.
     """
 
     def __init__(self) -> None:
         settings = get_settings()
         self.base_url = settings.crm_api_base.rstrip("/")
         self.api_key = settings.crm_api_key
-        self._timeout = settings.request_timeout_seconds
+        self._cache_ttl = settings.crm_cache_ttl_seconds
+        self._failure_ttl = settings.crm_cache_failure_ttl_seconds
+        self._cache_max_entries = settings.crm_cache_max_entries
 
-    def get_customer_profile(self, customer_id: Optional[str]) -> Dict[str, Any]:
+    async def get_customer_profile(self, customer_id: Optional[str]) -> Dict[str, Any]:
         """Hydrate a customer profile given an identifier (PAN/customer_id).
 
         For the mock server, we treat the incoming customer_id as PAN number
-        and call POST /api/crm/get-customer.
+        and call POST /api/crm/get-customer. Callers get their own copy, so
+        mutating the returned profile never touches the cache.
         """
 
         if not customer_id:
             return {}
 
+        key = str(customer_id)
+        entry = _profile_cache.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            _profile_cache.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+        future = _inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_profile(key))
+            _inflight[key] = future
+            future.add_done_callback(lambda done: self._finish_lookup(key, done))
+        # Shield so one cancelled caller doesn't cancel the lookup for the others
+        profile, _ = await asyncio.shield(future)
+        return copy.deepcopy(profile)
+
+    def _finish_lookup(self, key: str, future: "asyncio.Future[Tuple[Dict[str, Any], bool]]") -> None:
+        _inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        profile, found = future.result()
+        ttl = self._cache_ttl if found else self._failure_ttl
+        if ttl <= 0:
+            return
+        _profile_cache[key] = (time.monotonic() + ttl, profile)
+        _profile_cache.move_to_end(key)
+        while len(_profile_cache) > self._cache_max_entries:
+            _profile_cache.popitem(last=False)
+
+    async def _fetch_profile(self, customer_id: str) -> Tuple[Dict[str, Any], bool]:
+        """``(profile, found)``; the flag is False for the fallback profiles."""
         url = f"{self.base_url}/get-customer"
         payload = {"pan_number": str(customer_id)}
 
         try:
-            resp = httpx.post(url, json=payload, timeout=self._timeout)
+            resp = await service_request("crm", "POST", url, json=payload)
             resp.raise_for_status()
             body = resp.json()
         except Exception:
@@ -46,13 +94,13 @@ class CRMService:
                 "name": "Tata Capital Customer",
                 "masked_phone": mask_identifier("9876543210"),
                 "monthly_income": 80000,
-            }
+            }, False
 
         if body.get("status") != "success" or not body.get("data"):
             return {
                 "customer_id": customer_id,
                 "name": "Unknown Customer",
-            }
+            }, False
 
         data = body["data"]
 
@@ -80,4 +128,4 @@ class CRMService:
             income = data.get("monthly_income") or 80000
             profile["pre_approved_limit"] = int(income) * 4
 
-        return profile
+        return profile, True
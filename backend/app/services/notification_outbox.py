@@ -0,0 +1,263 @@
+"""Redis-backed outbox for customer notifications (email / SMS).
+
+``NotificationService`` enqueues notifications here instead of calling the
+notification server inline, so a sanction turn never waits on delivery. A
+background worker started with the app drains the outbox in batches:
+
+- messages with an email go through ``/send-bulk``, one call per template;
+- SMS-only messages go through ``/send`` (the mock's bulk endpoint only
+  delivers email).
+
+Redis layout (at-least-once delivery):
+
+- ``notif:outbox``     list of pending records (LPUSH in, LMOVE out)
+- ``notif:processing`` records claimed by the worker and not yet settled;
+  moved back to the outbox on startup after a crash
+- ``notif:retry``      sorted set of failed records scored by next attempt time;
+  due records are moved back to the outbox by one Lua script
+- ``notif:dead``       records that failed ``notification_max_attempts`` times
+
+If Redis is unreachable, records are kept in process memory and delivered
+from there, so notifications are still attempted, just not durably.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.cache.redis_client import redis_client
+from app.config.settings import get_settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.notification_service import NotificationService
+
+OUTBOX_KEY = "notif:outbox"
+PROCESSING_KEY = "notif:processing"
+RETRY_KEY = "notif:retry"
+DEAD_KEY = "notif:dead"
+
+# (raw record as claimed, parsed record, claimed from Redis?)
+Claimed = Tuple[str, Dict[str, Any], bool]
+
+# Move due retries to the outbox atomically, so two workers polling at the
+# same time cannot both promote (and send) the same record.
+# KEYS[1] retry set, KEYS[2] outbox; ARGV[1] now, ARGV[2] max records
+_PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[1], raw)
+    redis.call('LPUSH', KEYS[2], raw)
+end
+return #due
+"""
+_promote_due = redis_client.register_script(_PROMOTE_SCRIPT)
+
+
+class NotificationOutbox:
+    def __init__(
+        self,
+        *,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        retry_backoff: float = 5.0,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self._memory: Deque[Dict[str, Any]] = deque()
+        self._memory_dead: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"enqueued": 0, "delivered": 0, "retried": 0, "dead_lettered": 0}
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def _push(self, record: Dict[str, Any]) -> None:
+        try:
+            redis_client.lpush(OUTBOX_KEY, json.dumps(record))
+        except Exception as e:
+            print(f"NotificationOutbox Redis error, keeping in memory: {e}")
+            self._memory.append(record)
+
+    async def enqueue(self, payload: Dict[str, Any]) -> str:
+        """Queue one ``/send``-style payload for delivery; returns its outbox id."""
+        record = {"id": uuid4().hex, "payload": payload, "attempts": 0, "enqueued_at": time.time()}
+        await asyncio.to_thread(self._push, record)
+        self._stats["enqueued"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return record["id"]
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def _recover(self) -> None:
+        """Return records a previous worker claimed but never settled."""
+        try:
+            while redis_client.lmove(PROCESSING_KEY, OUTBOX_KEY, "RIGHT", "RIGHT"):
+                pass
+        except Exception as e:
+            print(f"NotificationOutbox recover error: {e}")
+
+    def _claim_batch(self) -> List[Claimed]:
+        claimed: List[Claimed] = []
+        now = time.time()
+        try:
+            # Promote retries that are due, then claim from the outbox
+            _promote_due(keys=[RETRY_KEY, OUTBOX_KEY], args=[now, self.batch_size])
+            while len(claimed) < self.batch_size:
+                raw = redis_client.lmove(OUTBOX_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+                if raw is None:
+                    break
+                raw = raw.decode() if isinstance(raw, bytes) else raw
+                try:
+                    claimed.append((raw, json.loads(raw), True))
+                except ValueError:
+                    redis_client.lrem(PROCESSING_KEY, 1, raw)
+        except Exception as e:
+            print(f"NotificationOutbox claim error: {e}")
+
+        for _ in range(len(self._memory)):
+            if len(claimed) >= self.batch_size:
+                break
+            record = self._memory.popleft()
+            if record.get("next_attempt_at", 0) > now:
+                self._memory.append(record)
+                continue
+            claimed.append((json.dumps(record), record, False))
+        return claimed
+
+    def _settle(self, claimed: List[Claimed], delivered: set, errors: Dict[str, str]) -> None:
+        now = time.time()
+        for raw, record, from_redis in claimed:
+            if record["id"] in delivered:
+                self._stats["delivered"] += 1
+                outcome: Optional[Tuple[str, Any]] = None
+            else:
+                record["attempts"] = record.get("attempts", 0) + 1
+                record["last_error"] = errors.get(record["id"], "delivery failed")
+                if record["attempts"] >= self.max_attempts:
+                    self._stats["dead_lettered"] += 1
+                    outcome = (DEAD_KEY, record)
+                else:
+                    self._stats["retried"] += 1
+                    record["next_attempt_at"] = now + self.retry_backoff * (2 ** (record["attempts"] - 1))
+                    outcome = (RETRY_KEY, record)
+
+            if not from_redis:
+                if outcome is not None:
+                    (self._memory_dead if outcome[0] == DEAD_KEY else self._memory).append(outcome[1])
+                continue
+            try:
+                pipe = redis_client.pipeline()
+                pipe.lrem(PROCESSING_KEY, 1, raw)
+                if outcome is not None and outcome[0] == DEAD_KEY:
+                    pipe.lpush(DEAD_KEY, json.dumps(record))
+                elif outcome is not None:
+                    pipe.zadd(RETRY_KEY, {json.dumps(record): record["next_attempt_at"]})
+                pipe.execute()
+            except Exception as e:
+                # Left in notif:processing; recovered on the next start
+                print(f"NotificationOutbox settle error: {e}")
+
+    async def _deliver(self, service: "NotificationService", claimed: List[Claimed]) -> Tuple[set, Dict[str, str]]:
+        delivered: set = set()
+        errors: Dict[str, str] = {}
+        by_template: Dict[Any, List[Dict[str, Any]]] = {}
+        singles: List[Dict[str, Any]] = []
+        for _, record, _ in claimed:
+            if record["payload"].get("email"):
+                by_template.setdefault(record["payload"].get("template"), []).append(record)
+            else:
+                singles.append(record)
+
+        for template, records in by_template.items():
+            sent = await service.deliver_bulk(template, [r["payload"] for r in records])
+            if sent is None:
+                errors.update({r["id"]: "send-bulk failed" for r in records})
+                continue
+            for record in records:
+                if str(record["payload"].get("customer_id")) in sent:
+                    delivered.add(record["id"])
+                else:
+                    errors[record["id"]] = "rejected by send-bulk"
+
+        for record in singles:
+            if await service.deliver(record["payload"]):
+                delivered.add(record["id"])
+        return delivered, errors
+
+    async def drain_once(self, service: "NotificationService") -> int:
+        """Deliver one batch; returns how many records were attempted."""
+        claimed = await asyncio.to_thread(self._claim_batch)
+        if not claimed:
+            return 0
+        delivered, errors = await self._deliver(service, claimed)
+        await asyncio.to_thread(self._settle, claimed, delivered, errors)
+        return len(claimed)
+
+    async def _run(self, service: "NotificationService") -> None:
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._recover)
+        try:
+            while True:
+                try:
+                    # Keep draining while full batches come back
+                    while await self.drain_once(service) >= self.batch_size:
+                        pass
+                except Exception as e:
+                    print(f"NotificationOutbox worker error: {e}")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            self._wakeup = None
+
+    def start(self, service: "NotificationService") -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(service))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["memory_pending"] = len(self._memory)
+        stats["memory_dead"] = len(self._memory_dead)
+        try:
+            pipe = redis_client.pipeline()
+            pipe.llen(OUTBOX_KEY)
+            pipe.llen(PROCESSING_KEY)
+            pipe.zcard(RETRY_KEY)
+            pipe.llen(DEAD_KEY)
+            stats["pending"], stats["processing"], stats["retrying"], stats["dead"] = pipe.execute()
+        except Exception as e:
+            stats["redis_error"] = str(e)
+        stats["worker_running"] = self._task is not None and not self._task.done()
+        return stats
+
+
+_settings = get_settings()
+notification_outbox = NotificationOutbox(
+    batch_size=_settings.notification_outbox_batch_size,
+    poll_interval=_settings.notification_outbox_poll_interval_ms / 1000.0,
+    max_attempts=_settings.notification_max_attempts,
+    retry_backoff=_settings.notification_retry_backoff_seconds,
+)
+
+__all__ = ["NotificationOutbox", "notification_outbox"]
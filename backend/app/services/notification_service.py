@@ -2,36 +2,51 @@
 
 Uses backend/mock_servers/email_sms_server.py running on port 8004 to
 simulate email/SMS/WhatsApp notifications for sanction and disbursement.
+
+The ``send_*`` helpers only enqueue on the notification outbox; the outbox
+worker calls ``deliver`` / ``deliver_bulk`` in the background.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-
-import httpx
+from typing import Any, Dict, List, Optional, Set
 
+from app.config.http_clients import service_request
 from app.config.settings import get_settings
+from app.services.notification_outbox import notification_outbox
 
 
 class NotificationService:
     def __init__(self) -> None:
         settings = get_settings()
         self.base_url = settings.notification_api_base.rstrip("/")
-        self._timeout = settings.request_timeout_seconds
 
-    def _post(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         url = f"{self.base_url}{path}"
         try:
-            resp = httpx.post(url, json=payload, timeout=self._timeout)
+            resp = await service_request("notification", "POST", url, json=payload)
             resp.raise_for_status()
             return resp.json()
         except Exception:
             return None
 
-    def send_sanction_notification(self, *, email: Optional[str], phone: Optional[str], customer_name: str, amount: float, tenure_months: int, rate: float, sanction_number: str) -> None:
-        """Fire-and-forget sanction notification via multi-channel API.
+    async def deliver(self, payload: Dict[str, Any]) -> bool:
+        """Send one notification via POST /send; True when the server accepted it."""
+        body = await self._post("/send", payload)
+        return bool(body) and body.get("status") == "success"
+
+    async def deliver_bulk(self, template: Optional[str], payloads: List[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Send same-template email notifications via POST /send-bulk.
 
-        For the mock, we just call POST /send with a generic template.
+        Returns the ``customer_id`` values the server reports as sent, or None
+        when the bulk call itself failed.
         """
+        body = await self._post("/send-bulk", {"template": template, "notifications": payloads})
+        if not body or body.get("status") != "success":
+            return None
+        return {str(item.get("customer_id")) for item in body.get("notifications_sent") or [] if item.get("status") == "sent"}
+
+    async def send_sanction_notification(self, *, email: Optional[str], phone: Optional[str], customer_name: str, amount: float, tenure_months: int, rate: float, sanction_number: str) -> None:
+        """Queue a sanction notification on the outbox (delivered in the background)."""
 
         if not email and not phone:
             return
@@ -57,9 +72,9 @@ class NotificationService:
         if phone:
             payload["phone"] = phone
 
-        self._post("/send", payload)
+        await notification_outbox.enqueue(payload)
 
-    def send_disbursement_confirmation(self, *, email: Optional[str], phone: Optional[str], customer_name: str, net_amount: float, txn_id: str) -> None:
+    async def send_disbursement_confirmation(self, *, email: Optional[str], phone: Optional[str], customer_name: str, net_amount: float, txn_id: str) -> None:
         if not email and not phone:
             return
 
@@ -82,4 +97,4 @@ class NotificationService:
         if phone:
             payload["phone"] = phone
 
-        self._post("/send", payload)
+        await notification_outbox.enqueue(payload)
@@ -3,8 +3,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-import httpx
-
+from app.config.http_clients import service_request
 from app.config.settings import get_settings
 
 
@@ -14,28 +13,27 @@ class OffermartService:
     def __init__(self) -> None:
         settings = get_settings()
         self.base_url = settings.offermart_api_base.rstrip("/")
-        self._timeout = settings.request_timeout_seconds
 
-    def _post(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         url = f"{self.base_url}{path}"
         try:
-            resp = httpx.post(url, json=payload, timeout=self._timeout)
+            resp = await service_request("offermart", "POST", url, json=payload)
             resp.raise_for_status()
             return resp.json()
         except Exception:
             return None
 
-    def check_eligibility(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def check_eligibility(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Call the mock /check-eligibility endpoint and return its body."""
 
-        return self._post("/check-eligibility", payload)
+        return await self._post("/check-eligibility", payload)
 
-    def generate_offers(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def generate_offers(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Call the mock /generate-offers endpoint and return its body."""
 
-        return self._post("/generate-offers", payload)
+        return await self._post("/generate-offers", payload)
 
-    def get_best_offer(
+    async def get_best_offer(
         self,
         *,
         pan: str,
@@ -56,7 +54,7 @@ class OffermartService:
             "desired_tenure": desired_tenure,
         }
 
-        body = self._post("/get-best-offer", request)
+        body = await self._post("/get-best-offer", request)
         if not body or body.get("status") != "success":
             return None
 
@@ -0,0 +1,170 @@
+"""In-memory stand-ins for the Redis clients used by the state store and background services."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class FakeAsyncRedis:
+    """The parts of ``redis.asyncio.Redis`` StateManager uses."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, bytes] = {}
+        self.hashes: Dict[str, Dict[str, bytes]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.down = False
+
+    def _check(self) -> None:
+        if self.down:
+            raise ConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self._check()
+        return self.values.get(key)
+
+    async def hmget(self, key: str, names: Sequence[str]) -> List[Optional[bytes]]:
+        self._check()
+        fields = self.hashes.get(key, {})
+        return [fields.get(name) for name in names]
+
+    async def delete(self, *keys: str) -> int:
+        self._check()
+        return sum(self.values.pop(key, None) is not None or self.hashes.pop(key, None) is not None for key in keys)
+
+    async def compare_and_set(self, keys: Sequence[str], args: Sequence[Any]) -> int:
+        """Python port of ``state_manager._CAS_SCRIPT``."""
+        self._check()
+        fields_key, legacy_key = keys
+        expected, new, ttl = int(args[0]), args[1], int(args[2])
+        stored = self.hashes.get(fields_key, {})
+        current = int(stored["rev"]) if "rev" in stored else expected
+        if current != expected:
+            return current
+        pairs = list(args[3:])
+        stored = self.hashes.setdefault(fields_key, {})
+        stored["rev"] = str(new).encode()
+        stored.update(zip(pairs[::2], pairs[1::2]))
+        self.values.pop(legacy_key, None)
+        self.ttls[fields_key] = ttl
+        return -1
+
+
+class FakePipeline:
+    """Queues commands and runs them against the owning FakeRedis on execute()."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: List[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        command = getattr(self._redis, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        self._redis._check()
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedis:
+    """The parts of the blocking ``redis.Redis`` client the background services use."""
+
+    def __init__(self) -> None:
+        self.streams: Dict[str, List[Any]] = {}
+        # Lists are stored left to right; sorted sets as member -> score
+        self.lists: Dict[str, List[bytes]] = {}
+        self.zsets: Dict[str, Dict[bytes, float]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.down = False
+        self._next_id = 0
+
+    def _check(self) -> None:
+        if self.down:
+            raise ConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self._check()
+        self.ttls[key] = seconds
+        return True
+
+    def xadd(self, key: str, fields: Dict[str, Any], maxlen: Optional[int] = None, approximate: bool = True) -> bytes:
+        self._check()
+        self._next_id += 1
+        entry_id = f"{self._next_id}-0".encode()
+        stream = self.streams.setdefault(key, [])
+        stream.append((entry_id, {name.encode(): str(value).encode() for name, value in fields.items()}))
+        if maxlen:
+            del stream[:-maxlen]
+        return entry_id
+
+    def xrange(self, key: str, count: Optional[int] = None) -> List[Any]:
+        self._check()
+        return list(self.streams.get(key, []))[:count]
+
+    def xrevrange(self, key: str, count: Optional[int] = None) -> List[Any]:
+        self._check()
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    @staticmethod
+    def _bytes(value: Any) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def lpush(self, key: str, *values: Any) -> int:
+        self._check()
+        items = self.lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, self._bytes(value))
+        return len(items)
+
+    def lmove(self, source: str, destination: str, src: str = "LEFT", dest: str = "RIGHT") -> Optional[bytes]:
+        self._check()
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.pop(0 if src == "LEFT" else -1)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0 if dest == "LEFT" else len(target), value)
+        return value
+
+    def lrem(self, key: str, count: int, value: Any) -> int:
+        self._check()
+        items = self.lists.get(key, [])
+        value = self._bytes(value)
+        if value in items:
+            items.remove(value)
+            return 1
+        return 0
+
+    def llen(self, key: str) -> int:
+        self._check()
+        return len(self.lists.get(key, []))
+
+    def zadd(self, key: str, mapping: Dict[Any, float]) -> int:
+        self._check()
+        zset = self.zsets.setdefault(key, {})
+        added = sum(self._bytes(member) not in zset for member in mapping)
+        zset.update({self._bytes(member): score for member, score in mapping.items()})
+        return added
+
+    def zcard(self, key: str) -> int:
+        self._check()
+        return len(self.zsets.get(key, {}))
+
+    def promote_due(self, keys: Sequence[str], args: Sequence[Any]) -> int:
+        """Python port of ``notification_outbox._PROMOTE_SCRIPT``."""
+        self._check()
+        retry_key, outbox_key = keys
+        now, limit = float(args[0]), int(args[1])
+        zset = self.zsets.get(retry_key, {})
+        due = sorted((score, member) for member, score in zset.items() if score <= now)[:limit]
+        for _, member in due:
+            del zset[member]
+            self.lists.setdefault(outbox_key, []).insert(0, member)
+        return len(due)
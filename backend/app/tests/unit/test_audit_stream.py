@@ -0,0 +1,63 @@
+import pytest
+
+from app.services import audit_stream as audit_module
+from app.services.audit_stream import AuditStream
+from app.tests.mocks.fake_redis import FakePipeline, FakeRedis
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(audit_module, "redis_client", fake)
+    return fake
+
+
+def turns(stream: AuditStream, conversation_id: str, count: int, start: int = 0) -> None:
+    for turn in range(start, start + count):
+        stream.append(conversation_id, {"turn": turn})
+
+
+def test_full_batch_flushes_inline_without_a_flusher(redis):
+    stream = AuditStream(batch_size=3, stream_ttl=60)
+    turns(stream, "conv-a", 2)
+    assert "audit:conv-a" not in redis.streams
+    turns(stream, "conv-a", 1, start=2)
+    assert [entry["turn"] for entry in stream.read("conv-a")] == [0, 1, 2]
+    assert redis.ttls["audit:conv-a"] == 60
+    assert stream.stats()["written"] == 3
+
+
+def test_read_with_count_returns_most_recent_oldest_first(redis):
+    stream = AuditStream(batch_size=100)
+    turns(stream, "conv-a", 5)
+    assert [entry["turn"] for entry in stream.read("conv-a", count=2)] == [3, 4]
+
+
+def test_failed_flush_requeues_in_order(redis):
+    stream = AuditStream(batch_size=100)
+    turns(stream, "conv-a", 3)
+    redis.down = True
+    assert stream.flush() == 0
+    turns(stream, "conv-a", 1, start=3)
+    redis.down = False
+    assert stream.flush() == 4
+    assert [entry["turn"] for entry in stream.read("conv-a")] == [0, 1, 2, 3]
+    assert stream.stats()["failed_flushes"] == 1
+
+
+def test_requeue_overflow_drops_oldest_and_counts_them(redis, monkeypatch):
+    stream = AuditStream(batch_size=100, pending_max=4)
+    turns(stream, "conv-a", 4)
+
+    def execute_while_turns_arrive(pipe):
+        # Two more turns are queued while the failing flush is in flight
+        turns(stream, "conv-a", 2, start=4)
+        raise ConnectionError("down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FakePipeline, "execute", execute_while_turns_arrive)
+        assert stream.flush() == 0
+
+    assert stream.stats()["dropped"] == 2
+    assert stream.flush() == 4
+    assert [entry["turn"] for entry in stream.read("conv-a")] == [2, 3, 4, 5]
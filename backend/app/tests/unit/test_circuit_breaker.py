@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.config import ollama_client
+from app.config.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.config.ollama_client import OllamaClient
+
+
+def make_breaker(open_seconds: float = 30.0) -> CircuitBreaker:
+    return CircuitBreaker("test", window_size=4, min_calls=2, failure_rate=0.5, open_seconds=open_seconds)
+
+
+def test_opens_at_failure_rate_after_min_calls():
+    breaker = make_breaker()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["short_circuited"] == 1
+
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    breaker = make_breaker(open_seconds=0.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_calls"] == 1
+
+
+def test_failed_probe_reopens():
+    breaker = make_breaker(open_seconds=0.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker._open_seconds = 30.0
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["opened"] == 2
+
+
+def test_budget_expiries_count_as_failures():
+    breaker = make_breaker()
+    breaker.record_budget_expired()
+    breaker.record_budget_expired()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["budget_expired"] == 2
+
+
+def test_cancellations_stay_out_of_the_window():
+    breaker = make_breaker(open_seconds=0.0)
+    for _ in range(5):
+        breaker.record_cancelled()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_calls"] == 0
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_cancelled()
+    # The abandoned probe frees the slot for the next caller
+    assert breaker.allow_request()
+
+
+class SlowHTTPClient:
+    async def post(self, *args, **kwargs):
+        await asyncio.sleep(10)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(ollama_client, "get_async_http_client", lambda: SlowHTTPClient())
+    llm = OllamaClient(model="test-model")
+    llm._ollama_base_url = "http://ollama.test"
+    llm._ollama_model = "test-model"
+    llm._breaker = make_breaker()
+    return llm
+
+
+def test_slow_server_opens_the_breaker(client):
+    async def scenario():
+        for _ in range(2):
+            assert await client.agenerate("system", "user", timeout=0.01) is None
+
+    asyncio.run(scenario())
+    assert client._breaker.state == OPEN
+    assert client._breaker.snapshot()["cancelled"] == 0
+
+
+def test_caller_cancellation_is_not_a_failure(client):
+    async def scenario():
+        for _ in range(3):
+            call = asyncio.ensure_future(client.agenerate("system", "user", timeout=5.0))
+            await asyncio.sleep(0.01)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    snapshot = client._breaker.snapshot()
+    assert client._breaker.state == CLOSED
+    assert snapshot["cancelled"] == 3
+    assert snapshot["window_calls"] == 0
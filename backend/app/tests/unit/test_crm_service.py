@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import crm_service
+from app.services.crm_service import CRMService
+
+
+class FakeCRM:
+    def __init__(self, body=None, delay: float = 0.01) -> None:
+        self.calls = 0
+        self.body = body or {"status": "success", "data": {"pan_number": "ABCDE1234F", "name": "Asha Verma", "monthly_income": 85000}}
+        self.delay = delay
+        self.down = False
+
+    async def __call__(self, service, method, url, json=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.down:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json=self.body, request=httpx.Request(method, url))
+
+
+@pytest.fixture
+def crm(monkeypatch):
+    fake = FakeCRM()
+    monkeypatch.setattr(crm_service, "service_request", fake)
+    crm_service._profile_cache.clear()
+    crm_service._inflight.clear()
+    yield fake
+    crm_service._profile_cache.clear()
+    crm_service._inflight.clear()
+
+
+def test_concurrent_lookups_share_one_call(crm):
+    async def scenario():
+        service = CRMService()
+        return await asyncio.gather(*(service.get_customer_profile("ABCDE1234F") for _ in range(10)))
+
+    profiles = asyncio.run(scenario())
+    assert crm.calls == 1
+    assert {profile["name"] for profile in profiles} == {"Asha Verma"}
+    assert not crm_service._inflight
+
+
+def test_cached_profiles_are_copies(crm):
+    async def scenario():
+        service = CRMService()
+        first = await service.get_customer_profile("ABCDE1234F")
+        first["name"] = "changed"
+        return await service.get_customer_profile("ABCDE1234F")
+
+    assert asyncio.run(scenario())["name"] == "Asha Verma"
+    assert crm.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_lookup(crm):
+    async def scenario():
+        service = CRMService()
+        impatient = asyncio.ensure_future(service.get_customer_profile("ABCDE1234F"))
+        patient = asyncio.ensure_future(service.get_customer_profile("ABCDE1234F"))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(scenario())["name"] == "Asha Verma"
+    assert crm.calls == 1
+
+
+@pytest.mark.parametrize("failure", ["down", "not_found"])
+def test_fallback_profiles_use_the_short_ttl(crm, failure):
+    if failure == "down":
+        crm.down = True
+    else:
+        crm.body = {"status": "error", "data": None}
+
+    async def scenario():
+        service = CRMService()
+        service._failure_ttl = 0
+        await service.get_customer_profile("ABCDE1234F")
+        await service.get_customer_profile("ABCDE1234F")
+
+    asyncio.run(scenario())
+    # Not cached at all with a zero failure TTL, so the CRM is asked again
+    assert crm.calls == 2
+    assert "ABCDE1234F" not in crm_service._profile_cache
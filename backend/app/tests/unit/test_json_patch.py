@@ -0,0 +1,80 @@
+import copy
+
+from app.utils.json_patch import diff
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def apply(document, patch):
+    """RFC 6902 add/remove/replace, as a client applies ``state_patch``."""
+    document = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            document = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(token) for token in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if op["op"] == "remove":
+            del target[int(last) if isinstance(target, list) else last]
+        elif isinstance(target, list):
+            if last == "-":
+                target.append(op["value"])
+            elif op["op"] == "add":
+                target.insert(int(last), op["value"])
+            else:
+                target[int(last)] = op["value"]
+        else:
+            target[last] = op["value"]
+    return document
+
+
+def test_identical_documents_give_an_empty_patch():
+    state = {"stage": "SALES", "offer": {"amount": 300000}}
+    assert diff(state, copy.deepcopy(state)) == []
+
+
+def test_nested_changes_are_diffed_key_by_key():
+    old = {"stage": "SALES", "offer": {"amount": 300000, "tenure": 36}, "flags": {"otp": True}}
+    new = {"stage": "VERIFICATION", "offer": {"amount": 300000, "tenure": 48, "emi": 7800}}
+    patch = diff(old, new)
+    assert {"op": "replace", "path": "/stage", "value": "VERIFICATION"} in patch
+    assert {"op": "replace", "path": "/offer/tenure", "value": 48} in patch
+    assert {"op": "add", "path": "/offer/emi", "value": 7800} in patch
+    assert {"op": "remove", "path": "/flags"} in patch
+    assert len(patch) == 4
+    assert apply(old, patch) == new
+
+
+def test_appended_list_items_become_add_ops():
+    old = {"audit_log": [{"turn": 1}]}
+    new = {"audit_log": [{"turn": 1}, {"turn": 2}, {"turn": 3}]}
+    patch = diff(old, new)
+    assert patch == [
+        {"op": "add", "path": "/audit_log/-", "value": {"turn": 2}},
+        {"op": "add", "path": "/audit_log/-", "value": {"turn": 3}},
+    ]
+    assert apply(old, patch) == new
+
+
+def test_other_list_changes_replace_the_list():
+    old = {"audit_log": [{"turn": 1}, {"turn": 2}]}
+    new = {"audit_log": [{"turn": 2}, {"turn": 3}]}
+    assert diff(old, new) == [{"op": "replace", "path": "/audit_log", "value": new["audit_log"]}]
+    assert apply(old, diff(old, new)) == new
+
+
+def test_keys_are_escaped():
+    old = {"llm": {}}
+    new = {"llm": {"a/b": 1, "c~d": 2}}
+    patch = diff(old, new)
+    assert {"op": "add", "path": "/llm/a~1b", "value": 1} in patch
+    assert {"op": "add", "path": "/llm/c~0d", "value": 2} in patch
+    assert apply(old, patch) == new
+
+
+def test_type_change_at_root_replaces_everything():
+    assert diff({"a": 1}, [1]) == [{"op": "replace", "path": "", "value": [1]}]
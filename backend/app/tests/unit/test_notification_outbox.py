@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services import notification_outbox as outbox_module
+from app.services.notification_outbox import (
+    DEAD_KEY,
+    OUTBOX_KEY,
+    PROCESSING_KEY,
+    RETRY_KEY,
+    NotificationOutbox,
+)
+from app.tests.mocks.fake_redis import FakeRedis
+
+
+class FakeNotificationService:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.bulk_calls = []
+        self.single_calls = []
+
+    async def deliver_bulk(self, template, payloads):
+        self.bulk_calls.append((template, payloads))
+        if self.fail:
+            return None
+        return {str(payload["customer_id"]) for payload in payloads}
+
+    async def deliver(self, payload):
+        self.single_calls.append(payload)
+        return not self.fail
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(outbox_module, "redis_client", fake)
+    monkeypatch.setattr(outbox_module, "_promote_due", fake.promote_due)
+    return fake
+
+
+def email(customer_id: str, template: str = "sanction") -> dict:
+    return {"customer_id": customer_id, "email": f"{customer_id}@example.com", "template": template}
+
+
+def test_batches_email_by_template_and_sms_singly(redis):
+    outbox = NotificationOutbox(batch_size=10)
+    service = FakeNotificationService()
+
+    async def scenario():
+        await outbox.enqueue(email("c1"))
+        await outbox.enqueue(email("c2"))
+        await outbox.enqueue(email("c3", template="otp"))
+        await outbox.enqueue({"customer_id": "c4", "phone": "9876543210"})
+        return await outbox.drain_once(service)
+
+    assert asyncio.run(scenario()) == 4
+    assert sorted((template, len(payloads)) for template, payloads in service.bulk_calls) == [("otp", 1), ("sanction", 2)]
+    assert [payload["customer_id"] for payload in service.single_calls] == ["c4"]
+    assert redis.llen(OUTBOX_KEY) == 0
+    assert redis.llen(PROCESSING_KEY) == 0
+    assert outbox.stats()["delivered"] == 4
+
+
+def test_failed_delivery_is_retried_with_backoff(redis):
+    outbox = NotificationOutbox(batch_size=10, retry_backoff=60.0)
+
+    async def scenario():
+        await outbox.enqueue(email("c1"))
+        await outbox.drain_once(FakeNotificationService(fail=True))
+        # Not due yet: nothing is claimed
+        assert await outbox.drain_once(FakeNotificationService()) == 0
+
+    asyncio.run(scenario())
+    assert redis.zcard(RETRY_KEY) == 1
+    record = json.loads(next(iter(redis.zsets[RETRY_KEY])))
+    assert record["attempts"] == 1
+    assert record["next_attempt_at"] > time.time() + 50
+
+    # Once due, the retry is promoted exactly once and delivered
+    redis.zsets[RETRY_KEY] = {member: 0.0 for member in redis.zsets[RETRY_KEY]}
+    service = FakeNotificationService()
+    assert asyncio.run(outbox.drain_once(service)) == 1
+    assert redis.zcard(RETRY_KEY) == 0
+    assert len(service.bulk_calls) == 1
+    assert outbox.stats()["delivered"] == 1
+
+
+def test_dead_letters_after_max_attempts(redis):
+    outbox = NotificationOutbox(batch_size=10, max_attempts=2, retry_backoff=0.0)
+    service = FakeNotificationService(fail=True)
+
+    async def scenario():
+        await outbox.enqueue(email("c1"))
+        await outbox.drain_once(service)
+        await outbox.drain_once(service)
+
+    asyncio.run(scenario())
+    assert redis.zcard(RETRY_KEY) == 0
+    assert redis.llen(DEAD_KEY) == 1
+    assert json.loads(redis.lists[DEAD_KEY][0])["attempts"] == 2
+    assert outbox.stats()["dead_lettered"] == 1
+
+
+def test_recover_returns_unsettled_claims(redis):
+    redis.lpush(PROCESSING_KEY, json.dumps({"id": "x", "payload": email("c1"), "attempts": 0}))
+    outbox = NotificationOutbox()
+    outbox._recover()
+    assert redis.llen(PROCESSING_KEY) == 0
+    assert redis.llen(OUTBOX_KEY) == 1
+
+
+def test_memory_fallback_when_redis_is_down(redis):
+    redis.down = True
+    outbox = NotificationOutbox(batch_size=10)
+    service = FakeNotificationService()
+
+    async def scenario():
+        await outbox.enqueue(email("c1"))
+        return await outbox.drain_once(service)
+
+    assert asyncio.run(scenario()) == 1
+    assert outbox.stats()["memory_pending"] == 0
+    assert len(service.bulk_calls) == 1
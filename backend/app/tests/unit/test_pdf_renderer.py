@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.workers import pdf_renderer
+from app.workers.pdf_renderer import RendererSaturated, SanctionPDFRenderer
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Renders block until the event is set; rendered paths are recorded."""
+    release = threading.Event()
+    rendered = []
+
+    def render(file_path, fields):
+        release.wait(5)
+        rendered.append(file_path)
+        return file_path
+
+    monkeypatch.setattr(pdf_renderer, "render_sanction_pdf", render)
+    return release, rendered
+
+
+def make_renderer(**kwargs) -> SanctionPDFRenderer:
+    renderer = SanctionPDFRenderer(**kwargs)
+    renderer._executor = ThreadPoolExecutor(max_workers=renderer.workers)
+    return renderer
+
+
+def test_jobs_for_the_same_sanction_number_are_kept_apart(gate):
+    release, rendered = gate
+    renderer = make_renderer(workers=2, max_queue=2)
+
+    async def scenario():
+        first = renderer.submit("SL/1", "a.pdf", {})
+        second = renderer.submit("SL/1", "b.pdf", {})
+        release.set()
+        status = await renderer.wait("SL/1", timeout=5)
+        await asyncio.sleep(0.05)
+        return first, second, status
+
+    first, second, status = asyncio.run(scenario())
+    assert first["job_id"] != second["job_id"]
+    assert status["job_id"] == second["job_id"]
+    assert status["status"] == "ready"
+    assert renderer._jobs[first["job_id"]]["status"] == "ready"
+    assert sorted(rendered) == ["a.pdf", "b.pdf"]
+    assert renderer.metrics()["queue_depth"] == 0
+
+
+def test_full_pool_defers_then_sheds(gate):
+    release, rendered = gate
+    renderer = make_renderer(workers=1, max_queue=1, max_deferred=1)
+
+    async def scenario():
+        running = renderer.submit("SL/1", "a.pdf", {})
+        deferred = renderer.submit("SL/2", "b.pdf", {})
+        with pytest.raises(RendererSaturated):
+            renderer.submit("SL/3", "c.pdf", {})
+        shed = renderer.status("SL/3")
+        release.set()
+        return running, deferred, shed, await renderer.wait("SL/2", timeout=5)
+
+    running, deferred, shed, done = asyncio.run(scenario())
+    assert running["status"] == "rendering"
+    assert deferred["status"] == "deferred"
+    assert shed["status"] == "failed"
+    assert done["status"] == "ready"
+    assert rendered == ["a.pdf", "b.pdf"]
+    metrics = renderer.metrics()
+    assert metrics["saturated"] == 1
+    assert metrics["deferred_total"] == 1
+
+
+def test_unknown_job_is_ready_when_the_file_exists(tmp_path):
+    letter = tmp_path / "letter.pdf"
+    letter.write_bytes(b"%PDF")
+    renderer = SanctionPDFRenderer()
+    assert renderer.status("SL/1", str(letter))["status"] == "ready"
+    assert renderer.status("SL/1", str(tmp_path / "missing.pdf"))["status"] == "unknown"
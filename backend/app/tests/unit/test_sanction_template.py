@@ -0,0 +1,110 @@
+import base64
+import re
+import zlib
+
+import pytest
+
+from app.workers.sanction_template import SanctionLetterTemplate, render_with_reportlab
+
+_OBJECT = re.compile(rb"(\d+) 0 obj\n(.*?)\nendobj\n", re.S)
+
+
+def _unescape(raw: bytes) -> bytes:
+    out = bytearray()
+    idx = 0
+    while idx < len(raw):
+        if raw[idx:idx + 1] != b"\\":
+            out.append(raw[idx])
+            idx += 1
+            continue
+        octal = re.match(rb"[0-7]{1,3}", raw[idx + 1:idx + 4])
+        if octal:
+            out.append(int(octal.group(), 8))
+            idx += 1 + len(octal.group())
+        else:
+            out += {b"n": b"\n", b"r": b"\r", b"t": b"\t"}.get(raw[idx + 1:idx + 2], raw[idx + 1:idx + 2])
+            idx += 2
+    return bytes(out)
+
+
+def parse_pdf(data: bytes):
+    """Page count and the ``(base font, text)`` of every ``Tj`` in content order."""
+    objects = {int(number): body for number, body in _OBJECT.findall(data)}
+    fonts = {}
+    for body in objects.values():
+        base_font = re.search(rb"/BaseFont /([\w-]+)", body)
+        name = re.search(rb"/Name /(\w+)", body)
+        if base_font and name:
+            fonts[name.group(1)] = base_font.group(1).decode()
+    pages = sum(1 for body in objects.values() if re.search(rb"/Type /Page\b", body))
+    runs = []
+    for body in objects.values():
+        match = re.search(rb"<<(.*?)>>\s*stream\r?\n(.*)endstream", body, re.S)
+        if not match:
+            continue
+        filters, stream = match.groups()
+        if b"ASCII85Decode" in filters:
+            stream = base64.a85decode(stream.strip().rstrip(b">").rstrip(b"~"))
+        if b"FlateDecode" in filters:
+            stream = zlib.decompress(stream)
+        font = None
+        for token in re.finditer(rb"/(\w+) [\d.]+ Tf|\(((?:\\.|[^\\)])*)\) Tj", stream, re.S):
+            if token.group(1):
+                font = fonts[token.group(1)]
+            else:
+                runs.append((font, _unescape(token.group(2)).decode("cp1252")))
+    return pages, runs
+
+
+FIELDS = {
+    "date": "2026-01-01",
+    "sanction_number": "SL/20260101/ABCDE1234F",
+    "name": "Asha Rao",
+    "address": "12 MG Road, Bengaluru",
+    "amount": 500000,
+    "tenure": 36,
+    "rate": 11.25,
+    "emi": 16432.7,
+    "valid_until": "2026-01-31",
+}
+
+
+@pytest.fixture(scope="module")
+def template():
+    return SanctionLetterTemplate()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"name": "Dr. (Ms) O'Brien \\ Jr.", "address": "Flat 4B, Café Street"},
+        {"name": "Ω Σ ₹ €", "address": "漢字"},
+        {"amount": None, "tenure": None, "rate": None, "emi": None, "name": ""},
+    ],
+)
+def test_template_matches_reportlab_output(tmp_path, template, overrides):
+    fields = {**FIELDS, **overrides}
+    expected = render_with_reportlab(str(tmp_path / "reportlab.pdf"), fields)
+    actual = template.write(str(tmp_path / "template.pdf"), fields)
+    with open(expected, "rb") as fh:
+        expected_pages, expected_runs = parse_pdf(fh.read())
+    with open(actual, "rb") as fh:
+        actual_pages, actual_runs = parse_pdf(fh.read())
+    assert actual_pages == expected_pages == 1
+    assert actual_runs == expected_runs
+    assert ("Helvetica", "Sanction Letter No: SL/20260101/ABCDE1234F") in actual_runs
+
+
+def test_each_letter_has_valid_xref_and_own_id(template):
+    first, second = template.render(FIELDS), template.render(FIELDS)
+    for data in (first, second):
+        startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+        assert data[startxref:].startswith(b"xref\n")
+        entries = re.findall(rb"(\d{10}) 00000 n ", data[startxref:])
+        assert len(entries) == len(_OBJECT.findall(data))
+        for number, offset in enumerate(entries, start=1):
+            assert data[int(offset):].startswith(b"%d 0 obj\n" % number)
+        assert b"D:20000101000000" not in data
+    file_id = re.compile(rb"/ID\s*\[<([0-9a-f]+)>")
+    assert file_id.search(first).group(1) != file_id.search(second).group(1)
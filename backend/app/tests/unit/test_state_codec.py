@@ -0,0 +1,117 @@
+import pytest
+
+from app.orchestrator import state_codec
+from app.orchestrator.state_codec import (
+    CORE_FIELD,
+    MAGIC,
+    STATE_SCHEMA_VERSION,
+    STATE_SECTIONS,
+    decode_state,
+    decode_state_fields,
+    encode_state,
+    encode_state_fields,
+)
+from app.schemas.conversation_state import OrchestratorState
+
+
+def journey_state() -> OrchestratorState:
+    state = OrchestratorState(conversation_id="conv-codec", stage="UNDERWRITING", revision=7)
+    state.customer_profile = {"name": "Asha Verma", "monthly_income": 85000, "notes": "naïve ₹ \"quoted\""}
+    state.offer.amount = 300000
+    state.offer.emi = 9857.31
+    state.kyc.verified = True
+    state.underwriting = {"decision": "approve", "reasons": ["score above 750"]}
+    state.audit_log = [{"stage": "SALES", "intent": "provide_amount"}]
+    state.llm_context = {"sales": {"tokens": [1, 2, 3]}}
+    return state
+
+
+def test_round_trip_with_header():
+    state = journey_state()
+    blob = encode_state(state)
+    assert blob[:2] == MAGIC
+    assert blob[2] == STATE_SCHEMA_VERSION
+    assert blob[3] == state_codec.COMPRESSION_NONE
+    assert decode_state(blob) == state
+
+
+def test_legacy_json_is_still_read():
+    state = journey_state()
+    assert decode_state(state.model_dump_json()) == state
+
+
+def test_newer_schema_version_is_rejected():
+    blob = bytearray(encode_state(journey_state()))
+    blob[2] = STATE_SCHEMA_VERSION + 1
+    with pytest.raises(ValueError, match="newer"):
+        decode_state(bytes(blob))
+
+
+def test_unknown_compression_is_rejected():
+    blob = bytearray(encode_state(journey_state()))
+    blob[3] = 9
+    with pytest.raises(ValueError, match="compression"):
+        decode_state(bytes(blob))
+
+
+def test_registered_upgrade_runs_for_older_versions(monkeypatch):
+    monkeypatch.setattr(state_codec, "STATE_SCHEMA_VERSION", STATE_SCHEMA_VERSION + 1)
+    monkeypatch.setitem(
+        state_codec._UPGRADES,
+        STATE_SCHEMA_VERSION,
+        lambda data: {**data, "stage": "SALES"} if "stage" in data else data,
+    )
+    blob = MAGIC + bytes((STATE_SCHEMA_VERSION, 0)) + journey_state().model_dump_json().encode()
+    assert decode_state(blob).stage == "SALES"
+
+
+def test_fields_round_trip():
+    state = journey_state()
+    fields = encode_state_fields(state)
+    assert set(fields) == {CORE_FIELD, *STATE_SECTIONS}
+    assert all(value.startswith(MAGIC) for value in fields.values())
+    assert decode_state_fields(fields) == state
+
+
+def test_large_states_are_compressed(monkeypatch):
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(state_codec, "_compress_threshold", 256)
+    state = journey_state()
+    state.underwriting = {"report": "x" * 4096}
+    blob = encode_state(state)
+    assert blob[3] == state_codec.COMPRESSION_ZSTD
+    assert len(blob) < 4096
+    assert decode_state(blob) == state
+
+
+def test_absent_sections_keep_their_defaults():
+    fields = encode_state_fields(journey_state(), sections=("offer",))
+    assert set(fields) == {CORE_FIELD, "offer"}
+    state = decode_state_fields({**fields, "kyc": None})
+    assert state.offer.amount == 300000
+    assert state.kyc.verified is False
+    assert state.customer_profile == {}
+    assert state.stage == "UNDERWRITING"
+
+
+def test_fields_need_the_core_field():
+    fields = encode_state_fields(journey_state())
+    fields[CORE_FIELD] = None
+    with pytest.raises(ValueError, match="core"):
+        decode_state_fields(fields)
+
+
+def test_upgrades_see_one_field_at_a_time(monkeypatch):
+    seen = []
+
+    def upgrade(data):
+        seen.append(set(data))
+        return data
+
+    # Written at the current version, read after a schema bump
+    fields = encode_state_fields(journey_state(), sections=("offer", "kyc"))
+    monkeypatch.setattr(state_codec, "STATE_SCHEMA_VERSION", STATE_SCHEMA_VERSION + 1)
+    monkeypatch.setitem(state_codec._UPGRADES, STATE_SCHEMA_VERSION, upgrade)
+    decode_state_fields(fields)
+    assert {"offer"} in seen and {"kyc"} in seen
+    assert all("offer" not in keys for keys in seen if "stage" in keys)
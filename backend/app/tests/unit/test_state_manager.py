@@ -0,0 +1,211 @@
+import asyncio
+
+import pytest
+
+from app.orchestrator import state_manager
+from app.orchestrator.state_codec import CORE_FIELD
+from app.orchestrator.state_manager import PERSISTED_SECTIONS, StateConflictError, StateFallbackStore, StateManager
+from app.schemas.conversation_state import OrchestratorState
+from app.tests.mocks.fake_redis import FakeAsyncRedis
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeAsyncRedis()
+    monkeypatch.setattr(state_manager, "async_redis_client", fake)
+    monkeypatch.setattr(StateManager, "_cas", staticmethod(fake.compare_and_set))
+    StateManager._fallback_store.clear()
+    yield fake
+    StateManager._fallback_store.clear()
+
+
+def test_write_after_redis_outage_recovers(redis):
+    async def scenario():
+        # Redis is down: turns only reach the in-process fallback copy
+        redis.down = True
+        state = OrchestratorState(conversation_id="conv-outage")
+        for _ in range(3):
+            await StateManager.upsert_state(state)
+        assert state.revision == 3
+
+        # Redis is back but has never seen the conversation
+        redis.down = False
+        loaded = await StateManager.get_state("conv-outage")
+        assert loaded is not None and loaded.revision == 3
+        loaded.stage = "SALES"
+        await StateManager.upsert_state(loaded)
+
+        stored = await StateManager.get_state("conv-outage")
+        assert stored.revision == 4
+        assert stored.stage == "SALES"
+        assert redis.hashes["conv_fields:conv-outage"]["rev"] == b"4"
+
+    asyncio.run(scenario())
+
+
+def test_stale_revision_conflicts(redis):
+    async def scenario():
+        await StateManager.upsert_state(OrchestratorState(conversation_id="conv-race"))
+        first = await StateManager.get_state("conv-race")
+        second = await StateManager.get_state("conv-race")
+        await StateManager.upsert_state(first)
+
+        with pytest.raises(StateConflictError) as exc:
+            await StateManager.upsert_state(second)
+        assert exc.value.current == 2
+        assert second.revision == 1
+
+    asyncio.run(scenario())
+
+
+def test_fallback_reads_and_writes_are_detached(redis):
+    async def scenario():
+        redis.down = True
+        state = OrchestratorState(conversation_id="conv-copy")
+        state.customer_profile = {"name": "Asha"}
+        await StateManager.upsert_state(state)
+        # Edits after the write don't reach the stored copy
+        state.customer_profile["name"] = "edited after upsert"
+
+        loaded = await StateManager.get_state("conv-copy")
+        assert loaded is not state
+        assert loaded.customer_profile == {"name": "Asha"}
+        # Nor do edits to a loaded copy that is never written back
+        loaded.stage = "SALES"
+        loaded.customer_profile["name"] = "abandoned turn"
+
+        again = await StateManager.get_state("conv-copy")
+        assert again.stage == state.stage != "SALES"
+        assert again.customer_profile == {"name": "Asha"}
+        assert again.revision == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def writes(redis, monkeypatch):
+    """Names of the hash fields each compare-and-set wrote."""
+    written = []
+
+    async def record(keys, args):
+        written.append(set(args[3::2]))
+        return await redis.compare_and_set(keys, args)
+
+    monkeypatch.setattr(StateManager, "_cas", staticmethod(record))
+    return written
+
+
+def test_upsert_writes_only_dirty_fields(redis, writes):
+    async def scenario():
+        state = OrchestratorState(conversation_id="conv-fields")
+        state.llm_context = {"sales": {"tokens": [1, 2, 3]}}
+        await StateManager.upsert_state(state)
+        assert writes[-1] == {CORE_FIELD, *PERSISTED_SECTIONS}
+        assert "llm_context" not in redis.hashes["conv_fields:conv-fields"]
+
+        loaded = await StateManager.get_state("conv-fields")
+        loaded.salary_slip.file_id = "slip-1"
+        await StateManager.upsert_state(loaded)
+        # The core field carries the revision, so it changes on every write
+        assert writes[-1] == {CORE_FIELD, "salary_slip"}
+
+        # Re-encoding a loaded state that nothing touched finds nothing dirty
+        unchanged = await StateManager.get_state("conv-fields")
+        await StateManager.upsert_state(unchanged)
+        assert writes[-1] == {CORE_FIELD}
+
+    asyncio.run(scenario())
+
+
+def test_partial_read_leaves_other_sections_alone(redis, writes):
+    async def scenario():
+        state = OrchestratorState(conversation_id="conv-partial")
+        state.offer.amount = 300000
+        await StateManager.upsert_state(state)
+
+        partial = await StateManager.get_state("conv-partial", sections=("salary_slip",))
+        assert partial.offer.amount is None
+        partial.salary_slip.file_id = "slip-1"
+        await StateManager.upsert_state(partial)
+        assert writes[-1] == {CORE_FIELD, "salary_slip"}
+
+        full = await StateManager.get_state("conv-partial")
+        assert full.offer.amount == 300000
+        assert full.salary_slip.file_id == "slip-1"
+        assert full.revision == 2
+
+    asyncio.run(scenario())
+
+
+def test_unreadable_field_falls_back_to_local_copy(redis):
+    async def scenario():
+        state = OrchestratorState(conversation_id="conv-corrupt", stage="SALES")
+        await StateManager.upsert_state(state)
+        redis.hashes["conv_fields:conv-corrupt"]["offer"] = b"OS\x09\x00{}"
+
+        loaded = await StateManager.get_state("conv-corrupt")
+        assert loaded is not None and loaded.stage == "SALES"
+        # Sections that are not read don't trip over the bad field
+        partial = await StateManager.get_state("conv-corrupt", sections=("kyc",))
+        assert partial.stage == "SALES"
+
+        StateManager._fallback_store.clear()
+        assert await StateManager.get_state("conv-corrupt") is None
+
+    asyncio.run(scenario())
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(state_manager.time, "monotonic", fake)
+    return fake
+
+
+def stored(store: StateFallbackStore):
+    return list(store._entries)
+
+
+def test_fallback_store_evicts_least_recently_used(clock):
+    store = StateFallbackStore(max_entries=2, max_bytes=0)
+    for name in ("a", "b"):
+        store.put(name, OrchestratorState(conversation_id=name), ttl=60, size=10)
+    store.get("a")
+    store.put("c", OrchestratorState(conversation_id="c"), ttl=60, size=10)
+    assert stored(store) == ["a", "c"]
+    assert store.stats()["evicted"] == 1
+
+
+def test_fallback_store_expires_entries(clock):
+    store = StateFallbackStore(max_entries=10, max_bytes=0)
+    store.put("a", OrchestratorState(conversation_id="a"), ttl=60, size=100)
+    clock.now += 59
+    assert store.get("a") is not None
+    clock.now += 2
+    assert store.get("a") is None
+    stats = store.stats()
+    assert (stats["expired"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_fallback_store_bounds_bytes(clock):
+    store = StateFallbackStore(max_entries=10, max_bytes=250)
+    for name in ("a", "b"):
+        store.put(name, OrchestratorState(conversation_id=name), ttl=60, size=100)
+    # Re-putting without a size keeps the recorded one and refreshes recency
+    store.put("a", OrchestratorState(conversation_id="a"), ttl=60)
+    assert store.stats()["bytes"] == 200
+    store.put("c", OrchestratorState(conversation_id="c"), ttl=60, size=100)
+    assert stored(store) == ["a", "c"]
+    assert store.stats()["bytes"] == 200
+    # A single entry larger than the bound is still kept
+    store.put("huge", OrchestratorState(conversation_id="huge"), ttl=60, size=1000)
+    assert stored(store) == ["huge"]
+    assert store.stats()["bytes"] == 1000
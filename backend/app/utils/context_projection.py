@@ -0,0 +1,76 @@
+"""Project conversation state into compact, budgeted LLM prompt context.
+
+Agents used to paste ``json.dumps(state.model_dump())`` into prompts, which
+drags the audit log, raw bureau report and CRM snapshot along on every turn.
+``project_sales_context`` keeps only the fields a sales mode needs and fits
+them into a token budget in a fixed priority order, so truncation is
+predictable: lower-priority fields are dropped first, never cut mid-value.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Customer profile keys that are safe and useful in a sales prompt
+_PROFILE_KEYS = (
+    "name",
+    "monthly_income",
+    "employment_type",
+    "employer",
+    "credit_score",
+    "pre_approved_limit",
+    "loyalty_years",
+)
+
+# Fields per mode, highest priority first
+_MODE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "needs_discovery": ("language", "offer", "loan_request", "customer_profile", "emotion", "stage"),
+    "information_only": ("language", "offer", "loan_request", "customer_profile", "stage"),
+    "objection_handling": ("language", "offer", "breakdown", "alternatives", "loan_request", "emotion", "customer_profile"),
+    "renegotiation": ("language", "offer", "loan_request", "alternatives", "customer_profile"),
+    "closing": ("language", "offer", "loan_request", "customer_profile"),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English/JSON)."""
+    return (len(text) + 3) // 4
+
+
+def _compact(value: Any) -> Any:
+    """Drop empty values so they don't cost prompt tokens."""
+    if isinstance(value, dict):
+        return {k: _compact(v) for k, v in value.items() if v not in (None, "", [], {})}
+    return value
+
+
+def fit_to_budget(items: Iterable[Tuple[str, Any]], token_budget: int) -> Dict[str, Any]:
+    """Add ``(key, value)`` pairs in order while the JSON stays within budget.
+
+    A field that does not fit is skipped and smaller later fields may still
+    be added, so the result depends only on the inputs and the budget.
+    """
+    result: Dict[str, Any] = {}
+    for key, value in items:
+        candidate = {**result, key: value}
+        if estimate_tokens(json.dumps(candidate, default=str)) <= token_budget:
+            result = candidate
+    return result
+
+
+def project_sales_context(context: Dict[str, Any], mode: str, token_budget: int) -> Dict[str, Any]:
+    """Return the subset of ``context`` the given sales mode needs, within budget."""
+    fields = _MODE_FIELDS.get(mode, _MODE_FIELDS["needs_discovery"])
+    items: List[Tuple[str, Any]] = []
+    for field in fields:
+        value = context.get(field)
+        if field == "customer_profile" and isinstance(value, dict):
+            value = {k: value[k] for k in _PROFILE_KEYS if k in value}
+        value = _compact(value)
+        if value in (None, "", [], {}):
+            continue
+        items.append((field, value))
+    return fit_to_budget(items, token_budget)
+
+
+__all__ = ["estimate_tokens", "fit_to_budget", "project_sales_context"]
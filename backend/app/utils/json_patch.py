@@ -0,0 +1,41 @@
+"""Minimal JSON Patch (RFC 6902) diff for state snapshots.
+
+Only ``add``, ``remove`` and ``replace`` operations are produced. Objects are
+diffed key by key; lists that only grew get one ``add`` per appended item
+(path ``.../-``) and any other list change replaces the whole list, which
+keeps patches small for the append-heavy parts of the state without a full
+list diff algorithm.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+Patch = List[Dict[str, Any]]
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff(old: Any, new: Any, path: str = "") -> Patch:
+    """Operations that turn ``old`` into ``new`` (root path ``""``)."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: Patch = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[: len(old)] == old:
+        return [{"op": "add", "path": f"{path}/-", "value": item} for item in new[len(old):]]
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+__all__ = ["Patch", "diff"]
@@ -0,0 +1,228 @@
+"""Off-loop rendering of sanction letter PDFs in a bounded process pool.
+
+reportlab rendering is CPU-bound, so running it inside ``orchestrate`` stalls
+every other chat turn on the event loop. ``SanctionPDFRenderer.submit``
+schedules the render on a ``ProcessPoolExecutor`` and returns immediately;
+callers hand the sanction number to the customer straight away and readiness
+is exposed through ``status`` / ``wait`` (``GET /sanction/status/...`` and the
+``sanction_pdf_ready`` WebSocket frame). Jobs are keyed by their own id, so
+re-issuing a letter never clobbers the record of an earlier render; lookups
+by sanction number see the latest job.
+
+At most ``sanction_pdf_max_queue`` renders run in the pool at once. Further
+jobs wait as ``deferred`` (up to ``sanction_pdf_max_deferred``) and start as
+slots free up; beyond that ``submit`` sheds the job and raises
+``RendererSaturated``. Rendering never falls back to the server process.
+
+This module is imported by every pool process, so it must not pull in the
+web app (``app/__init__`` stays free of imports for the same reason).
+
+The pool is created by ``start()`` in the app's startup hook and uses the
+``spawn`` start method: forking a server that already runs threads (Redis,
+HTTP clients, asyncio.to_thread) can leave children holding locks forever.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.config.settings import get_settings
+from app.workers.sanction_template import get_sanction_template, render_with_reportlab
+
+
+class RendererSaturated(RuntimeError):
+    """Raised when the render queue is full."""
+
+
+def render_sanction_pdf(file_path: str, fields: Dict[str, Any]) -> str:
+    """Write the sanction letter to ``file_path`` (runs inside a pool process).
+
+    Stamps the fields onto the pre-compiled template; falls back to drawing
+    the whole letter with reportlab if the template cannot be used.
+    """
+    try:
+        return get_sanction_template().write(file_path, fields)
+    except Exception as e:
+        print(f"Sanction template render failed, using reportlab: {e}")
+        return render_with_reportlab(file_path, fields)
+
+
+class SanctionPDFRenderer:
+    def __init__(self, *, workers: int = 2, max_queue: int = 32, max_deferred: int = 64) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.max_deferred = max(0, max_deferred)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # job_id -> job record / completion future; sanction_number -> latest job_id
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._done: Dict[str, "asyncio.Future[None]"] = {}
+        self._latest: Dict[str, str] = {}
+        self._deferred: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._in_flight = 0
+        self._job_history = 1024
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "deferred": 0,
+            "saturated": 0,
+            "render_ms_total": 0.0,
+        }
+
+    def start(self) -> None:
+        """Create the process pool (called once from the app's startup hook)."""
+        self._pool()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Lazy creation only covers scripts that never call start()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, sanction_number: str, file_path: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a render and return its job record.
+
+        The status is ``rendering`` when a pool slot is free and ``deferred``
+        when the job waits for one. When both are full the job is recorded
+        as ``failed`` and ``RendererSaturated`` is raised.
+        """
+        loop = asyncio.get_running_loop()
+        job_id = uuid4().hex
+        job = {
+            "job_id": job_id,
+            "sanction_number": sanction_number,
+            "file_path": file_path,
+            "status": "rendering",
+            "submitted_at": time.time(),
+            "render_ms": None,
+            "error": None,
+        }
+        self._jobs[job_id] = job
+        self._latest[sanction_number] = job_id
+        self._forget_finished()
+        self._stats["submitted"] += 1
+
+        if self._in_flight < self.max_queue:
+            self._done[job_id] = loop.create_future()
+            self._start(job_id, fields)
+        elif len(self._deferred) < self.max_deferred:
+            self._done[job_id] = loop.create_future()
+            job["status"] = "deferred"
+            self._deferred.append((job_id, fields))
+            self._stats["deferred"] += 1
+        else:
+            job["status"] = "failed"
+            job["error"] = "renderer saturated"
+            self._stats["saturated"] += 1
+            raise RendererSaturated(f"{self._in_flight} sanction letters rendering, {len(self._deferred)} deferred")
+        return dict(job)
+
+    def _forget_finished(self) -> None:
+        # Forget the oldest finished jobs; status() falls back to the file on disk
+        for old in list(self._jobs)[: max(0, len(self._jobs) - self._job_history)]:
+            job = self._jobs[old]
+            if job["status"] in ("ready", "failed"):
+                self._jobs.pop(old, None)
+                if self._latest.get(job["sanction_number"]) == old:
+                    self._latest.pop(job["sanction_number"], None)
+
+    def _start(self, job_id: str, fields: Dict[str, Any]) -> None:
+        job = self._jobs[job_id]
+        job["status"] = "rendering"
+        self._in_flight += 1
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(self._pool(), render_sanction_pdf, job["file_path"], fields)
+
+        def _finished(fut: "asyncio.Future[str]") -> None:
+            self._in_flight -= 1
+            job["render_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if fut.cancelled() or fut.exception() is not None:
+                job["status"] = "failed"
+                job["error"] = "cancelled" if fut.cancelled() else str(fut.exception())
+                self._stats["failed"] += 1
+                print(f"SanctionPDFRenderer error for {job['sanction_number']}: {job['error']}")
+            else:
+                job["status"] = "ready"
+                self._stats["completed"] += 1
+                self._stats["render_ms_total"] += job["render_ms"]
+            done = self._done.pop(job_id, None)
+            if done is not None and not done.done():
+                done.set_result(None)
+            self._start_deferred()
+
+        future.add_done_callback(_finished)
+
+    def _start_deferred(self) -> None:
+        while self._deferred and self._in_flight < self.max_queue:
+            job_id, fields = self._deferred.popleft()
+            try:
+                self._start(job_id, fields)
+            except Exception as e:  # pool shut down
+                self._jobs[job_id].update(status="failed", error=str(e))
+                self._stats["failed"] += 1
+                done = self._done.pop(job_id, None)
+                if done is not None and not done.done():
+                    done.set_result(None)
+
+    def status(self, sanction_number: str, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """Latest job record for ``sanction_number``; unknown jobs are ready if the file exists.
+
+        The file check covers letters rendered by another worker process or
+        before a restart.
+        """
+        job = self._jobs.get(self._latest.get(sanction_number, ""))
+        if job is not None:
+            return dict(job)
+        if file_path and Path(file_path).exists():
+            return {"sanction_number": sanction_number, "file_path": file_path, "status": "ready"}
+        return {"sanction_number": sanction_number, "file_path": file_path, "status": "unknown"}
+
+    async def wait(self, sanction_number: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until the latest render finishes (or ``timeout`` passes) and return its status."""
+        done = self._done.get(self._latest.get(sanction_number, ""))
+        if done is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(done), timeout=timeout)
+            except Exception:
+                pass
+        return self.status(sanction_number)
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self._stats["completed"]
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self._in_flight,
+            "submitted": self._stats["submitted"],
+            "completed": completed,
+            "failed": self._stats["failed"],
+            "deferred": len(self._deferred),
+            "deferred_total": self._stats["deferred"],
+            "saturated": self._stats["saturated"],
+            "avg_render_ms": round(self._stats["render_ms_total"] / completed, 1) if completed else None,
+        }
+
+    def shutdown(self) -> None:
+        self._deferred.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+sanction_renderer = SanctionPDFRenderer(
+    workers=_settings.sanction_pdf_workers,
+    max_queue=_settings.sanction_pdf_max_queue,
+    max_deferred=_settings.sanction_pdf_max_deferred,
+)
+
+__all__ = ["RendererSaturated", "SanctionPDFRenderer", "render_sanction_pdf", "sanction_renderer"]
@@ -4,9 +4,10 @@ from __future__ import annotations
 from typing import Dict, Any, Optional, List
 import json
 
-from app.config.ollama_client import OllamaClient
+from app.config.ollama_client import OllamaClient, TokenCallback, remember_context, reusable_context
 from app.config.settings import get_settings
 from app.orchestrator.prompts import get_sales_system_prompt
+from app.utils.context_projection import project_sales_context
 from app.workers.pricing_engine import PricingEngine
 
 
@@ -15,7 +16,10 @@ class SalesAgent:
         settings = get_settings()
         # Use per-agent Ollama model
         model_name = settings.ollama_model_sales or settings.ollama_model_default
-        self._client = OllamaClient(model=model_name)
+        self._client = OllamaClient(model=model_name, agent="sales")
+        self._llm_budget = settings.llm_budget_sales_ms / 1000.0
+        self._first_token_budget = settings.llm_first_token_budget_sales_ms / 1000.0
+        self._context_token_budget = settings.sales_context_token_budget
         self._base_system_prompt = get_sales_system_prompt()
         self._pricing_engine = PricingEngine()
         self.persuasion_techniques = {
@@ -27,13 +31,21 @@ class SalesAgent:
             "personalization": "Based on your profile..."
         }
 
-    def craft_pitch(self, context: Dict[str, Any], user_message: str = "", mode: str = "needs_discovery", concern_type: Optional[str] = None, modification: Optional[Dict] = None) -> str:
+    async def craft_pitch(self, context: Dict[str, Any], user_message: str = "", mode: str = "needs_discovery", concern_type: Optional[str] = None, modification: Optional[Dict] = None, on_token: Optional[TokenCallback] = None, llm_context: Optional[Dict[str, Any]] = None) -> str:
         """Generate a sales pitch or response based on the mode and context.
 
         Modes: "needs_discovery", "information_only", "objection_handling", "renegotiation", "closing".
         If the LLM client is not available, we fall back to a rule-based response
         so that the chatbot still behaves intelligently instead of repeating the
         same generic message.
+
+        When ``on_token`` is provided, partial LLM tokens are forwarded as they
+        arrive; the returned string remains the authoritative final message.
+
+        ``llm_context`` is the conversation's per-agent Ollama context store
+        (``OrchestratorState.llm_context``). When given, the static system
+        prompt is prefilled once per conversation and later turns send only
+        the per-turn mode/context/user message; the store is updated in place.
         """
         if not self._client.available:
             return self._rule_based_pitch(context, user_message, mode, concern_type, modification)
@@ -91,11 +103,9 @@ class SalesAgent:
                 "Offer alternatives if needed (e.g., longer tenure for lower EMI)."
             )
         
-        prompt = (
+        # Static per conversation (reused from Ollama's KV context)
+        system_prompt = (
             f"{system_instruction}\n"
-            f"MODE: {mode}\n"
-            f"CONTEXT DATA: {json.dumps(context, default=str)}\n"
-            f"INSTRUCTIONS: {specific_instructions}\n"
             "CRITICAL INSTRUCTION: Use the 'offer' data in CONTEXT DATA for the loan amount, EMI, and Rate. "
             "Do NOT calculate them yourself. Use the exact numbers provided in the context.\n"
             "FORMATTING RULES:\n"
@@ -109,15 +119,38 @@ class SalesAgent:
             "IMPORTANT: Do not output the prompt, mode, or context data. "
             "Only output the final response to the user."
         )
+        # Changes every turn
+        user_prompt = (
+            f"MODE: {mode}\n"
+            f"CONTEXT DATA: {json.dumps(project_sales_context(context, mode, self._context_token_budget), default=str)}\n"
+            f"INSTRUCTIONS: {specific_instructions}\n"
+            f"USER SAYS: {user_message}"
+        )
 
-        response = self._client.generate(prompt, f"USER SAYS: {user_message}", max_tokens=300)
+        # Streamed replies are budgeted to their first token; after that the
+        # customer has seen text, so the reply must not be replaced by a fallback
+        budget = self._first_token_budget if on_token is not None else self._llm_budget
+        if llm_context is None:
+            response = await self._client.agenerate(system_prompt, user_prompt, max_tokens=300, on_token=on_token, timeout=budget)
+        else:
+            response, new_context = await self._client.agenerate_with_context(
+                system_prompt,
+                user_prompt,
+                reusable_context(llm_context, "sales", system_prompt),
+                max_tokens=300,
+                on_token=on_token,
+                timeout=budget,
+            )
         if not response:
             # LLM failed or returned empty; fall back to rule-based pitch so
             # conversation stays contextual and does not repeat a generic line.
+            self._forget_context(llm_context)
             return self._rule_based_pitch(context, user_message, mode, concern_type, modification)
 
         # Clean up response if it accidentally includes the prompt or debug info
         if "MODE:" in response or "CONTEXT DATA:" in response:
+             # The KV context now holds text the customer never sees; drop it
+             self._forget_context(llm_context)
              # If the model hallucinated and printed the prompt, try to strip it
              # or fall back to rule-based if it's too messy.
              if "USER SAYS:" in response:
@@ -125,9 +158,18 @@ class SalesAgent:
              else:
                  # Fallback if we can't cleanly separate
                  return self._rule_based_pitch(context, user_message, mode, concern_type, modification)
+             return response
 
+        # Only a reply the customer actually gets may continue the KV context
+        if llm_context is not None:
+            remember_context(llm_context, "sales", system_prompt, new_context)
         return response
 
+    @staticmethod
+    def _forget_context(llm_context: Optional[Dict[str, Any]]) -> None:
+        if llm_context is not None:
+            llm_context.pop("sales", None)
+
     def _inject_real_offer(self, user_message: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Extract amount from text and calculate real EMI using PricingEngine."""
         import re
@@ -2,7 +2,8 @@
 
 This agent is responsible for:
 - Generating a human-readable sanction summary (via LLM when available).
-- Creating a local PDF sanction letter on disk and returning its metadata.
+- Creating a local PDF sanction letter on disk and returning its metadata
+  (rendered off the event loop by ``app.workers.pdf_renderer``).
 """
 from __future__ import annotations
 
@@ -10,12 +11,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-
 from app.config.ollama_client import OllamaClient
 from app.config.settings import get_settings
 from app.orchestrator.prompts import get_sanction_system_prompt
+from app.workers.pdf_renderer import RendererSaturated, render_sanction_pdf, sanction_renderer
 
 
 class SanctionAgent:
@@ -23,14 +22,12 @@ class SanctionAgent:
         settings = get_settings()
         # Use per-agent Ollama model when configured, otherwise default
         model_name = settings.ollama_model_sanction or settings.ollama_model_default
-        self._client = OllamaClient(model=model_name)
+        self._client = OllamaClient(model=model_name, agent="sanction")
+        self._llm_budget = settings.llm_budget_sanction_ms / 1000.0
         self._base_system_prompt = get_sanction_system_prompt()
 
-    def generate_letter(self, customer_profile: Dict[str, Any], loan_details: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a simple PDF sanction letter and store it locally.
-
-        Returns a dict with sanction_number, file_path and valid_until.
-        """
+    def _prepare_letter(self, customer_profile: Dict[str, Any], loan_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Sanction number, target path and the fields stamped onto the letter."""
 
         # Local folder under backend/app/../data/sanctions
         base_dir = Path(__file__).resolve().parents[2] / "data" / "sanctions"
@@ -41,81 +38,66 @@ class SanctionAgent:
         sanction_number = f"SL/{now:%Y%m%d}/{customer_id}"
         filename = f"{sanction_number.replace('/', '_')}.pdf"
         file_path = base_dir / filename
-
-        # Basic letter fields
-        name = customer_profile.get("name", "Valued Customer")
-        address = customer_profile.get("address", "Address on file")
-        amount = loan_details.get("amount")
-        tenure = loan_details.get("tenure")
-        rate = loan_details.get("rate")
-        emi = loan_details.get("emi")
-
         valid_until = (now + timedelta(days=30)).date().isoformat()
 
-        # Create a very simple PDF letter
-        c = canvas.Canvas(str(file_path), pagesize=A4)
-        width, height = A4
-
-        y = height - 50
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(50, y, "Tata Capital - Personal Loan Sanction Letter")
-        y -= 30
-
-        c.setFont("Helvetica", 10)
-        c.drawString(50, y, f"Date: {now.date().isoformat()}")
-        y -= 15
-        c.drawString(50, y, f"Sanction Letter No: {sanction_number}")
-        y -= 30
-
-        c.drawString(50, y, f"To,")
-        y -= 15
-        c.drawString(50, y, name)
-        y -= 15
-        c.drawString(50, y, address)
-        y -= 30
-
-        c.setFont("Helvetica", 11)
-        c.drawString(50, y, "Subject: Sanction of Personal Loan")
-        y -= 25
-
-        c.setFont("Helvetica", 10)
-        c.drawString(50, y, "Dear Customer,")
-        y -= 20
-
-        body_lines = [
-            "We are pleased to inform you that your personal loan application has been approved.",
-            f"Sanctioned Amount: ₹{amount}" if amount is not None else "Sanctioned Amount: As per approved terms",
-            f"Interest Rate: {rate:.2f}% p.a." if isinstance(rate, (int, float)) else "Interest Rate: As per approved schedule",
-            f"Tenure: {tenure} months" if tenure is not None else "Tenure: As per approved schedule",
-            f"EMI: ₹{int(round(emi))}" if isinstance(emi, (int, float)) else "EMI: As per repayment schedule",
-            f"This offer is valid until: {valid_until}.",
-            "Funds will be disbursed to your registered bank account post completion of documentation.",
-        ]
-
-        for line in body_lines:
-            c.drawString(50, y, line)
-            y -= 15
-
-        y -= 15
-        c.drawString(50, y, "Thank you for choosing Tata Capital.")
-        y -= 30
-        c.drawString(50, y, "Sincerely,")
-        y -= 15
-        c.drawString(50, y, "Tata Capital Personal Loans Team")
-
-        c.showPage()
-        c.save()
-
+        fields = {
+            "date": now.date().isoformat(),
+            "sanction_number": sanction_number,
+            "name": customer_profile.get("name", "Valued Customer"),
+            "address": customer_profile.get("address", "Address on file"),
+            "amount": loan_details.get("amount"),
+            "tenure": loan_details.get("tenure"),
+            "rate": loan_details.get("rate"),
+            "emi": loan_details.get("emi"),
+            "valid_until": valid_until,
+        }
         return {
             "sanction_number": sanction_number,
             "file_path": str(file_path),
             "valid_until": valid_until,
+            "fields": fields,
         }
 
-    def format_summary(self, sanction_payload: Dict[str, Any]) -> str:
+    def generate_letter(self, customer_profile: Dict[str, Any], loan_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a simple PDF sanction letter and store it locally (blocking).
+
+        Returns a dict with sanction_number, file_path and valid_until.
+        """
+
+        letter = self._prepare_letter(customer_profile, loan_details)
+        render_sanction_pdf(letter["file_path"], letter["fields"])
+        return {
+            "sanction_number": letter["sanction_number"],
+            "file_path": letter["file_path"],
+            "valid_until": letter["valid_until"],
+        }
+
+    async def submit_letter(self, customer_profile: Dict[str, Any], loan_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue the PDF on the process-pool renderer and return its metadata at once.
+
+        Adds ``pdf_status`` to the generate_letter fields: ``rendering`` or
+        ``deferred`` while queued, ``failed`` when the renderer is saturated
+        and sheds the letter. The server process never renders it itself.
+        """
+
+        letter = self._prepare_letter(customer_profile, loan_details)
+        meta = {
+            "sanction_number": letter["sanction_number"],
+            "file_path": letter["file_path"],
+            "valid_until": letter["valid_until"],
+        }
+        try:
+            job = sanction_renderer.submit(letter["sanction_number"], letter["file_path"], letter["fields"])
+            meta["pdf_status"] = job["status"]
+        except RendererSaturated as e:
+            print(f"SanctionAgent shed PDF for {letter['sanction_number']}: {e}")
+            meta["pdf_status"] = "failed"
+        return meta
+
+    async def format_summary(self, sanction_payload: Dict[str, Any]) -> str:
         """Create a short, celebratory but compliant sanction summary."""
 
         if not self._client.available:
             return "Your loan has been sanctioned. A copy of the sanction letter has been saved to your account documents."
         system_prompt = self._base_system_prompt or "You are a sanction agent. Create a celebratory but compliant sanction summary under 80 words."
-        return self._client.generate(system_prompt, str(sanction_payload), max_tokens=160) or "Sanction ready."
+        return await self._client.agenerate(system_prompt, str(sanction_payload), max_tokens=160, timeout=self._llm_budget) or "Sanction ready."
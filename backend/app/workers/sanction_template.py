@@ -0,0 +1,257 @@
+"""Pre-compiled sanction letter template with per-letter variable stamping.
+
+The letter layout (header, subject, boilerplate, sign-off, fonts, page tree)
+never changes between customers, yet drawing it with reportlab costs most of
+the render time. ``SanctionLetterTemplate`` renders the layout once per
+process with a placeholder for every variable line, splits the uncompressed
+content stream at those placeholders and keeps every other PDF object as
+ready-made bytes. Each letter then only encodes its own lines into the
+content stream and recomputes the xref table.
+
+Text is encoded with reportlab's own helpers (``unicode2T1`` and
+``escapePDF``), so characters Helvetica cannot encode switch to the same
+substitution fonts (Symbol, then ZapfDingbats for e.g. ``₹``) as a drawn
+letter. Every substitution font is registered in the template up front.
+``render_with_reportlab`` keeps the original drawing path for comparison and
+as the fallback.
+
+The template is drawn in reportlab's invariant mode, so its fixed
+``/CreationDate``, ``/ModDate`` and trailer ``/ID`` are replaced per letter.
+"""
+from __future__ import annotations
+
+import io
+import re
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import escapePDF
+from reportlab.pdfbase.pdfmetrics import getFont, unicode2T1
+from reportlab.pdfgen import canvas
+
+# Lines that differ per letter; everything else is part of the template
+VARIABLE_LINES: Tuple[str, ...] = (
+    "date",
+    "sanction_number",
+    "name",
+    "address",
+    "amount",
+    "rate",
+    "tenure",
+    "emi",
+    "valid_until",
+)
+
+# Variable lines are all drawn in Helvetica 10pt with reportlab's default 1.2 leading
+_FONT = "Helvetica"
+_FONT_SIZE = b"10 Tf 12 TL"
+
+# What invariant mode writes for the document dates and the file identifier
+_INVARIANT_DATE = b"(D:20000101000000+00'00')"
+_FILE_ID = re.compile(rb"\[<[0-9a-f]+><[0-9a-f]+>\]")
+
+
+def letter_lines(fields: Dict[str, Any]) -> Dict[str, str]:
+    """Final text of every variable line for the given letter fields."""
+    amount = fields.get("amount")
+    tenure = fields.get("tenure")
+    rate = fields.get("rate")
+    emi = fields.get("emi")
+    return {
+        "date": f"Date: {fields.get('date') or date.today().isoformat()}",
+        "sanction_number": f"Sanction Letter No: {fields.get('sanction_number')}",
+        "name": str(fields.get("name", "Valued Customer")),
+        "address": str(fields.get("address", "Address on file")),
+        "amount": f"Sanctioned Amount: ₹{amount}" if amount is not None else "Sanctioned Amount: As per approved terms",
+        "rate": f"Interest Rate: {rate:.2f}% p.a." if isinstance(rate, (int, float)) else "Interest Rate: As per approved schedule",
+        "tenure": f"Tenure: {tenure} months" if tenure is not None else "Tenure: As per approved schedule",
+        "emi": f"EMI: ₹{int(round(emi))}" if isinstance(emi, (int, float)) else "EMI: As per repayment schedule",
+        "valid_until": f"This offer is valid until: {fields.get('valid_until')}.",
+    }
+
+
+def draw_sanction_letter(c: canvas.Canvas, lines: Dict[str, str]) -> None:
+    """Draw the letter layout with the given variable ``lines``."""
+    width, height = A4
+
+    y = height - 50
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, y, "Tata Capital - Personal Loan Sanction Letter")
+    y -= 30
+
+    c.setFont("Helvetica", 10)
+    c.drawString(50, y, lines["date"])
+    y -= 15
+    c.drawString(50, y, lines["sanction_number"])
+    y -= 30
+
+    c.drawString(50, y, "To,")
+    y -= 15
+    c.drawString(50, y, lines["name"])
+    y -= 15
+    c.drawString(50, y, lines["address"])
+    y -= 30
+
+    c.setFont("Helvetica", 11)
+    c.drawString(50, y, "Subject: Sanction of Personal Loan")
+    y -= 25
+
+    c.setFont("Helvetica", 10)
+    c.drawString(50, y, "Dear Customer,")
+    y -= 20
+
+    body_lines = [
+        "We are pleased to inform you that your personal loan application has been approved.",
+        lines["amount"],
+        lines["rate"],
+        lines["tenure"],
+        lines["emi"],
+        lines["valid_until"],
+        "Funds will be disbursed to your registered bank account post completion of documentation.",
+    ]
+
+    for line in body_lines:
+        c.drawString(50, y, line)
+        y -= 15
+
+    y -= 15
+    c.drawString(50, y, "Thank you for choosing Tata Capital.")
+    y -= 30
+    c.drawString(50, y, "Sincerely,")
+    y -= 15
+    c.drawString(50, y, "Tata Capital Personal Loans Team")
+
+
+def render_with_reportlab(file_path: str, fields: Dict[str, Any]) -> str:
+    """Draw the whole letter with reportlab (the pre-template path)."""
+    c = canvas.Canvas(file_path, pagesize=A4)
+    draw_sanction_letter(c, letter_lines(fields))
+    c.showPage()
+    c.save()
+    return file_path
+
+
+class SanctionLetterTemplate:
+    def __init__(self) -> None:
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=A4, invariant=1, pageCompression=0)
+        draw_sanction_letter(c, {key: f"@@{idx}@@" for idx, key in enumerate(VARIABLE_LINES)})
+        # Register the substitution fonts so any letter text can use them
+        font = getFont(_FONT)
+        self._font_names = {
+            f.fontName: c._doc.getInternalFontName(f.fontName).encode()
+            for f in [font] + font.substitutionFonts
+        }
+        c.showPage()
+        c.save()
+        self._compile(buf.getvalue())
+
+    def _compile(self, data: bytes) -> None:
+        first_obj = data.index(b"\n1 0 obj\n") + 1
+        xref_pos = data.rindex(b"\nxref\n") + 1
+        trailer_pos = data.index(b"trailer\n", xref_pos)
+        startxref_pos = data.index(b"startxref", trailer_pos)
+        self._header = data[:first_obj]
+        self._trailer_parts = _FILE_ID.split(data[trailer_pos:startxref_pos])
+        if len(self._trailer_parts) != 2:
+            raise ValueError("template trailer has no /ID")
+
+        self._objects: List[Tuple[int, Optional[bytes]]] = []
+        self._stream_parts: List[Union[bytes, int]] = []
+        self._info_number = 0
+        self._info_parts: List[bytes] = []
+        for number, body in re.findall(rb"(\d+) 0 obj\n(.*?)\nendobj\n", data[first_obj:xref_pos], re.S):
+            number = int(number)
+            if number != len(self._objects) + 1:
+                raise ValueError("unexpected object order in template PDF")
+            if b"@@0@@" in body:
+                stream = body[body.index(b"stream\n") + len(b"stream\n"): body.rindex(b"endstream")]
+                pieces = re.split(rb"\(@@(\d+)@@\) Tj", stream)
+                self._stream_parts = [int(p) if idx % 2 else p for idx, p in enumerate(pieces)]
+                self._objects.append((number, None))
+            elif _INVARIANT_DATE in body:
+                self._info_number = number
+                self._info_parts = body.split(_INVARIANT_DATE)
+                self._objects.append((number, None))
+            else:
+                self._objects.append((number, body))
+        if not self._stream_parts:
+            raise ValueError("template content stream not found")
+        if not self._info_parts:
+            raise ValueError("template document info not found")
+        resources = b"".join(body for _, body in self._objects if body)
+        for name, internal in self._font_names.items():
+            if b"/Name " + internal + b" " not in resources:
+                raise ValueError(f"template PDF lacks font {name}")
+
+    def _text_ops(self, text: str) -> bytes:
+        """``Tj`` operators for one line, switching fonts exactly like reportlab."""
+        font = getFont(_FONT)
+        current = font
+        ops: List[bytes] = []
+        for sub, encoded in unicode2T1(text, [font] + font.substitutionFonts):
+            if sub is not current:
+                ops.append(self._font_names[sub.fontName] + b" " + _FONT_SIZE)
+                current = sub
+            ops.append(b"(" + escapePDF(encoded).encode("latin-1") + b") Tj")
+        if current is not font:
+            ops.append(self._font_names[font.fontName] + b" " + _FONT_SIZE)
+        return b" ".join(ops)
+
+    def render(self, fields: Dict[str, Any]) -> bytes:
+        """PDF bytes of one letter."""
+        lines = letter_lines(fields)
+        stream = b"".join(
+            part if isinstance(part, bytes) else self._text_ops(lines[VARIABLE_LINES[part]])
+            for part in self._stream_parts
+        )
+        stamp = time.strftime("(D:%Y%m%d%H%M%S+00'00')", time.gmtime()).encode()
+        file_id = uuid4().hex.encode()
+        out = bytearray(self._header)
+        offsets = []
+        for number, body in self._objects:
+            offsets.append(len(out))
+            if number == self._info_number:
+                body = stamp.join(self._info_parts)
+            elif body is None:
+                body = b"<<\n/Length %d\n>>\nstream\n" % len(stream) + stream + b"endstream"
+            out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref_pos = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1)
+        for offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        out += self._trailer_parts[0] + b"[<%s><%s>]" % (file_id, file_id) + self._trailer_parts[1]
+        out += b"startxref\n%d\n%%%%EOF\n" % xref_pos
+        return bytes(out)
+
+    def write(self, file_path: str, fields: Dict[str, Any]) -> str:
+        with open(file_path, "wb") as fh:
+            fh.write(self.render(fields))
+        return file_path
+
+
+_template: Optional[SanctionLetterTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_sanction_template() -> SanctionLetterTemplate:
+    """Process-wide template, compiled on first use (once per pool process)."""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = SanctionLetterTemplate()
+    return _template
+
+
+__all__ = [
+    "SanctionLetterTemplate",
+    "draw_sanction_letter",
+    "get_sanction_template",
+    "letter_lines",
+    "render_with_reportlab",
+]
@@ -25,7 +25,8 @@ class UnderwritingAgent:
         settings = get_settings()
         # Prefer dedicated underwriting model when configured
         model_name = settings.ollama_model_underwriting or settings.ollama_model_default
-        self._client = OllamaClient(model=model_name)
+        self._client = OllamaClient(model=model_name, agent="underwriting")
+        self._llm_budget = settings.llm_budget_underwriting_ms / 1000.0
         self._base_system_prompt = get_underwriting_system_prompt()
 
     # ------------------------
@@ -208,7 +209,7 @@ class UnderwritingAgent:
     #  Explainability helper
     # ------------------------
 
-    def explain_decision(self, explainability: Dict[str, object]) -> str:
+    async def explain_decision(self, explainability: Dict[str, object]) -> str:
         """Return a short, customer‑friendly explanation string."""
 
         if not self._client.available:
@@ -219,4 +220,4 @@ class UnderwritingAgent:
             self._base_system_prompt
             or "You are an underwriting agent. Explain underwriting result in plain English under 80 words."
         )
-        return self._client.generate(system_prompt, str(explainability), max_tokens=200) or "Underwriting completed."
+        return await self._client.agenerate(system_prompt, str(explainability), max_tokens=200, timeout=self._llm_budget) or "Underwriting completed."
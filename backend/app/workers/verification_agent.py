@@ -13,12 +13,13 @@ class VerificationAgent:
         settings = get_settings()
         # Use per-agent Ollama model
         model_name = settings.ollama_model_verification or settings.ollama_model_default
-        self._client = OllamaClient(model=model_name)
+        self._client = OllamaClient(model=model_name, agent="verification")
+        self._llm_budget = settings.llm_budget_verification_ms / 1000.0
         self._base_system_prompt = get_verification_system_prompt()
 
-    def summarize_checks(self, context: Dict[str, str]) -> str:
+    async def summarize_checks(self, context: Dict[str, str]) -> str:
         if not self._client.available:
             return "OTP validated. We have verified your KYC details successfully."
         system_prompt = self._base_system_prompt or "You are a KYC verification agent. Summarize verification status in under 60 words."
         msg = str(context)
-        return self._client.generate(system_prompt, msg, max_tokens=120) or "Verification completed."
+        return await self._client.agenerate(system_prompt, msg, max_tokens=120, timeout=self._llm_budget) or "Verification completed."
@@ -0,0 +1,62 @@
+"""Benchmark sanction letter rendering: full reportlab drawing vs pre-compiled template.
+
+Usage (from backend/):
+
+    python -m scripts.bench_sanction_letters --letters 500
+
+Writes the letters to a temporary directory and prints letters/second for
+each path, plus the time to compile the template once.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any
+
+from app.workers.sanction_template import SanctionLetterTemplate, render_with_reportlab
+
+
+def _fields(i: int) -> Dict[str, Any]:
+    return {
+        "date": "2026-10-31",
+        "sanction_number": f"SL/20261031/CUST{i:05d}",
+        "name": f"Customer {i}",
+        "address": f"{i} MG Road, Pune",
+        "amount": 300000 + i * 1000,
+        "rate": 10.5 + (i % 20) / 10,
+        "tenure": 12 * (1 + i % 5),
+        "emi": 9000 + i * 3.7,
+        "valid_until": "2026-11-30",
+    }
+
+
+def _run(name: str, letters: int, out_dir: Path, render: Callable[[str, Dict[str, Any]], Any]) -> float:
+    started = time.perf_counter()
+    for i in range(letters):
+        render(str(out_dir / f"{name}_{i}.pdf"), _fields(i))
+    elapsed = time.perf_counter() - started
+    rate = letters / elapsed
+    print(f"{name:>10}: {letters} letters in {elapsed:.3f}s -> {rate:,.0f} letters/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--letters", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        started = time.perf_counter()
+        template = SanctionLetterTemplate()
+        print(f"template compile: {(time.perf_counter() - started) * 1000:.1f} ms (once per process)")
+
+        before = _run("reportlab", args.letters, out_dir, render_with_reportlab)
+        after = _run("template", args.letters, out_dir, template.write)
+        print(f"speed-up: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark conversation state serialization: plain JSON vs the stored hash fields.
+
+Usage (from backend/):
+
+    python -m scripts.bench_state_codec --iterations 2000
+
+Builds states the way a journey grows them (profile, offer, bureau data,
+the audit ring and per-agent LLM context) at several turn counts. Only what
+``StateManager`` persists is measured: ``llm_context`` stays in the worker,
+so it is excluded from both sides. Prints stored bytes and µs per
+encode/decode for ``model_dump_json`` / ``model_validate_json`` and for
+``encode_state_fields`` / ``decode_state_fields``, plus the bytes of the
+fields one more turn actually rewrites.
+
+Without zstandard (or below ``state_compress_threshold_bytes``) each field
+is its JSON plus a 4-byte header, so the fields are slightly larger than the
+JSON and, with one serializer call per field, slower to encode. The saving
+is in what a turn writes: only the fields it changed.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Callable
+
+from app.orchestrator import state_codec
+from app.orchestrator.state_codec import decode_state_fields, encode_state_fields
+from app.orchestrator.state_manager import LOCAL_SECTIONS, PERSISTED_SECTIONS
+from app.schemas.conversation_state import OrchestratorState
+
+_STAGES = ["GREETING", "SALES", "VERIFICATION", "UNDERWRITING", "DOCUMENT_UPLOAD", "SANCTION"]
+
+
+def build_state(turns: int, seed: int = 7) -> OrchestratorState:
+    rng = random.Random(seed)
+    state = OrchestratorState(conversation_id=f"conv-{seed:08d}", language="en")
+    for turn in range(turns):
+        state.stage = _STAGES[min(turn // 2, len(_STAGES) - 1)]
+        state.revision = turn + 1
+        state.last_intent = rng.choice(["loan_query", "provide_amount", "confirm", "ask_rate"])
+        if turn >= 1:
+            state.customer_id = "CUST00042"
+            state.customer_profile = {
+                "customer_id": "CUST00042",
+                "name": "Asha Verma",
+                "email": "asha.verma@example.com",
+                "phone": "9876543210",
+                "address": "12 MG Road, Pune",
+                "city": "Pune",
+                "salary": 85000,
+                "pre_approved_limit": 500000,
+                "existing_loans": [{"type": "credit_card", "emi": 3200}],
+            }
+        if turn >= 2:
+            state.loan_request.requested_amount = 300000
+            state.loan_request.requested_tenure = 36
+            state.offer.amount = 300000
+            state.offer.tenure = 36
+            state.offer.personalized_rate = 11.25
+            state.offer.standard_rate = 12.5
+            state.offer.emi = 9857.31
+            state.offer.adjustments = [{"reason": "credit_score", "delta": -0.75}, {"reason": "employer", "delta": -0.5}]
+        if turn >= 4:
+            state.kyc.otp_status = "verified"
+            state.kyc.verified = True
+            state.kyc.phone_mask = "98XXXXXX10"
+            state.kyc.crm_snapshot = dict(state.customer_profile)
+            state.underwriting = {
+                "decision": "approve",
+                "bureau_pan": "ABCDE1234F",
+                "bureau_fetched_at": "2026-10-17T10:05:00Z",
+                "bureau": {"credit_score": 782, "obligations": [{"lender": "HDFC", "emi": 5400}]},
+                "reasons": ["score above 750", "FOIR 0.31"],
+            }
+        state.audit_log = (state.audit_log + [{
+            "timestamp": f"2026-10-17T10:{turn:02d}:00Z",
+            "stage": state.stage,
+            "intent": state.last_intent,
+            "user_message": " ".join(rng.choice(["I", "need", "a", "loan", "of", "three", "lakh", "for", "my", "wedding"]) for _ in range(12)),
+            "emotion": {"primary": "neutral", "confidence": round(rng.random(), 2)},
+        }])[-10:]
+        agent = "sales" if turn < 4 else "verification"
+        tokens = state.llm_context.get(agent, {}).get("tokens", [])
+        state.llm_context[agent] = {
+            "system_hash": "9f2c4e1ab7d03e58",
+            "tokens": tokens + [rng.randint(0, 32000) for _ in range(180)],
+        }
+    return state
+
+
+def _time(fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--turns", type=int, nargs="*", default=[2, 6, 12, 24])
+    args = parser.parse_args()
+
+    compression = "zstd" if state_codec.zstandard is not None else "none (zstandard not installed)"
+    parser_name = "orjson" if state_codec.orjson is not None else "pydantic"
+    print(f"codec: compression={compression} above {state_codec._compress_threshold} B, decode={parser_name}")
+    print(
+        f"{'turns':>5} | {'json B':>7} {'enc µs':>7} {'dec µs':>7} "
+        f"| {'fields B':>8} {'enc µs':>7} {'dec µs':>7} | {'turn B':>7}"
+    )
+    for turns in args.turns:
+        state = build_state(turns)
+        text = state.model_dump_json(exclude=set(LOCAL_SECTIONS))
+        fields = encode_state_fields(state, PERSISTED_SECTIONS)
+        assert decode_state_fields(fields) == state.model_copy(update={name: {} for name in LOCAL_SECTIONS})
+        # What the next turn writes: only the fields whose encoding changed
+        previous = encode_state_fields(build_state(turns - 1), PERSISTED_SECTIONS) if turns > 1 else {}
+        turn_bytes = sum(len(value) for name, value in fields.items() if previous.get(name) != value)
+
+        json_enc = _time(lambda: state.model_dump_json(exclude=set(LOCAL_SECTIONS)), args.iterations)
+        json_dec = _time(lambda: OrchestratorState.model_validate_json(text), args.iterations)
+        codec_enc = _time(lambda: encode_state_fields(state, PERSISTED_SECTIONS), args.iterations)
+        codec_dec = _time(lambda: decode_state_fields(fields), args.iterations)
+        print(
+            f"{turns:>5} | {len(text.encode()):>7} {json_enc:>7.1f} {json_dec:>7.1f} "
+            f"| {sum(len(value) for value in fields.values()):>8} {codec_enc:>7.1f} {codec_dec:>7.1f} "
+            f"| {turn_bytes:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ export interface OrchestratorResponse {
   audit_entry?: Record<string, unknown> | null;
   fallback_needed?: boolean;
   model_version?: string | null;
+  revision?: number | null;
+  base_revision?: number | null;
+  state_patch?: Array<{ op: string; path: string; value?: unknown }> | null;
 }
 
 export async function postChatMessage(